@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+
+from web_browser import cache
+from web_browser.web_analyzer.analyzer import ElementAnalyzer
+from web_browser.web_analyzer.config import Config
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_env(monkeypatch, tmp_path):
+    """Keep tests away from the real cache and screenshot directories."""
+    monkeypatch.delenv(cache.CACHE_DIR_ENV_VAR, raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.chdir(tmp_path)
+
+
+def test_default_cache_dir_prefers_env_var(monkeypatch, tmp_path):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VAR, str(tmp_path / "custom"))
+    assert cache.default_cache_dir() == tmp_path / "custom"
+
+
+def test_default_cache_dir_uses_xdg_cache_home(tmp_path):
+    assert cache.default_cache_dir() == tmp_path / "xdg" / "page-parse"
+
+
+def test_default_cache_dir_falls_back_to_home(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    assert cache.default_cache_dir() == tmp_path / "home" / ".cache" / "page-parse"
+
+
+def test_round_trip(tmp_path):
+    digest = cache.content_digest(b"image bytes")
+    response = {"pages": [{"pageNumber": 1, "lines": ["ünïcode", 1.5, None]}]}
+
+    cache.store_response("prebuilt-read", digest, response, tmp_path)
+
+    assert cache.load_response("prebuilt-read", digest, tmp_path) == response
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_round_trip_in_default_dir(tmp_path):
+    digest = cache.content_digest(b"image bytes")
+    cache.store_response("prebuilt-read", digest, [1, 2, 3])
+
+    assert cache.load_response("prebuilt-read", digest) == [1, 2, 3]
+    assert list((tmp_path / "xdg" / "page-parse").iterdir())
+
+
+def test_miss_returns_none(tmp_path):
+    assert cache.load_response("prebuilt-read", cache.content_digest(b"x"), tmp_path) is None
+
+
+def test_namespaces_are_kept_apart(tmp_path):
+    digest = cache.content_digest(b"image bytes")
+    cache.store_response("prebuilt-read", digest, "read", tmp_path)
+    cache.store_response("prebuilt-layout", digest, "layout", tmp_path)
+
+    assert cache.load_response("prebuilt-read", digest, tmp_path) == "read"
+    assert cache.load_response("prebuilt-layout", digest, tmp_path) == "layout"
+
+
+def test_namespace_is_made_filename_safe(tmp_path):
+    digest = cache.content_digest(b"image bytes")
+    cache.store_response("gpt-4o/2024:08", digest, "vision", tmp_path)
+
+    assert [path.parent for path in tmp_path.iterdir()] == [tmp_path]
+    assert cache.load_response("gpt-4o/2024:08", digest, tmp_path) == "vision"
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    digest = cache.content_digest(b"image bytes")
+    cache.store_response("prebuilt-read", digest, "ok", tmp_path)
+    next(tmp_path.glob("*.json")).write_bytes(b"{not json")
+
+    assert cache.load_response("prebuilt-read", digest, tmp_path) is None
+
+
+def test_digest_depends_on_content():
+    assert cache.content_digest(b"a") == cache.content_digest(b"a")
+    assert cache.content_digest(b"a") != cache.content_digest(b"b")
+
+
+def test_cache_survives_screenshot_dir_reset(tmp_path):
+    """The analyzer clears its screenshot directory before every analysis."""
+    analyzer = ElementAnalyzer.__new__(ElementAnalyzer)
+    analyzer.config = Config()
+    analyzer.setup_screenshot_dir()
+
+    digest = cache.content_digest(b"viewport")
+    cache.store_response("prebuilt-read", digest, "ocr")
+    analyzer.setup_screenshot_dir()
+
+    assert cache.load_response("prebuilt-read", digest) == "ocr"
+    screenshot_dir = (tmp_path / analyzer.config.screenshot_dir).resolve()
+    assert screenshot_dir not in cache.default_cache_dir().resolve().parents
+    assert Path(analyzer.config.screenshot_dir).is_dir()
@@ -0,0 +1,82 @@
+import pytest
+
+from web_browser import WebBrowser
+from web_browser import __main__ as cli
+from web_browser.vision.types import WebpageDescription
+
+SERIALIZERS = [WebBrowser.serialize_webpage_description, cli.serialize_webpage_description]
+
+
+def make_description(header, navigation, sidebar, text, state) -> WebpageDescription:
+    return WebpageDescription.model_validate({
+        "layout": {
+            "header": header,
+            "main_content": "Article",
+            "navigation": navigation,
+            "sidebar": sidebar,
+        },
+        "interactive_elements": [{
+            "type": "button",
+            "location": "top right",
+            "visuals": "blue",
+            "text": text,
+            "purpose": "sign in",
+            "state": state,
+        }],
+        "key_content": {
+            "headings": ["Title"],
+            "main_text_blocks": [""],
+            "images": [{"location": "top", "content": "", "purpose": "logo"}],
+        },
+        "visual_hierarchy": {
+            "primary_focus": "Article",
+            "secondary_elements": [],
+            "background_elements": [],
+        },
+    })
+
+
+@pytest.mark.parametrize("serialize", SERIALIZERS)
+@pytest.mark.parametrize("empty", [None, ""])
+def test_empty_optional_fields_are_omitted(serialize, empty):
+    serialized = serialize(make_description(empty, empty, empty, empty, empty))
+
+    assert serialized["layout"] == {"main_content": "Article"}
+    assert serialized["interactive_elements"] == [{
+        "type": "button",
+        "location": "top right",
+        "visuals": "blue",
+        "purpose": "sign in",
+    }]
+
+
+@pytest.mark.parametrize("serialize", SERIALIZERS)
+def test_filled_optional_fields_are_kept(serialize):
+    serialized = serialize(make_description("Logo", "Menu", "Ads", "Sign in", "enabled"))
+
+    assert serialized["layout"] == {
+        "header": "Logo",
+        "main_content": "Article",
+        "navigation": "Menu",
+        "sidebar": "Ads",
+    }
+    assert serialized["interactive_elements"][0]["text"] == "Sign in"
+    assert serialized["interactive_elements"][0]["state"] == "enabled"
+
+
+@pytest.mark.parametrize("serialize", SERIALIZERS)
+def test_required_fields_are_kept_even_when_empty(serialize):
+    serialized = serialize(make_description(None, None, None, None, None))
+
+    assert serialized["key_content"] == {
+        "headings": ["Title"],
+        "main_text_blocks": [""],
+        "images": [{"location": "top", "content": "", "purpose": "logo"}],
+    }
+    assert serialized["visual_hierarchy"]["secondary_elements"] == []
+
+
+@pytest.mark.parametrize("serialize", SERIALIZERS)
+def test_missing_description_is_rejected(serialize):
+    with pytest.raises(ValueError):
+        serialize(None)
@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from web_browser import driver as driver_module
+from web_browser.driver import WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.pages = []
+
+    def get(self, url: str) -> None:
+        self.pages.append(url)
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        return {}
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """Drivers started by the pool, in start order."""
+    drivers = []
+
+    def new_webdriver(headless: bool = True) -> FakeDriver:
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    monkeypatch.setattr(driver_module, "new_webdriver", new_webdriver)
+    return drivers
+
+
+def test_acquire_starts_one_driver_per_miss(started):
+    pool = WebDriverPool(size=3)
+
+    first = pool.acquire()
+    assert started == [first]
+
+    second = pool.acquire()
+    assert started == [first, second]
+
+
+def test_released_driver_is_reset_and_reused(started):
+    pool = WebDriverPool(size=2)
+    driver = pool.acquire()
+
+    pool.release(driver)
+
+    assert driver.pages == ["about:blank"]
+    assert pool.acquire() is driver
+    assert started == [driver]
+
+
+def test_drivers_beyond_size_are_quit(started):
+    pool = WebDriverPool(size=1)
+    first, second = pool.acquire(), pool.acquire()
+
+    pool.release(first)
+    pool.release(second)
+
+    assert not first.quit_called
+    assert second.quit_called
+
+
+def test_failed_start_does_not_over_provision(monkeypatch, started):
+    pool = WebDriverPool(size=2)
+    start = driver_module.new_webdriver
+
+    def failing_webdriver(headless: bool = True):
+        raise RuntimeError("chrome failed to start")
+
+    monkeypatch.setattr(driver_module, "new_webdriver", failing_webdriver)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+    monkeypatch.setattr(driver_module, "new_webdriver", start)
+    pool.acquire()
+    assert len(started) == 1
+
+
+def test_drivers_start_outside_the_lock(monkeypatch):
+    pool = WebDriverPool(size=2)
+    # Both start-ups must be in progress at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def new_webdriver(headless: bool = True) -> FakeDriver:
+        barrier.wait()
+        return FakeDriver()
+
+    monkeypatch.setattr(driver_module, "new_webdriver", new_webdriver)
+    acquired = []
+    threads = [
+        threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(acquired) == 2
+    assert not barrier.broken
+
+
+def test_close_quits_idle_drivers(started):
+    pool = WebDriverPool(size=2)
+    driver = pool.acquire()
+    pool.release(driver)
+
+    pool.close()
+
+    assert driver.quit_called
+    assert pool.acquire() is not driver
@@ -0,0 +1,85 @@
+import base64
+
+import pytest
+
+from web_browser import WebBrowser
+from web_browser.web_analyzer.elements.bounding_box import BoundingBox
+from web_browser.web_analyzer.elements.unified_element import UnifiedElement
+
+
+class FakeDriver:
+    """A 800x600 CSS-pixel viewport at 2x, scrolled to the given offset."""
+
+    def __init__(self, scroll: tuple[float, float]):
+        self.scroll = scroll
+        self.captures = []
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        if cmd == "Page.captureScreenshot":
+            self.captures.append(params)
+            return {"data": base64.b64encode(b"jpeg").decode()}
+        return {}
+
+    def execute_script(self, script: str) -> list:
+        if "scrollX" in script:
+            return list(self.scroll)
+        return [2, 800, 600]
+
+
+class FakeDriverPool:
+    def __init__(self, driver: FakeDriver):
+        self.driver = driver
+
+    def acquire(self) -> FakeDriver:
+        return self.driver
+
+    def release(self, driver: FakeDriver) -> None:
+        pass
+
+
+def capture(tmp_path, scroll: tuple[float, float], box: BoundingBox):
+    driver = FakeDriver(scroll)
+    browser = WebBrowser(screenshot_dir=str(tmp_path / "ui"), driver_pool=FakeDriverPool(driver))
+    result = browser._capture_element_jpeg(UnifiedElement(bounding_box=box), padding=70)
+    return result, driver.captures
+
+
+@pytest.mark.parametrize("scroll", [(0, 0), (0, 1500), (320, 2400.5)])
+def test_clip_is_offset_by_the_scroll_position(tmp_path, scroll):
+    box = BoundingBox.from_dom_position({"x": 100, "y": 50, "width": 200, "height": 100})
+
+    result, captures = capture(tmp_path, scroll, box)
+
+    assert result == b"jpeg"
+    # 70 screenshot pixels of padding at 2x are 35 CSS pixels
+    assert captures == [{
+        "format": "jpeg",
+        "quality": 85,
+        "captureBeyondViewport": False,
+        "clip": {
+            "x": scroll[0] + 65,
+            "y": scroll[1] + 15,
+            "width": 270,
+            "height": 170,
+            "scale": 1,
+        },
+    }]
+
+
+def test_clip_is_clamped_to_the_scrolled_viewport(tmp_path):
+    box = BoundingBox.from_dom_position({"x": 700, "y": -40, "width": 200, "height": 100})
+
+    _, captures = capture(tmp_path, (0, 1500), box)
+
+    assert captures[0]["clip"] == {
+        "x": 665, "y": 1500, "width": 135, "height": 95, "scale": 1
+    }
+
+
+def test_element_scrolled_out_of_view_is_not_captured(tmp_path):
+    box = BoundingBox.from_dom_position({"x": 100, "y": -400, "width": 200, "height": 100})
+
+    result, captures = capture(tmp_path, (0, 1500), box)
+
+    assert result is None
+    assert captures == []
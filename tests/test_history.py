@@ -0,0 +1,228 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import web_browser
+from web_browser import WebBrowser
+from web_browser.history import BrowserHistory
+from web_browser.types import HistoryEntry
+
+
+def make_entry(url: str) -> HistoryEntry:
+    return HistoryEntry(timestamp=datetime(2024, 12, 1), url=url, title=url)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.current_url = None
+        self.title = None
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self.title = f"Title of {url}"
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        return {}
+
+    def refresh(self) -> None:
+        pass
+
+
+class FakeDriverPool:
+    def __init__(self):
+        self.driver = FakeDriver()
+        self.released = []
+
+    def acquire(self) -> FakeDriver:
+        return self.driver
+
+    def release(self, driver: FakeDriver) -> None:
+        self.released.append(driver)
+
+
+class FakeDatetime(datetime):
+    """Advances a second per call so history screenshot names never collide."""
+    current = datetime(2024, 12, 1)
+
+    @classmethod
+    def now(cls, tz=None):
+        cls.current += timedelta(seconds=1)
+        return cls.current
+
+
+@pytest.fixture
+def browser_factory(monkeypatch, tmp_path):
+    monkeypatch.setattr(web_browser, "datetime", FakeDatetime)
+
+    def create(eager_screenshot: bool = False) -> WebBrowser:
+        browser = WebBrowser(
+            screenshot_dir=str(tmp_path / "ui"),
+            driver_pool=FakeDriverPool(),
+            eager_screenshot=eager_screenshot,
+        )
+        browser.captured_urls = []
+
+        def capture_jpeg_bytes() -> bytes:
+            browser.captured_urls.append(browser.driver.current_url)
+            return browser.driver.current_url.encode()
+
+        browser._capture_jpeg_bytes = capture_jpeg_bytes
+        browser._wait_for_page_load = lambda: None
+        return browser
+
+    return create
+
+
+def screenshot_of(entry: HistoryEntry) -> bytes:
+    return Path(entry.screenshot_path).read_bytes()
+
+
+class TestBrowserHistory:
+    def test_navigation(self):
+        history = BrowserHistory()
+        a, b, c = make_entry("a"), make_entry("b"), make_entry("c")
+        for entry in (a, b, c):
+            history.add_entry(entry)
+
+        assert history.get_history() == (a, b, c)
+        assert history.go_back() is b
+        assert history.go_back() is a
+        assert history.go_back() is None
+        assert history.get_current() is a
+        assert history.go_forward() is b
+        assert history.get_history() == (a, b, c)
+
+    def test_adding_discards_forward_entries(self):
+        history = BrowserHistory()
+        a, b, c = make_entry("a"), make_entry("b"), make_entry("c")
+        history.add_entry(a)
+        history.add_entry(b)
+        history.go_back()
+        history.add_entry(c)
+
+        assert history.get_history() == (a, c)
+        assert not history.can_go_forward()
+
+    def test_snapshot_is_reused_until_changed(self):
+        history = BrowserHistory()
+        history.add_entry(make_entry("a"))
+        history.add_entry(make_entry("b"))
+        snapshot = history.get_history()
+
+        history.go_back()
+        history.go_forward()
+        assert history.get_history() is snapshot
+
+        replacement = make_entry("b2")
+        history.update_current(replacement)
+        assert history.get_history()[-1] is replacement
+
+    def test_max_entries_evicts_oldest(self):
+        history = BrowserHistory(max_entries=2)
+        entries = [make_entry(url) for url in "abcd"]
+        for entry in entries:
+            history.add_entry(entry)
+            history.get_history()
+
+        assert history.get_history() == tuple(entries[1:])
+
+    def test_eviction_on_go_forward_refreshes_snapshot(self):
+        history = BrowserHistory(max_entries=2)
+        entries = [make_entry(url) for url in "abc"]
+        for entry in entries:
+            history.add_entry(entry)
+        history.go_back()
+        history.go_forward()
+
+        assert history.get_history() == tuple(entries)
+        assert history.get_current() is entries[-1]
+
+
+class TestLazyHistoryScreenshots:
+    def test_screenshot_is_deferred_until_requested(self, browser_factory):
+        browser = browser_factory()
+        browser.navigate_to("https://a.example")
+        entry = browser.history.get_current()
+
+        assert entry.screenshot_path is None
+        assert browser.captured_urls == []
+
+        assert entry.get_screenshot_path() is not None
+        assert screenshot_of(entry) == b"https://a.example"
+        # Later requests reuse the same screenshot
+        entry.get_screenshot_path()
+        assert browser.captured_urls == ["https://a.example"]
+
+    def test_eager_screenshot(self, browser_factory):
+        browser = browser_factory(eager_screenshot=True)
+        browser.navigate_to("https://a.example")
+
+        assert screenshot_of(browser.history.get_current()) == b"https://a.example"
+
+    def test_leaving_a_page_captures_it(self, browser_factory):
+        browser = browser_factory()
+        browser.navigate_to("https://a.example")
+        browser.navigate_to("https://b.example")
+
+        a, b = browser.get_history_entries()
+        assert screenshot_of(a) == b"https://a.example"
+        assert b.screenshot_path is None
+
+    def test_back_and_forward_capture_the_page_being_left(self, browser_factory):
+        browser = browser_factory()
+        browser.navigate_to("https://a.example")
+        browser.navigate_to("https://b.example")
+        a, b = browser.get_history_entries()
+
+        assert browser.go_back()
+        assert screenshot_of(b) == b"https://b.example"
+        assert browser.go_forward()
+
+        assert screenshot_of(a) == b"https://a.example"
+        assert screenshot_of(b) == b"https://b.example"
+        assert browser.captured_urls == ["https://a.example", "https://b.example"]
+
+    def test_entry_that_is_not_current_is_not_captured(self, browser_factory):
+        browser = browser_factory()
+        browser.navigate_to("https://a.example")
+        entry = browser.history.get_current()
+        browser.history.add_entry(make_entry("https://b.example"))
+
+        assert entry.get_screenshot_path() is None
+        assert browser.captured_urls == []
+        assert entry.capture_screenshot is not None
+
+    def test_close_captures_the_current_page(self, browser_factory):
+        browser = browser_factory()
+        pool = browser.driver_pool
+        browser.navigate_to("https://a.example")
+        entry = browser.history.get_current()
+
+        browser.close()
+
+        assert screenshot_of(entry) == b"https://a.example"
+        assert pool.released == [pool.driver]
+
+    def test_refresh_takes_a_new_screenshot(self, browser_factory):
+        browser = browser_factory()
+        browser.navigate_to("https://a.example")
+        old_entry = browser.history.get_current()
+        old_path = old_entry.get_screenshot_path()
+
+        assert browser.refresh()
+        new_entry = browser.history.get_current()
+
+        assert new_entry is not old_entry
+        assert new_entry.get_screenshot_path() not in (None, old_path)
+        assert browser.captured_urls == ["https://a.example", "https://a.example"]
+
+    def test_saved_history_includes_deferred_screenshots(self, browser_factory):
+        browser = browser_factory()
+        browser.navigate_to("https://a.example")
+        browser.save_history_to_json()
+
+        entry = browser.history.get_current()
+        assert entry.screenshot_path is not None
+        saved = (browser.screenshot_dir / "browser_history.json").read_text()
+        assert Path(entry.screenshot_path).name in saved
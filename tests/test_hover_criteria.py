@@ -0,0 +1,42 @@
+import pytest
+
+from web_browser import WebBrowser
+from web_browser.web_analyzer.elements.bounding_box import BoundingBox
+from web_browser.web_analyzer.elements.unified_element import UnifiedElement
+
+
+def make_element(tag: str, content: str) -> UnifiedElement:
+    return UnifiedElement(
+        bounding_box=BoundingBox.from_edges(0, 0, 10, 10), content=content, tag=tag
+    )
+
+
+@pytest.mark.parametrize(
+    ("criterion", "tag", "content", "expected"),
+    [
+        ({}, "a", "Home", True),
+        ({"tag": "A"}, "a", "Home", True),
+        ({"tag": "button"}, "a", "Home", False),
+        ({"text": "Hom"}, "a", "Home", True),
+        ({"text": "home"}, "a", "Home", False),
+        ({"tag": "a", "text": "Home"}, "a", "Home", True),
+        ({"tag": "a", "text": "About"}, "a", "Home", False),
+    ],
+)
+def test_compiled_criterion(criterion, tag, content, expected):
+    matches = WebBrowser._compile_criterion(criterion)
+
+    assert matches(make_element(tag, content)) is expected
+
+
+@pytest.mark.parametrize("criterion", [{"class": "nav"}, {"id": "home"}, {"tag": "a", "role": "link"}])
+def test_unsupported_keys_are_rejected(criterion):
+    with pytest.raises(ValueError, match="Unsupported hover criteria keys"):
+        WebBrowser._compile_criterion(criterion)
+
+
+def test_analysis_rejects_unsupported_keys_before_any_browser_work():
+    browser = WebBrowser.__new__(WebBrowser)
+
+    with pytest.raises(ValueError):
+        browser.analyze_hover_for_elements([make_element("a", "Home")], [{"id": "home"}])
@@ -0,0 +1,188 @@
+import random
+from io import BytesIO
+from typing import Optional
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from web_browser.document_intelligence.models import OCRElementBatch, OCRLine
+from web_browser.web_analyzer.elements.bounding_box import BoundingBox
+from web_browser.web_analyzer.elements.merger import ElementMerger
+from web_browser.web_analyzer.elements.unified_element import UnifiedElement
+
+TAGS = ["a", "A", "button", "p", "span"]
+TEXTS = ["", "sign in", "Sign In", "sign", "in", "search", "menu"]
+
+
+class FakeDriver:
+    """Reports a fixed viewport and screenshot size for the scale factors."""
+
+    def __init__(self, viewport: tuple[int, int], screenshot: tuple[int, int]):
+        self.viewport = viewport
+        buffer = BytesIO()
+        Image.new("RGB", screenshot).save(buffer, "PNG")
+        self.png = buffer.getvalue()
+
+    def execute_script(self, script: str) -> int:
+        return self.viewport[0] if "innerWidth" in script else self.viewport[1]
+
+    def get_screenshot_as_png(self) -> bytes:
+        return self.png
+
+
+def loop_find_matching_dom_element(
+    element: UnifiedElement,
+    dom_elements: list[UnifiedElement],
+    overlap_threshold: float
+) -> Optional[UnifiedElement]:
+    """ElementMerger._find_matching_dom_element as it was before vectorisation."""
+    if not element or not element.bounding_box:
+        return None
+
+    best_match = None
+    best_overlap = overlap_threshold
+
+    for dom_elem in dom_elements:
+        if not dom_elem or not dom_elem.bounding_box:
+            continue
+
+        overlap = element.bounding_box.calculate_overlap(dom_elem.bounding_box)
+        if overlap <= best_overlap:
+            continue
+
+        if element.element_type == "ocr":
+            dom_text = (dom_elem.content or dom_elem.dom_text or "").strip().lower()
+            ocr_text = (element.content or "").strip().lower()
+
+            if dom_text and (dom_text in ocr_text or ocr_text in dom_text):
+                best_overlap = overlap
+                best_match = dom_elem
+        elif element.tag.lower() == dom_elem.tag.lower():
+            best_overlap = overlap
+            best_match = dom_elem
+
+    return best_match
+
+
+def random_box(rng: random.Random) -> BoundingBox:
+    # A coarse grid makes identical boxes, and so tied overlaps, common
+    left = rng.randrange(0, 100, 10)
+    top = rng.randrange(0, 100, 10)
+    return BoundingBox.from_edges(
+        left, top, left + rng.randrange(0, 60, 10), top + rng.randrange(0, 60, 10)
+    )
+
+
+def random_element(rng: random.Random, element_type: str) -> UnifiedElement:
+    return UnifiedElement(
+        bounding_box=random_box(rng),
+        content=rng.choice(TEXTS) or None,
+        dom_text=rng.choice(TEXTS) or None,
+        element_type=element_type,
+        tag=rng.choice(TAGS),
+    )
+
+
+def test_overlap_matrix_matches_calculate_overlap():
+    rng = random.Random(0)
+    boxes = [random_box(rng) for _ in range(40)]
+    others = [random_box(rng) for _ in range(30)]
+
+    matrix = BoundingBox.overlap_matrix(BoundingBox.stack(boxes), BoundingBox.stack(others))
+
+    expected = [[box.calculate_overlap(other) for other in others] for box in boxes]
+    np.testing.assert_array_equal(matrix, expected)
+
+
+def test_calculate_overlaps_matches_calculate_overlap():
+    rng = random.Random(1)
+    box = random_box(rng)
+    others = [random_box(rng) for _ in range(50)]
+
+    overlaps = box.calculate_overlaps(BoundingBox.stack(others))
+
+    np.testing.assert_array_equal(overlaps, [box.calculate_overlap(other) for other in others])
+
+
+def test_missing_boxes_never_match():
+    box = BoundingBox.from_edges(0, 0, 10, 10)
+    overlaps = box.calculate_overlaps(BoundingBox.stack([None, box]))
+
+    assert np.isnan(overlaps[0])
+    assert overlaps[1] == 1.0
+    assert not overlaps[0] > 0.5
+
+
+@pytest.mark.parametrize("element_type", ["ocr", "clickable"])
+@pytest.mark.parametrize("seed", range(25))
+def test_find_matching_dom_element_matches_loop(element_type, seed):
+    rng = random.Random(seed)
+    merger = ElementMerger(overlap_threshold=rng.choice([0.0, 0.25, 0.5, 0.9]))
+    dom_elements = [random_element(rng, "dom") for _ in range(rng.randint(0, 40))]
+    dom_boxes = BoundingBox.stack([elem.bounding_box for elem in dom_elements])
+
+    for _ in range(20):
+        element = random_element(rng, element_type)
+        expected = loop_find_matching_dom_element(
+            element, dom_elements, merger.overlap_threshold
+        )
+
+        assert merger._find_matching_dom_element(element, dom_elements) is expected
+        assert merger._find_matching_dom_element(element, dom_elements, dom_boxes) is expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_match_dom_elements_matches_loop(monkeypatch, seed):
+    rng = random.Random(seed)
+    merger = ElementMerger()
+    dom_elements = [random_element(rng, "dom") for _ in range(30)]
+    elements = [
+        random_element(rng, rng.choice(["ocr", "clickable"])) for _ in range(20)
+    ]
+    expected = [
+        loop_find_matching_dom_element(element, dom_elements, merger.overlap_threshold)
+        for element in elements
+    ]
+    copied = []
+    monkeypatch.setattr(
+        UnifiedElement, "copy_dom_properties", lambda self, dom_elem: copied.append(dom_elem)
+    )
+
+    merger._match_dom_elements(
+        elements, dom_elements, BoundingBox.stack([elem.bounding_box for elem in dom_elements])
+    )
+
+    assert [id(match) for match in copied] == [
+        id(match) for match in expected if match is not None
+    ]
+
+
+def test_batch_boxes_match_from_polygon():
+    rng = np.random.default_rng(0)
+    driver = FakeDriver(viewport=(800, 600), screenshot=(1600, 1200))
+    lines = [
+        OCRLine(
+            confidence=0.9,
+            content=f"line {i}",
+            polygon=rng.uniform(0, 1600, size=2 * rng.choice([4, 4, 5])),
+            words=[],
+        )
+        for i in range(25)
+    ]
+
+    batch = OCRElementBatch.from_lines(lines)
+    boxes = batch.scaled_boxes(*BoundingBox.get_scale_factors(driver))
+
+    assert batch.contents == [line.content for line in lines]
+    for line, box in zip(lines, boxes):
+        assert BoundingBox.from_edges(*map(float, box)) == BoundingBox.from_polygon(
+            line.polygon, driver
+        )
+
+
+def test_batch_rejects_short_polygons():
+    line = OCRLine(confidence=0.9, content="x", polygon=[0, 0, 1, 0, 1, 1], words=[])
+
+    with pytest.raises(ValueError):
+        OCRElementBatch.from_lines([line])
@@ -0,0 +1,128 @@
+import random
+
+import numpy as np
+import pytest
+
+from web_browser.document_intelligence.utils import PageWordIndex
+
+
+def scan_words(page: dict, line: dict) -> list[dict]:
+    """Line word lookup as it was before PageWordIndex: a scan of every word."""
+    def spans_overlap(word_span: dict, line_span: dict) -> bool:
+        word_start = word_span["offset"]
+        word_end = word_span["offset"] + word_span["length"]
+        line_start = line_span["offset"]
+        line_end = line_span["offset"] + line_span["length"]
+
+        return (word_start >= line_start and word_start < line_end) or \
+               (word_end > line_start and word_end <= line_end) or \
+               (word_start <= line_start and word_end >= line_end)
+
+    return [
+        word for word in page.get("words") or []
+        if any(spans_overlap(word["span"], span) for span in line["spans"])
+    ]
+
+
+def make_word(offset: int, length: int, confidence: float = 0.9) -> dict:
+    return {
+        "content": f"w{offset}",
+        "confidence": confidence,
+        "span": {"offset": offset, "length": length},
+    }
+
+
+def make_line(*spans: tuple[int, int]) -> dict:
+    return {"spans": [{"offset": offset, "length": length} for offset, length in spans]}
+
+
+@pytest.fixture
+def page() -> dict:
+    # "alpha beta gamma delta", with the words listed out of offset order
+    return {
+        "words": [
+            make_word(11, 5, 0.7),
+            make_word(0, 5, 0.9),
+            make_word(17, 5, 0.6),
+            make_word(6, 4, 0.8),
+        ]
+    }
+
+
+def test_words_and_confidences_keep_page_order(page):
+    index = PageWordIndex(page)
+
+    assert index.words is page["words"]
+    np.testing.assert_array_equal(index.confidences, [0.7, 0.9, 0.6, 0.8])
+
+
+def test_get_words_within_line(page):
+    index = PageWordIndex(page)
+
+    assert index.get_words(make_line((0, 10))) == [page["words"][1], page["words"][3]]
+    assert index.get_words(make_line((11, 11))) == [page["words"][0], page["words"][2]]
+
+
+def test_word_starting_before_span_is_included(page):
+    index = PageWordIndex(page)
+
+    assert index.get_words(make_line((3, 4))) == [page["words"][1], page["words"][3]]
+
+
+def test_touching_spans_do_not_overlap(page):
+    index = PageWordIndex(page)
+
+    assert index.get_words(make_line((5, 1))) == []
+    assert index.get_words(make_line((10, 1))) == []
+
+
+def test_multiple_spans(page):
+    index = PageWordIndex(page)
+
+    assert index.get_words(make_line((0, 5), (17, 5))) == [page["words"][1], page["words"][2]]
+
+
+def test_line_indices_are_sorted_page_indices(page):
+    index = PageWordIndex(page)
+
+    np.testing.assert_array_equal(index.line_indices(make_line((17, 5), (0, 10))), [1, 2, 3])
+
+
+@pytest.mark.parametrize("missing", [{}, {"words": None}, {"words": []}])
+def test_page_without_words(missing):
+    index = PageWordIndex(missing)
+
+    assert index.words == []
+    assert index.confidences.shape == (0,)
+    assert index.get_words(make_line((0, 10))) == []
+
+
+def test_line_without_spans(page):
+    index = PageWordIndex(page)
+
+    assert index.get_words({"spans": []}) == []
+    assert index.get_words({}) == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_scan(seed):
+    rng = random.Random(seed)
+
+    words = []
+    offset = 0
+    for _ in range(rng.randint(0, 60)):
+        offset += rng.randint(0, 3)
+        length = rng.randint(1, 8)
+        words.append(make_word(offset, length, rng.random()))
+        offset += length
+    rng.shuffle(words)
+    page = {"words": words}
+    index = PageWordIndex(page)
+
+    for _ in range(30):
+        spans = []
+        for _ in range(rng.randint(1, 3)):
+            # The service never emits empty spans
+            spans.append((rng.randint(0, offset + 5), rng.randint(1, 20)))
+        line = make_line(*spans)
+        assert index.get_words(line) == scan_words(page, line)
@@ -0,0 +1,67 @@
+import unicodedata
+
+import pytest
+
+from web_browser.document_intelligence.text_processing import normalize_text
+
+
+def reference_normalize_text(text: str, preserve_newlines: bool = True) -> str:
+    """normalize_text as it was before the translate table."""
+    if not text:
+        return ""
+
+    text = unicodedata.normalize("NFC", text)
+    text = "".join(
+        char for char in text
+        if unicodedata.category(char)[0] != "C" or char in "\n\t"
+    )
+
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    separator = "\n" if preserve_newlines else " "
+    return separator.join(line for line in lines if line)
+
+
+SAMPLES = [
+    "",
+    "plain ascii text",
+    "  leading and trailing  ",
+    "tabs\tinside\tlines",
+    "first line\nsecond line\n\nfourth line\n",
+    "windows\r\nline\r\nendings",
+    "nul\x00 and bell\x07 and escape\x1b[0m",
+    "delete\x7f and c1\x85 next line\x9f",
+    "soft\xadhyphen and nbsp\xa0space",
+    "zero\u200bwidth\u200djoiner\ufeffbom",
+    "line\u2028separator\u2029paragraph",
+    "e\u0301 decomposed and \u00e9 composed",
+    "private\ue000use and \U0001f600 emoji",
+    "unassigned \U000e0001 tag and \U0010ffff",
+    "vertical\x0btab and form\x0cfeed",
+    "Ünïcödé — “quotes” and ‘apostrophes’",
+]
+
+
+@pytest.mark.parametrize("preserve_newlines", [True, False])
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_reference(text, preserve_newlines):
+    assert normalize_text(text, preserve_newlines) == reference_normalize_text(
+        text, preserve_newlines
+    )
+
+
+@pytest.mark.parametrize("preserve_newlines", [True, False])
+def test_matches_reference_on_every_bmp_character(preserve_newlines):
+    text = "".join(
+        f"a{chr(codepoint)}b\n" for codepoint in range(0x10000)
+        if not 0xD800 <= codepoint <= 0xDFFF
+    )
+    assert normalize_text(text, preserve_newlines) == reference_normalize_text(
+        text, preserve_newlines
+    )
+
+
+def test_repeated_calls_are_memoized():
+    normalize_text.cache_clear()
+    normalize_text("repeated header")
+    normalize_text("repeated header")
+    assert normalize_text.cache_info().hits == 1
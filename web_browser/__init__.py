@@ -1,34 +1,68 @@
-import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
+import numpy as np
+import orjson
 from PIL import Image
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
 
 from web_browser.document_intelligence.client import DocumentClient
 from web_browser.document_intelligence.config import ProcessingConfig
 from web_browser.document_intelligence.processor import DocumentProcessor
 from web_browser.dom.builder import DOMTreeBuilder
 from web_browser.dom.models import DOMTree
-from web_browser.driver import new_webdriver
+from web_browser.driver import (WebDriverPool, capture_jpeg_screenshot,
+                                 new_webdriver)
 from web_browser.history import BrowserHistory
+from web_browser.serialization import write_json_list
 from web_browser.types import HistoryEntry
 from web_browser.vision.client import VisionAnalysisClient
-from web_browser.vision.types import (ImageElement, InteractiveElement,
-                                      WebpageDescription)
+from web_browser.vision.types import WebpageDescription
 from web_browser.web_analyzer.analyzer import ElementAnalyzer
 from web_browser.web_analyzer.config import Config
+from web_browser.web_analyzer.elements.bounding_box import BoundingBox
 from web_browser.web_analyzer.elements.merger import ElementMerger
 from web_browser.web_analyzer.elements.unified_element import UnifiedElement
 from web_browser.web_analyzer.utils import js
+from web_browser.web_analyzer.utils.text import sanitize_filename
+
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
 
 logger = logging.getLogger(__name__)
 
+# Hover criteria keys UnifiedElement carries the data for; it has no class or id
+_HOVER_CRITERIA_KEYS = frozenset({"tag", "text"})
+# Optional description fields, written only when the model filled them in
+_INTERACTIVE_ELEMENT_OPTIONAL_FIELDS = ("text", "state")
+_LAYOUT_OPTIONAL_FIELDS = ("header", "navigation", "sidebar")
+# UnifiedElement fields before and after confidence/bounding_box in the output
+_UNIFIED_ELEMENT_LEADING_FIELDS = ("content", "element_type", "tag")
+_UNIFIED_ELEMENT_TRAILING_FIELDS = (
+    "screenshots",
+    "image_caption",
+    "href",
+    "src",
+    "selector",
+    "visibility",
+    "dom_text",
+    "ocr_text",
+)
+
+# Seconds to wait for the load event, kept below the default script timeout
+PAGE_LOAD_TIMEOUT = 10
+# Seconds without new resource loads before the page is considered settled
+NETWORK_IDLE_WINDOW = 0.5
+NETWORK_IDLE_POLL_INTERVAL = 0.1
+
 
 class WebBrowser:
     def __init__(
@@ -37,21 +71,37 @@ class WebBrowser:
         screenshot_dir: str = "ui",
         parse_delay: float = 30,
         overlap_threshold: float = 0.5,
+        driver_pool: Optional[WebDriverPool] = None,
+        eager_screenshot: bool = False,
     ) -> None:
         """
         Initialize the WebBrowser instance.
 
         Args:
             screenshot_dir: Directory to store screenshots
-            parse_delay: Delay in seconds to wait for page load
+            parse_delay: Maximum seconds to wait for the page to settle after load
             overlap_threshold: Threshold for element overlap matching
+            driver_pool: Optional pool to take the driver from and return it to
+                         on close; the pool's headless setting then applies
+            eager_screenshot: Capture history screenshots on navigation instead
+                              of when first requested or when the browser
+                              leaves the page, whichever comes first
         """
         self.driver: WebDriver = None
+        self.driver_pool: Optional[WebDriverPool] = driver_pool
+        self.eager_screenshot: bool = eager_screenshot
         self.headless: bool = headless
         self.history: BrowserHistory = BrowserHistory()
         self.parse_delay: float = parse_delay
         self.overlap_threshold: float = overlap_threshold
         self.screenshot_dir: Path = Path(screenshot_dir)
+        self._document_processor: Optional[DocumentProcessor] = None
+        self._dom_builder: Optional[DOMTreeBuilder] = None
+        self._element_analyzer: Optional[ElementAnalyzer] = None
+        self._element_merger: Optional[ElementMerger] = None
+        self._vision_client: Optional[VisionAnalysisClient] = None
+        self._viewport_cache: Optional[tuple[str, int]] = None
+        self._viewport_metrics: Optional[tuple[float, float, float]] = None
 
         self.screenshot_dir.mkdir(exist_ok=True)
         self._setup_driver()
@@ -75,78 +125,254 @@ class WebBrowser:
         Args:
             elements: List of UnifiedElements to potentially analyze
             criteria: Optional list of criteria dicts to filter elements.
-                     If None, analyzes all provided elements.
+                     If None, analyzes all provided elements. An empty list
+                     matches no elements.
 
         Returns:
             dict[str, dict]: Dictionary mapping element selectors to their hover changes
+
+        Raises:
+            ValueError: If a criteria dict has a key other than 'tag' or 'text'
         """
-        config = Config(
-            screenshot_dir=str(self.screenshot_dir),
-            parse_delay=0,
-            viewport_only=True
-        )
-        analyzer = ElementAnalyzer(config)
-        
         hover_changes = {}
-        
+
+        if criteria is not None and not criteria:
+            return hover_changes
+
+        predicates = [self._compile_criterion(c) for c in criteria or []]
+
+        # Filter before any WebDriver call, keeping the first element per selector
+        candidates: dict[str, UnifiedElement] = {}
         for element in elements:
-            if not element.selector:
+            if not element.selector or element.selector in candidates:
                 continue
-                
-            if criteria and not any(self._element_matches_criteria(element, c) for c in criteria):
+            if predicates and not any(matches(element) for matches in predicates):
                 continue
-                
-            try:
-                web_element = self.driver.find_element("css selector", element.selector)
-            except Exception:
+            candidates[element.selector] = element
+
+        if not candidates:
+            return hover_changes
+
+        analyzer = self._get_element_analyzer()
+
+        # Resolve every selector in a single round trip, hit-testing the
+        # bounding box center for selectors that no longer match
+        points = [
+            (
+                element.bounding_box.left + element.bounding_box.width / 2,
+                element.bounding_box.top + element.bounding_box.height / 2
+            ) if element.bounding_box else None
+            for element in candidates.values()
+        ]
+        resolved = js.get_elements_by_selectors(
+            self.driver, list(candidates), points
+        )
+
+        for (selector, element), match in zip(candidates.items(), resolved):
+            if not match:
                 continue
-                
+
             temp_element = {
-                "element": web_element,
+                "element": match["element"],
                 "tag": element.tag or "",
                 "text": element.content or "",
-                "rect": {
-                    "left": element.bounding_box.left,
-                    "top": element.bounding_box.top,
-                    "width": element.bounding_box.width,
-                    "height": element.bounding_box.height
-                }
+                "rect": match["rect"]
             }
             
             hover_data = analyzer.capture_hover_state(self.driver, temp_element, 0)
             if hover_data:
                 changes = analyzer._analyze_hover_data(hover_data)
                 if changes:
-                    hover_changes[element.selector] = changes
+                    hover_changes[selector] = changes
                     
         return hover_changes
     
+    def _attach_history_screenshot(self, entry: HistoryEntry) -> None:
+        """
+        Defer the history screenshot for an entry until it is needed.
+
+        The screenshot is taken when it is first requested or, at the latest,
+        just before the browser leaves the page (see
+        _capture_pending_history_screenshot), so it always shows the entry's
+        own page and no entry is left without one.
+
+        Args:
+            entry: History entry that was just added or made current
+        """
+        def capture() -> Optional[str]:
+            if not self.driver or self.history.get_current() is not entry:
+                return None
+
+            screenshot_path = (
+                self.screenshot_dir
+                / f"history_{int(entry.timestamp.timestamp())}.jpg"
+            )
+            logger.info(f"Taking history screenshot: {screenshot_path}")
+            screenshot_path.write_bytes(self._capture_jpeg_bytes())
+            return str(screenshot_path)
+
+        entry.capture_screenshot = capture
+        if self.eager_screenshot:
+            entry.get_screenshot_path()
+
     def _build_dom(self) -> DOMTree:
         """Build and return the DOM tree for the current page."""
-        builder = DOMTreeBuilder(self.driver)
-        return builder.build_tree()
+        return self._get_dom_builder().build_tree()
+
+    def _capture_jpeg_bytes(self) -> bytes:
+        """Capture the viewport as JPEG bytes encoded by the browser."""
+        return capture_jpeg_screenshot(self.driver, quality=85)
+
+    def _capture_element_jpeg(
+        self, element: UnifiedElement, padding: int = 70
+    ) -> Optional[bytes]:
+        """
+        Capture a UnifiedElement region with padding as browser-encoded JPEG bytes.
+
+        Args:
+            element: UnifiedElement to capture
+            padding: Number of screenshot pixels to add around the element
+
+        Returns:
+            bytes or None: JPEG bytes of the element region if it is visible
+        """
+        if not element or not element.bounding_box:
+            return None
+
+        dpr, viewport_width, viewport_height = self._get_viewport_metrics()
+        bounding_box = element.bounding_box
+
+        # Padding is given in screenshot pixels, the clip region in CSS pixels
+        css_padding = padding / dpr
+        left = max(0.0, bounding_box.left - css_padding)
+        top = max(0.0, bounding_box.top - css_padding)
+        right = min(
+            viewport_width,
+            bounding_box.left + bounding_box.width + css_padding
+        )
+        bottom = min(
+            viewport_height,
+            bounding_box.top + bounding_box.height + css_padding
+        )
+
+        # Ensure coordinates are valid
+        if left >= right or top >= bottom:
+            return None
+
+        # Element rects are relative to the viewport, but the clip region is
+        # relative to the document, so the scroll position is added back
+        scroll_x, scroll_y = self._get_scroll_offset()
+
+        # Let the browser encode only the element region
+        return capture_jpeg_screenshot(
+            self.driver,
+            clip={
+                "x": scroll_x + left,
+                "y": scroll_y + top,
+                "width": right - left,
+                "height": bottom - top,
+                "scale": 1
+            }
+        )
+
+    def _capture_pending_history_screenshot(self) -> None:
+        """Take the current entry's deferred screenshot before the browser leaves its page."""
+        entry = self.history.get_current()
+        if entry is not None:
+            entry.get_screenshot_path()
 
     def close(self) -> None:
         """Close the browser and clean up resources."""
         if self.driver:
-            self.driver.quit()
+            try:
+                self._capture_pending_history_screenshot()
+            except Exception as e:
+                logger.warning(f"Failed to take history screenshot on close: {e}")
+            if self.driver_pool:
+                self.driver_pool.release(self.driver)
+            else:
+                self.driver.quit()
             self.driver = None
+        if self._vision_client:
+            self._vision_client.close()
+            self._vision_client = None
+        if self._element_analyzer:
+            self._element_analyzer.close()
+            self._element_analyzer = None
     
-    def _element_matches_criteria(self, element: UnifiedElement, criteria: dict) -> bool:
-        """Check if an element matches the given criteria."""
-        if "tag" in criteria and criteria["tag"].lower() != (element.tag or "").lower():
-            return False
-            
-        if "class" in criteria and criteria["class"] not in (element.class_name or ""):
-            return False
-            
-        if "id" in criteria and criteria["id"] != element.id:
-            return False
-            
-        if "text" in criteria and criteria["text"] not in (element.content or ""):
-            return False
-            
-        return True
+    @staticmethod
+    def _compile_criterion(criterion: dict) -> Callable[[UnifiedElement], bool]:
+        """
+        Build a predicate for one hover criteria dict.
+
+        The dict is inspected once so the returned function only runs the
+        checks the criterion actually specifies.
+
+        Args:
+            criterion: Dict with optional 'tag' and 'text' keys
+
+        Returns:
+            Function returning True if an element matches every given key
+
+        Raises:
+            ValueError: If the dict has any other key
+        """
+        unsupported = criterion.keys() - _HOVER_CRITERIA_KEYS
+        if unsupported:
+            raise ValueError(
+                f"Unsupported hover criteria keys: {', '.join(sorted(unsupported))}"
+            )
+
+        checks: list[Callable[[UnifiedElement], bool]] = []
+
+        if "tag" in criterion:
+            tag = criterion["tag"].lower()
+            checks.append(lambda element: (element.tag or "").lower() == tag)
+
+        if "text" in criterion:
+            text = criterion["text"]
+            checks.append(lambda element: text in (element.content or ""))
+
+        if not checks:
+            return lambda element: True
+        if len(checks) == 1:
+            return checks[0]
+        return lambda element: all(check(element) for check in checks)
+
+    def _element_screenshot_filename(
+        self, element: UnifiedElement, filename: Optional[str] = None
+    ) -> str:
+        """Return the JPEG filename for an element screenshot, generating one if needed."""
+        # Generate filename if not provided
+        if not filename:
+            element_type = element.element_type or "unknown"
+            content = element.content or "no_content"
+            # Clean content for filename
+            content = sanitize_filename(content[:30])
+            filename = f"element_{element_type}_{content}.jpg"
+
+        # Ensure filename has .jpg extension
+        if not filename.lower().endswith(".jpg"):
+            filename = str(Path(filename).with_suffix(".jpg"))
+
+        return filename
+
+    def _ensure_viewport_jpeg(self) -> Path:
+        """
+        Return the viewport screenshot, capturing it only if the page state changed.
+
+        Returns:
+            Path: Path to viewport.jpg for the current URL and scroll position
+        """
+        viewport_filename = self.screenshot_dir / "viewport.jpg"
+        viewport_key = self._get_viewport_cache_key()
+
+        if self._viewport_cache == viewport_key and viewport_filename.exists():
+            return viewport_filename
+
+        viewport_filename.write_bytes(self._capture_jpeg_bytes())
+        self._viewport_cache = viewport_key
+        return viewport_filename
     
     def get_current_url(self) -> Optional[str]:
         """Get current URL from history"""
@@ -166,38 +392,104 @@ class WebBrowser:
         Returns:
             PIL.Image.Image or None: Screenshot of the element region if successful
         """
-        if not element or not element.bounding_box:
+        screenshot_bytes = self._capture_element_jpeg(element, padding)
+        if not screenshot_bytes:
             return None
+        return Image.open(BytesIO(screenshot_bytes))
 
-        # Take viewport screenshot
-        screenshot_bytes = self.driver.get_screenshot_as_png()
-        viewport_screenshot = Image.open(BytesIO(screenshot_bytes))
+    def get_element_screenshots(
+        self, elements: list[UnifiedElement], padding: int = 70
+    ) -> list[Optional[Image.Image]]:
+        """
+        Capture screenshots of several UnifiedElements from a single viewport capture.
 
-        # Get device pixel ratio for scaling
-        dpr = self.driver.execute_script("return window.devicePixelRatio || 1")
+        The viewport is captured and decoded once; each element is cut out of
+        the decoded pixels by array slicing rather than a capture per element.
 
-        # Scale coordinates by device pixel ratio
-        left = max(0, int(element.bounding_box.left * dpr) - padding)
-        top = max(0, int(element.bounding_box.top * dpr) - padding)
-        right = min(
-            viewport_screenshot.width,
-            int((element.bounding_box.left + element.bounding_box.width) * dpr)
-            + padding,
-        )
-        bottom = min(
-            viewport_screenshot.height,
-            int((element.bounding_box.top + element.bounding_box.height) * dpr)
-            + padding,
+        Args:
+            elements: UnifiedElements to capture
+            padding: Number of pixels to add around each element (default: 70)
+
+        Returns:
+            list[Optional[PIL.Image.Image]]: Screenshot of each element region,
+            or None where an element has no visible region
+        """
+        if not elements:
+            return []
+
+        viewport = np.asarray(
+            Image.open(BytesIO(self.driver.get_screenshot_as_png()))
         )
+        height, width = viewport.shape[:2]
+        dpr = self._get_viewport_metrics()[0]
 
-        # Ensure coordinates are valid
-        if left >= right or top >= bottom:
-            return None
+        element_images = []
+        for element in elements:
+            if not element or not element.bounding_box:
+                element_images.append(None)
+                continue
+
+            bounding_box = element.bounding_box
+            left = max(0, int(bounding_box.left * dpr) - padding)
+            top = max(0, int(bounding_box.top * dpr) - padding)
+            right = min(
+                width,
+                int((bounding_box.left + bounding_box.width) * dpr) + padding
+            )
+            bottom = min(
+                height,
+                int((bounding_box.top + bounding_box.height) * dpr) + padding
+            )
+
+            if left >= right or top >= bottom:
+                element_images.append(None)
+                continue
+
+            element_images.append(
+                Image.fromarray(viewport[top:bottom, left:right])
+            )
 
-        # Crop and return
-        return viewport_screenshot.crop((left, top, right, bottom))
+        return element_images
 
-    def get_history_entries(self) -> list[HistoryEntry]:
+    def _get_document_processor(self) -> DocumentProcessor:
+        """Get the document processor, creating its client on first use."""
+        if self._document_processor is None:
+            processing_config = ProcessingConfig(
+                min_confidence=0.8, 
+                clean_text=True, 
+                debug_output=True
+            )
+            self._document_processor = DocumentProcessor(
+                DocumentClient.from_env(), processing_config
+            )
+        return self._document_processor
+
+    def _get_dom_builder(self) -> DOMTreeBuilder:
+        """Get the DOM tree builder, creating it on first use."""
+        if self._dom_builder is None:
+            self._dom_builder = DOMTreeBuilder(self.driver)
+        return self._dom_builder
+
+    def _get_element_analyzer(self) -> ElementAnalyzer:
+        """Get the element analyzer, creating it on first use."""
+        if self._element_analyzer is None:
+            config = Config(
+                screenshot_dir=str(self.screenshot_dir),
+                parse_delay=0,
+                viewport_only=True
+            )
+            self._element_analyzer = ElementAnalyzer(config)
+        return self._element_analyzer
+
+    def _get_element_merger(self) -> ElementMerger:
+        """Get the element merger, creating it on first use."""
+        if self._element_merger is None:
+            self._element_merger = ElementMerger(
+                overlap_threshold=self.overlap_threshold
+            )
+        return self._element_merger
+
+    def get_history_entries(self) -> tuple[HistoryEntry, ...]:
         """Get all history entries"""
         return self.history.get_history()
 
@@ -208,14 +500,16 @@ class WebBrowser:
         Returns:
             str: Description of the page content
         """
-        viewport_filename = self.screenshot_dir / "viewport.jpg"
-        self._save_screenshot(
-            self.driver.get_screenshot_as_png(),
-            viewport_filename
-        )
+        viewport_filename = self._ensure_viewport_jpeg()
 
-        vision_client = VisionAnalysisClient.from_env()
-        return vision_client.describe_screenshot(str(viewport_filename))
+        return self._get_vision_client().describe_screenshot(str(viewport_filename))
+
+    def _get_scroll_offset(self) -> tuple[float, float]:
+        """Get the current scroll position in CSS pixels; not cached, as the page may scroll itself."""
+        scroll_x, scroll_y = self.driver.execute_script(
+            "return [window.scrollX, window.scrollY]"
+        )
+        return float(scroll_x), float(scroll_y)
 
     def get_unified_elements(self, detect_hover_for: Optional[list[dict]] = None) -> list[UnifiedElement]:
         """
@@ -235,44 +529,60 @@ class WebBrowser:
         Returns:
             List[UnifiedElement]: List of unified elements combining OCR and clickable elements
         """
-        viewport_filename = self.screenshot_dir / "viewport.jpg"
-
-        config = Config(
-            screenshot_dir=str(self.screenshot_dir),
-            parse_delay=0,
-            viewport_only=True
-        )
-        analyzer = ElementAnalyzer(config)
-
-        clickable_elements = analyzer.analyze_elements(
-            self.driver,
-            hover_criteria=detect_hover_for
-        )
-
-        # Initialize document processing
-        client = DocumentClient.from_env()
-        processing_config = ProcessingConfig(
-            min_confidence=0.8, 
-            clean_text=True, 
-            debug_output=True
-        )
-        processor = DocumentProcessor(client, processing_config)
+        analyzer = self._get_element_analyzer()
+        processor = self._get_document_processor()
+
+        # The analyzer writes viewport.jpg for the state the page is in now
+        viewport_key = self._get_viewport_cache_key()
+        viewport_filename = analyzer.prepare_viewport(self.driver)
+        self._viewport_cache = viewport_key
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # OCR is a remote call; run it while the driver-bound stages run here
+            ocr_future = executor.submit(processor.analyze_read, str(viewport_filename))
+
+            clickable_elements = analyzer.analyze_elements(
+                self.driver,
+                hover_criteria=detect_hover_for,
+                viewport_ready=True
+            )
 
-        # Get OCR elements
-        ocr_elements = processor.analyze_read(str(viewport_filename))
+            # Get DOM elements
+            dom_tree = self._build_dom()
 
-        # Get DOM elements
-        dom_tree = self._build_dom()
+            # Get OCR elements
+            ocr_elements = ocr_future.result()
 
         # Merge elements
-        merger = ElementMerger(overlap_threshold=self.overlap_threshold)
-        return merger.merge_elements(
+        return self._get_element_merger().merge_elements(
             ocr_elements=ocr_elements,
             clickable_elements=clickable_elements,
             dom_tree=dom_tree,
             driver=self.driver,
         )
 
+    def _get_viewport_cache_key(self) -> tuple[str, int]:
+        """Get the URL and vertical scroll offset identifying the current viewport."""
+        url, scroll_y = self.driver.execute_script(
+            "return [window.location.href, window.scrollY | 0]"
+        )
+        return url, scroll_y
+
+    def _get_viewport_metrics(self) -> tuple[float, float, float]:
+        """Get the cached device pixel ratio and viewport size in CSS pixels."""
+        if self._viewport_metrics is None:
+            dpr, width, height = self.driver.execute_script(
+                "return [window.devicePixelRatio || 1, window.innerWidth, window.innerHeight]"
+            )
+            self._viewport_metrics = (float(dpr), float(width), float(height))
+        return self._viewport_metrics
+
+    def _get_vision_client(self) -> VisionAnalysisClient:
+        """Get the vision client, creating it on first use."""
+        if self._vision_client is None:
+            self._vision_client = VisionAnalysisClient.from_env()
+        return self._vision_client
+
     def go_back(self) -> bool:
         """
         Navigate back in history.
@@ -280,6 +590,10 @@ class WebBrowser:
         Returns:
             bool: True if navigation was successful
         """
+        if not self.history.can_go_back():
+            return False
+
+        self._capture_pending_history_screenshot()
         entry = self.history.go_back()
         if entry:
             self.driver.get(entry.url)
@@ -294,6 +608,10 @@ class WebBrowser:
         Returns:
             bool: True if navigation was successful
         """
+        if not self.history.can_go_forward():
+            return False
+
+        self._capture_pending_history_screenshot()
         entry = self.history.go_forward()
         if entry:
             self.driver.get(entry.url)
@@ -312,29 +630,21 @@ class WebBrowser:
             bool: True if navigation was successful, False otherwise
         """
         try:
+            self._capture_pending_history_screenshot()
             self.driver.get(url)
             self._wait_for_page_load()
 
             # Get page title
             title = self.driver.title or url
 
-            # Take screenshot for history
-            screenshot_path = (
-                self.screenshot_dir / f"history_{int(time.time())}.jpg"
-            )
-            self._save_screenshot(
-                self.driver.get_screenshot_as_png(),
-                screenshot_path
-            )
-
             # Create and add history entry
             entry = HistoryEntry(
                 url=url,
                 title=title,
                 timestamp=datetime.now(),
-                screenshot_path=str(screenshot_path),
             )
             self.history.add_entry(entry)
+            self._attach_history_screenshot(entry)
 
             return True
 
@@ -344,7 +654,7 @@ class WebBrowser:
 
     def refresh(self) -> bool:
         """
-        Refresh the current page and update its history entry with a new screenshot.
+        Refresh the current page and replace its history entry, including its screenshot.
 
         Returns:
             bool: True if refresh was successful, False otherwise
@@ -358,18 +668,9 @@ class WebBrowser:
             logger.info(f"Refreshing page at URL: {current_entry.url}")
             self.driver.refresh()
 
-            logger.info(f"Waiting {self.parse_delay}s for page to load...")
+            logger.info(f"Waiting up to {self.parse_delay}s for page to load...")
             self._wait_for_page_load()
 
-            screenshot_path = (
-                self.screenshot_dir / f"history_{int(time.time())}.jpg"
-            )
-            logger.info(f"Taking new screenshot: {screenshot_path}")
-            self._save_screenshot(
-                self.driver.get_screenshot_as_png(),
-                screenshot_path
-            )
-
             new_title = self.driver.title or current_entry.url
             logger.info(f"Updating history entry with new title: {new_title}")
 
@@ -377,9 +678,9 @@ class WebBrowser:
                 url=current_entry.url,
                 title=new_title,
                 timestamp=datetime.now(),
-                screenshot_path=str(screenshot_path),
             )
             self.history.update_current(new_entry)
+            self._attach_history_screenshot(new_entry)
 
             logger.info("Page refresh completed successfully")
             return True
@@ -390,22 +691,57 @@ class WebBrowser:
 
     def _save_screenshot(self, screenshot_bytes: bytes, filepath: Path) -> None:
         """
-        Save a screenshot as JPEG with proper RGB conversion.
+        Save a PNG screenshot as JPEG with proper RGB conversion.
+
+        Plain viewport captures should use _capture_jpeg_bytes instead; this
+        is for PNG input that may need alpha compositing.
         
         Args:
             screenshot_bytes: PNG screenshot bytes from webdriver
             filepath: Path where to save the JPEG file
         """
-        screenshot = Image.open(BytesIO(screenshot_bytes))
-        
-        # Convert to RGB if needed
-        if screenshot.mode in ("RGBA", "LA"):
-            background = Image.new("RGB", screenshot.size, (255, 255, 255))
-            background.paste(screenshot, mask=screenshot.split()[-1])
-            screenshot = background
-            
-        screenshot.save(filepath, "JPEG", quality=85)
-        
+        self._save_image(Image.open(BytesIO(screenshot_bytes)), filepath)
+
+    def _save_image(self, image: Image.Image, filepath: Path) -> None:
+        """
+        Save an image as JPEG, compositing any transparency onto white.
+
+        Args:
+            image: Image to save
+            filepath: Path where to save the JPEG file
+        """
+        # Composite onto white in one pass over the pixels
+        if image.mode in ("RGBA", "LA"):
+            pixels = np.asarray(
+                image if image.mode == "RGBA" else image.convert("RGBA")
+            )
+            alpha = pixels[..., 3:4].astype(np.uint16)
+            blended = (
+                pixels[..., :3].astype(np.uint16) * alpha + 255 * (255 - alpha)
+            ) // 255
+            image = Image.fromarray(blended.astype(np.uint8), "RGB")
+
+        if simplejpeg is not None and image.mode == "RGB":
+            filepath.write_bytes(
+                simplejpeg.encode_jpeg(
+                    np.ascontiguousarray(image),
+                    quality=85,
+                    colorspace="RGB",
+                    colorsubsampling="420",
+                    fastdct=True
+                )
+            )
+            return
+
+        image.save(
+            filepath,
+            "JPEG",
+            quality=85,
+            optimize=False,
+            subsampling=2,
+            progressive=False
+        )
+
     def save_element_screenshot(
         self,
         element: UnifiedElement,
@@ -423,36 +759,66 @@ class WebBrowser:
         Returns:
             str or None: Path to the saved screenshot if successful
         """
-        element_image = self.get_element_screenshot(element, padding)
-        if not element_image:
+        # The browser already produced a JPEG; write it without re-encoding
+        screenshot_bytes = self._capture_element_jpeg(element, padding)
+        if not screenshot_bytes:
             return None
 
-        # Generate filename if not provided
-        if not filename:
-            element_type = element.element_type or "unknown"
-            content = element.content or "no_content"
-            # Clean content for filename
-            content = "".join(
-                c for c in content[:30] if c.isalnum() or c in ("_", "-", ".")
-            ).rstrip(".")
-            filename = f"element_{element_type}_{content}.jpg"
+        output_path = self.screenshot_dir / self._element_screenshot_filename(
+            element, filename
+        )
+        output_path.write_bytes(screenshot_bytes)
 
-        # Ensure filename has .jpg extension
-        if not filename.lower().endswith(".jpg"):
-            filename = filename.rsplit(".", 1)[0] + ".jpg"
+        return str(output_path)
 
-        # Save to screenshot directory
-        output_path = self.screenshot_dir / filename
-        
-        # Convert to RGB if needed
-        if element_image.mode in ("RGBA", "LA"):
-            background = Image.new("RGB", element_image.size, (255, 255, 255))
-            background.paste(element_image, mask=element_image.split()[-1])
-            element_image = background
-            
-        element_image.save(output_path, "JPEG", quality=85)
+    def save_element_screenshots(
+        self,
+        elements: list[UnifiedElement],
+        filenames: Optional[list[Optional[str]]] = None,
+        padding: int = 70,
+    ) -> list[Optional[str]]:
+        """
+        Capture and save screenshots of several UnifiedElements.
 
-        return str(output_path)
+        A single element goes through save_element_screenshot; more than one
+        are cut out of one shared viewport capture.
+
+        Args:
+            elements: UnifiedElements to capture
+            filenames: Optional filenames matching elements (default: auto-generated)
+            padding: Number of pixels to add around each element (default: 70)
+
+        Returns:
+            list[Optional[str]]: Path to each saved screenshot, or None where
+            the element could not be captured
+        """
+        if filenames is None:
+            filenames = [None] * len(elements)
+        elif len(filenames) != len(elements):
+            raise ValueError("Expected one filename per element")
+
+        if len(elements) <= 1:
+            return [
+                self.save_element_screenshot(element, filename, padding)
+                for element, filename in zip(elements, filenames)
+            ]
+
+        saved_paths = []
+        element_images = self.get_element_screenshots(elements, padding)
+        for element, filename, element_image in zip(
+            elements, filenames, element_images
+        ):
+            if not element_image:
+                saved_paths.append(None)
+                continue
+
+            output_path = self.screenshot_dir / self._element_screenshot_filename(
+                element, filename
+            )
+            self._save_image(element_image, output_path)
+            saved_paths.append(str(output_path))
+
+        return saved_paths
 
     def save_history_to_json(
         self, filename: str = "browser_history.json"
@@ -467,15 +833,16 @@ class WebBrowser:
             {
                 "url": entry.url,
                 "title": entry.title,
-                "timestamp": entry.timestamp.isoformat(),
-                "screenshot_path": entry.screenshot_path,
+                "timestamp": entry.timestamp,
+                "screenshot_path": entry.get_screenshot_path(),
             }
             for entry in self.get_history_entries()
         ]
 
         output_path = self.screenshot_dir / filename
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(history_data, f, indent=2, ensure_ascii=False)
+        output_path.write_bytes(
+            orjson.dumps(history_data, option=orjson.OPT_INDENT_2)
+        )
 
     def save_unified_elements_to_json(
         self,
@@ -489,16 +856,13 @@ class WebBrowser:
             elements: List of UnifiedElement instances
             filename: Name of the output JSON file
         """
-        unified_elements_data = [
-            serialized
-            for elem in elements
-            if (serialized := WebBrowser.serialize_unified_element(elem))
-            is not None
-        ]
-
-        output_path = self.screenshot_dir / filename
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(unified_elements_data, f, indent=2, ensure_ascii=False)
+        write_json_list(
+            self.screenshot_dir / filename,
+            (
+                serialized for elem in elements
+                if (serialized := WebBrowser.serialize_unified_element(elem)) is not None
+            )
+        )
 
     @staticmethod
     def serialize_unified_element(
@@ -508,47 +872,28 @@ class WebBrowser:
         if not elem:
             raise ValueError("Expected a UnifiedElement object")
 
-        # Handle bounding box
-        bounding_box_data = None
-        if elem.bounding_box:
-            bounding_box_data = {
-                "left": elem.bounding_box.left,
-                "top": elem.bounding_box.top,
-                "right": elem.bounding_box.right,
-                "bottom": elem.bounding_box.bottom,
-                "width": elem.bounding_box.width,
-                "height": elem.bounding_box.height,
-            }
-
-        # Build dictionary with only non-None values
-        element_data = {}
+        # Only truthy values are kept, in the order of the field tuples
+        element_data = {
+            field: value
+            for field in _UNIFIED_ELEMENT_LEADING_FIELDS
+            if (value := getattr(elem, field))
+        }
 
-        if elem.content:
-            element_data["content"] = elem.content
-        if elem.element_type:
-            element_data["element_type"] = elem.element_type
-        if elem.tag:
-            element_data["tag"] = elem.tag
         if elem.confidence is not None:
             element_data["confidence"] = elem.confidence
-        if bounding_box_data:
-            element_data["bounding_box"] = bounding_box_data
-        if elem.screenshots:
-            element_data["screenshots"] = elem.screenshots
-        if elem.image_caption:
-            element_data["image_caption"] = elem.image_caption
-        if elem.href:
-            element_data["href"] = elem.href
-        if elem.src:
-            element_data["src"] = elem.src
-        if elem.selector:
-            element_data["selector"] = elem.selector
-        if elem.visibility:
-            element_data["visibility"] = elem.visibility
-        if elem.dom_text:
-            element_data["dom_text"] = elem.dom_text
-        if elem.ocr_text:
-            element_data["ocr_text"] = elem.ocr_text
+
+        bounding_box = elem.bounding_box
+        if bounding_box:
+            element_data["bounding_box"] = {
+                field: getattr(bounding_box, field)
+                for field in BoundingBox.__slots__
+            }
+
+        element_data.update(
+            (field, value)
+            for field in _UNIFIED_ELEMENT_TRAILING_FIELDS
+            if (value := getattr(elem, field))
+        )
 
         return element_data
 
@@ -571,70 +916,71 @@ class WebBrowser:
         if not description:
             raise ValueError("Expected a WebpageDescription object")
 
-        # Serialize ImageElement objects
-        def serialize_image(image: ImageElement) -> dict[str, str]:
-            return {
-                "location": image.location,
-                "content": image.content,
-                "purpose": image.purpose,
-            }
+        serialized = description.model_dump(mode="json")
 
-        # Serialize InteractiveElement objects
-        def serialize_interactive(elem: InteractiveElement) -> dict[str, Any]:
-            element_data = {
-                "type": elem.type,
-                "location": elem.location,
-                "visuals": elem.visuals,
-                "purpose": elem.purpose,
-            }
-            # Add optional fields only if they exist
-            if elem.text:
-                element_data["text"] = elem.text
-            if elem.state:
-                element_data["state"] = elem.state
-            return element_data
-
-        # Serialize LayoutSection
-        layout_data = {"main_content": description.layout.main_content}
-        # Add optional layout fields if they exist
-        if description.layout.header:
-            layout_data["header"] = description.layout.header
-        if description.layout.navigation:
-            layout_data["navigation"] = description.layout.navigation
-        if description.layout.sidebar:
-            layout_data["sidebar"] = description.layout.sidebar
-
-        # Build the complete serialized structure
-        return {
-            "layout": layout_data,
-            "interactive_elements": [
-                serialize_interactive(elem)
-                for elem in description.interactive_elements
-            ],
-            "key_content": {
-                "headings": description.key_content.headings,
-                "main_text_blocks": description.key_content.main_text_blocks,
-                "images": [
-                    serialize_image(img)
-                    for img in description.key_content.images
-                ],
-            },
-            "visual_hierarchy": {
-                "primary_focus": description.visual_hierarchy.primary_focus,
-                "secondary_elements": description.visual_hierarchy.secondary_elements,
-                "background_elements": description.visual_hierarchy.background_elements,
-            },
-        }
+        # Optional fields are omitted when empty as well as when unset, since
+        # strict schema responses often fill them with "" rather than null
+        layout = serialized["layout"]
+        for field in _LAYOUT_OPTIONAL_FIELDS:
+            if not layout[field]:
+                del layout[field]
+        for element in serialized["interactive_elements"]:
+            for field in _INTERACTIVE_ELEMENT_OPTIONAL_FIELDS:
+                if not element[field]:
+                    del element[field]
+
+        return serialized
 
     def _setup_driver(self):
         """Initialize the web driver and set up necessary configurations."""
-        self.driver = new_webdriver(self.headless)
+        if self.driver_pool:
+            self.driver = self.driver_pool.acquire()
+        else:
+            self.driver = new_webdriver(self.headless)
+        self.driver.execute_cdp_cmd("Page.enable", {})
+
+    def _wait_for_network_idle(self, timeout: float) -> bool:
+        """
+        Wait until no new resources have loaded for NETWORK_IDLE_WINDOW seconds.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            bool: True if the network went idle before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        last_count = -1
+        stable_since = time.monotonic()
+
+        while True:
+            count = self.driver.execute_script(
+                "return performance.getEntriesByType('resource').length"
+            )
+            now = time.monotonic()
+            if count != last_count:
+                last_count = count
+                stable_since = now
+            elif now - stable_since >= NETWORK_IDLE_WINDOW:
+                return True
+
+            if now >= deadline:
+                return False
+            time.sleep(NETWORK_IDLE_POLL_INTERVAL)
 
     def _wait_for_page_load(self):
-        """Wait for the page to fully load."""
-        time.sleep(self.parse_delay)
-        WebDriverWait(self.driver, 10).until(
-            lambda d: d.execute_script("return document.readyState")
-            == "complete"
-        )
+        """Wait for the page to load, using parse_delay as an upper bound."""
+        self._viewport_cache = None
+        self._viewport_metrics = None
+        # Cached element results belong to the page being replaced
+        if self._element_analyzer is not None:
+            self._element_analyzer.clear_caches()
+        if not js.wait_for_load(self.driver, PAGE_LOAD_TIMEOUT):
+            raise TimeoutException(
+                f"Page did not finish loading within {PAGE_LOAD_TIMEOUT}s"
+            )
+        if not self._wait_for_network_idle(self.parse_delay):
+            logger.info(
+                f"Network still busy after {self.parse_delay}s, continuing"
+            )
         js.init(self.driver)
@@ -1,45 +1,126 @@
-import json
+from __future__ import annotations
+
+import asyncio
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from pprint import pprint
-from typing import Any, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
 
+import orjson
 from dotenv import load_dotenv
-from PIL import Image
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
-
-from web_browser.document_intelligence.client import DocumentClient
-from web_browser.document_intelligence.config import ProcessingConfig
-from web_browser.document_intelligence.processor import DocumentProcessor
-from web_browser.dom.builder import DOMTreeBuilder
-from web_browser.dom.models import DOMTree
-from web_browser.driver import new_webdriver
-from web_browser.vision.client import VisionAnalysisClient
-from web_browser.vision.types import (ImageElement, InteractiveElement,
-                                      WebpageDescription)
-from web_browser.web_analyzer.analyzer import ElementAnalyzer
-from web_browser.web_analyzer.config import Config
-from web_browser.web_analyzer.element_search import ElementSearchSystem
-from web_browser.web_analyzer.elements.merger import ElementMerger
-from web_browser.web_analyzer.elements.unified_element import UnifiedElement
-from web_browser.web_analyzer.types import HoverChange, PageRegion
-from web_browser.web_analyzer.utils import js
+
+from web_browser.dom.js_scripts import GET_DOM_STATE_SCRIPT
+from web_browser.serialization import write_json_list
+from web_browser.web_analyzer.elements.bounding_box import BoundingBox
+from web_browser.web_analyzer.utils.text import sanitize_filename
+
+# Heavy dependencies (Selenium, PIL, the Azure SDKs, torch) are imported in
+# the functions that need them; these names are only used in annotations
+if TYPE_CHECKING:
+    from PIL import Image
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
+    from web_browser.dom.models import DOMTree
+    from web_browser.vision.types import WebpageDescription
+    from web_browser.web_analyzer.elements.unified_element import \
+        UnifiedElement
+    from web_browser.web_analyzer.types import HoverChange
 
 load_dotenv()
 
+# Last viewport capture per WebDriver session, with the page state it shows
+_viewport_cache: dict[str, tuple[tuple, tuple[Image.Image, float]]] = {}
+
+# Optional description fields, written only when the model filled them in
+_INTERACTIVE_ELEMENT_OPTIONAL_FIELDS = ("text", "state")
+_LAYOUT_OPTIONAL_FIELDS = ("header", "navigation", "sidebar")
+# UnifiedElement fields written around the nested bounding box/hover state
+_UNIFIED_ELEMENT_LEADING_FIELDS = ("content", "element_type", "tag")
+_UNIFIED_ELEMENT_TRAILING_FIELDS = (
+    "image_caption",
+    "href",
+    "src",
+    "selector",
+    "visibility",
+    "dom_text",
+    "ocr_text",
+)
+
 
 def build_dom(driver: WebDriver) -> DOMTree:
+    from web_browser.dom.builder import DOMTreeBuilder
+
     builder = DOMTreeBuilder(driver)
     dom_tree = builder.build_tree()
     return dom_tree
 
 
-def get_element_screenshot(driver: WebDriver, element: UnifiedElement, padding: int = 20) -> Optional[Image.Image]:
+def capture_viewport(driver: WebDriver) -> tuple[Image.Image, float]:
     """
-    Capture a screenshot of a specific UnifiedElement with padding around it.
+    Capture the viewport along with the device pixel ratio, reusing the last capture.
+
+    The previous capture is returned while the document, its DOM mutation
+    counter (installed by js.init), the scroll position and the viewport
+    are unchanged, the same state DOMTreeBuilder caches its tree on.
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        Tuple of the viewport screenshot and the device pixel ratio
+    """
+    from PIL import Image
+
+    from web_browser.driver import capture_jpeg_screenshot
+    from web_browser.web_analyzer.utils import js
+
+    state = tuple(driver.execute_script(GET_DOM_STATE_SCRIPT))
+
+    cached = _viewport_cache.get(driver.session_id)
+    if cached and state[1] is not None and cached[0] == state:
+        return cached[1]
+
+    viewport_img = Image.open(BytesIO(capture_jpeg_screenshot(driver)))
+    viewport_img.load()
+    capture = (viewport_img, js.get_device_pixel_ratio(driver))
+    _viewport_cache[driver.session_id] = (state, capture)
+    return capture
+
+
+def describe_viewport(viewport_filename: str) -> WebpageDescription:
+    """
+    Describe an already captured viewport screenshot and print the result.
+
+    Args:
+        viewport_filename: Path to the viewport screenshot
+
+    Returns:
+        WebpageDescription for the screenshot
+    """
+    from web_browser.vision.client import VisionAnalysisClient
+
+    with VisionAnalysisClient.from_env() as vision_client:
+        page_description = vision_client.describe_screenshot(viewport_filename)
+    serialized = serialize_webpage_description(page_description)
+    print("Page Description:")
+    print(orjson.dumps(serialized, option=orjson.OPT_INDENT_2).decode())
+    return page_description
+
+
+def get_element_screenshot(
+    viewport_img: Image.Image,
+    dpr: float,
+    element: UnifiedElement,
+    padding: int = 20
+) -> Optional[Image.Image]:
+    """
+    Crop a specific UnifiedElement with padding around it out of a viewport screenshot.
     
     Args:
+        viewport_img: Viewport screenshot, as returned by capture_viewport
+        dpr: Device pixel ratio the screenshot was taken at
         element: UnifiedElement to capture
         padding: Number of pixels to add around the element (default: 20)
         
@@ -48,59 +129,53 @@ def get_element_screenshot(driver: WebDriver, element: UnifiedElement, padding:
     """
     if not element or not element.bounding_box:
         return None
-        
-    # Take viewport screenshot
-    screenshot_bytes = driver.get_screenshot_as_png()
-    viewport_screenshot = Image.open(BytesIO(screenshot_bytes))
-
-    # Get device pixel ratio for scaling
-    dpr = driver.execute_script("return window.devicePixelRatio || 1")
     
     # Scale coordinates by device pixel ratio
     left = max(0, int(element.bounding_box.left * dpr) - padding)
     top = max(0, int(element.bounding_box.top * dpr) - padding)
-    right = min(viewport_screenshot.width, int((element.bounding_box.left + element.bounding_box.width) * dpr) + padding)
-    bottom = min(viewport_screenshot.height, int((element.bounding_box.top + element.bounding_box.height) * dpr) + padding)
+    right = min(viewport_img.width, int((element.bounding_box.left + element.bounding_box.width) * dpr) + padding)
+    bottom = min(viewport_img.height, int((element.bounding_box.top + element.bounding_box.height) * dpr) + padding)
     
     # Ensure coordinates are valid
     if left >= right or top >= bottom:
         return None
         
     # Crop and return
-    return viewport_screenshot.crop((left, top, right, bottom))
-
-
-def get_page_description(driver: WebDriver) -> str:
-    screenshot = driver.get_screenshot_as_png()
-    viewport_filename = "ui/viewport.jpg"
-    image = Image.open(BytesIO(screenshot))
-    image.save(viewport_filename)
-
-    vision_client = VisionAnalysisClient.from_env()
-    page_description = vision_client.describe_screenshot(viewport_filename)
-    serialized = serialize_webpage_description(page_description)
-    print("Page Description:")
-    pprint(serialized)
-    return page_description
+    return viewport_img.crop((left, top, right, bottom))
 
 
 def get_unified_elements(
     driver: WebDriver,
-    overlap_threshold: float = 0.5
-) -> list[UnifiedElement]:
+    overlap_threshold: float = 0.5,
+    describe_page: bool = False
+) -> tuple[list[UnifiedElement], Optional[WebpageDescription]]:
     """
     Get both OCR and clickable elements and merge them into a unified format.
+
+    The viewport is captured once, then OCR, the optional page description,
+    clickable-element analysis and the DOM build run concurrently on one event
+    loop. The OCR request is awaited with the async Azure client; the other
+    stages run in threads, and those that drive the browser share a lock,
+    since WebDriver commands are not thread-safe.
     
     Args:
         driver: WebDriver instance
         overlap_threshold: Threshold for element overlap matching
+        describe_page: Whether to also describe the viewport with the vision model
         
     Returns:
-        List of unified elements combining OCR and clickable elements
+        Tuple of the unified elements combining OCR and clickable elements, and
+        the page description (None unless describe_page is set)
     """
+    from web_browser.document_intelligence.client import DocumentClient
+    from web_browser.document_intelligence.config import ProcessingConfig
+    from web_browser.document_intelligence.processor import DocumentProcessor
+    from web_browser.web_analyzer.analyzer import ElementAnalyzer
+    from web_browser.web_analyzer.config import Config
+    from web_browser.web_analyzer.elements.merger import ElementMerger
+
     # Ensure the screenshot directory exists
     screenshot_dir = "ui"
-    viewport_filename = f"{screenshot_dir}/viewport.jpg"
 
     # Create configuration
     config = Config(
@@ -112,10 +187,6 @@ def get_unified_elements(
     # Create analyzer instance
     analyzer = ElementAnalyzer(config)
 
-    # Get clickable elements with screenshots
-    clickable_elements = analyzer.analyze_elements(driver)
-    print(f"\nFound {len(clickable_elements)} clickable elements.")
-
     # Initialize document processing components
     client = DocumentClient.from_env()
     processing_config = ProcessingConfig(
@@ -125,12 +196,37 @@ def get_unified_elements(
     )
     processor = DocumentProcessor(client, processing_config)
 
-    # Get OCR elements
-    ocr_elements = processor.analyze_read(viewport_filename)
-    print(f"Found {len(ocr_elements)} OCR elements.")
+    # Capture the viewport every stage works from
+    viewport_filename = str(analyzer.prepare_viewport(driver))
+    driver_lock = threading.Lock()
+
+    def analyze_clickable_elements() -> list[dict]:
+        with driver_lock:
+            return analyzer.analyze_elements(driver, viewport_ready=True)
+
+    def build_dom_locked() -> DOMTree:
+        with driver_lock:
+            return build_dom(driver)
+
+    async def run_stages() -> tuple:
+        # OCR is polled on the event loop; Selenium and vision calls block,
+        # so they run in worker threads
+        return await asyncio.gather(
+            processor.analyze_read_async(viewport_filename),
+            asyncio.to_thread(analyze_clickable_elements),
+            asyncio.to_thread(build_dom_locked),
+            asyncio.to_thread(describe_viewport, viewport_filename)
+            if describe_page else asyncio.sleep(0, result=None)
+        )
 
-    # Get DOM elements
-    dom_tree = build_dom(driver)
+    try:
+        ocr_elements, clickable_elements, dom_tree, page_description = asyncio.run(
+            run_stages()
+        )
+    finally:
+        analyzer.close()
+    print(f"\nFound {len(clickable_elements)} clickable elements.")
+    print(f"Found {len(ocr_elements)} OCR elements.")
 
     # Create element merger and merge elements
     merger = ElementMerger(overlap_threshold=overlap_threshold)
@@ -142,15 +238,17 @@ def get_unified_elements(
     )
     print(f"Created {len(unified_elements)} unified elements.")
 
-    return unified_elements
+    return unified_elements, page_description
 
 
-def save_element_screenshot(driver: WebDriver, element: UnifiedElement, filename: Optional[str] = None,
-                          padding: int = 70) -> Optional[str]:
+def save_element_screenshot(viewport_img: Image.Image, dpr: float, element: UnifiedElement,
+                          filename: Optional[str] = None, padding: int = 70) -> Optional[str]:
         """
-        Capture and save a screenshot of a specific UnifiedElement.
+        Crop and save a screenshot of a specific UnifiedElement.
 
         Args:
+            viewport_img: Viewport screenshot, as returned by capture_viewport
+            dpr: Device pixel ratio the screenshot was taken at
             element: UnifiedElement to capture
             filename: Optional filename to save the screenshot (default: auto-generated)
             padding: Number of pixels to add around the element (default: 20)
@@ -158,7 +256,7 @@ def save_element_screenshot(driver: WebDriver, element: UnifiedElement, filename
         Returns:
             str or None: Path to the saved screenshot if successful
         """
-        element_image = get_element_screenshot(driver, element, padding)
+        element_image = get_element_screenshot(viewport_img, dpr, element, padding)
         if not element_image:
             return None
 
@@ -167,20 +265,26 @@ def save_element_screenshot(driver: WebDriver, element: UnifiedElement, filename
             element_type = element.element_type or 'unknown'
             content = element.content or 'no_content'
             # Clean content for filename
-            content = "".join(c for c in content[:30] if c.isalnum() or c in ("_", "-", ".")).rstrip(".")
-            filename = f"element_{element_type}_{content}.png"
+            content = sanitize_filename(content[:30])
+            filename = f"element_{element_type}_{content}.jpg"
 
-        # Ensure filename has .png extension
-        if not filename.lower().endswith('.png'):
-            filename += '.png'
+        # Ensure filename has .jpg extension
+        if not filename.lower().endswith('.jpg'):
+            filename = str(Path(filename).with_suffix('.jpg'))
 
-        # Save to screenshot directory
+        # Save to screenshot directory; the viewport is already a JPEG capture,
+        # so re-encoding as JPEG loses nothing that matters and is much faster
         output_path = f"ui/{filename}"
-        element_image.save(output_path)
+        element_image.save(output_path, "JPEG", quality=85)
 
         return str(output_path)
 
 
+def _serialize_bounding_box(bounding_box: BoundingBox) -> dict[str, float]:
+    """Convert a BoundingBox to a dict keyed by its slot names."""
+    return {field: getattr(bounding_box, field) for field in BoundingBox.__slots__}
+
+
 def serialize_hover_state(hover_state: HoverChange) -> dict[str, Any]:
     """
     Convert HoverChange object to serializable dict.
@@ -208,66 +312,44 @@ def serialize_unified_element(elem: UnifiedElement) -> Optional[dict[str, Any]]:
     """
     if not elem:
         return None
-    
-    # Handle bounding box
-    bounding_box_data = None
+
+    # Only truthy values are kept, in the order of the field tuples
+    element_data = {
+        field: value
+        for field in _UNIFIED_ELEMENT_LEADING_FIELDS
+        if (value := getattr(elem, field))
+    }
+    if elem.confidence is not None:
+        element_data["confidence"] = elem.confidence
     if elem.bounding_box:
-        bounding_box_data = {
-            "left": elem.bounding_box.left,
-            "top": elem.bounding_box.top,
-            "right": elem.bounding_box.right,
-            "bottom": elem.bounding_box.bottom,
-            "width": elem.bounding_box.width,
-            "height": elem.bounding_box.height
-        }
-    
+        element_data["bounding_box"] = _serialize_bounding_box(elem.bounding_box)
+    if elem.screenshots:
+        element_data["screenshots"] = elem.screenshots
+
     # Safely serialize hover state
-    hover_state_data = None
     if elem.hover_state:
         try:
-            hover_state_data = serialize_hover_state(elem.hover_state)
+            element_data["hover_state"] = serialize_hover_state(elem.hover_state)
         except (ValueError, AttributeError):
             pass
-            
-    # Serialize link regions, if present
-    link_regions_data = None
+
+    element_data.update(
+        (field, value)
+        for field in _UNIFIED_ELEMENT_TRAILING_FIELDS
+        if (value := getattr(elem, field))
+    )
+
     if elem.link_regions:
-        link_regions_data = []
-        for region in elem.link_regions:
-            region_bb = {
-                "left": region.bounding_box.left,
-                "top": region.bounding_box.top,
-                "right": region.bounding_box.right,
-                "bottom": region.bounding_box.bottom,
-                "width": region.bounding_box.width,
-                "height": region.bounding_box.height
-            }
-            link_regions_data.append({
-                "bounding_box": region_bb,
+        element_data["link_regions"] = [
+            {
+                "bounding_box": _serialize_bounding_box(region.bounding_box),
                 "href": region.href,
                 "selector": region.selector,
                 "text": region.text,
-            })
-    
-    # Build dictionary with only non-None values
-    element_data = {}
-    
-    if elem.content: element_data["content"] = elem.content
-    if elem.element_type: element_data["element_type"] = elem.element_type
-    if elem.tag: element_data["tag"] = elem.tag
-    if elem.confidence is not None: element_data["confidence"] = elem.confidence
-    if bounding_box_data: element_data["bounding_box"] = bounding_box_data
-    if elem.screenshots: element_data["screenshots"] = elem.screenshots
-    if hover_state_data: element_data["hover_state"] = hover_state_data
-    if elem.image_caption: element_data["image_caption"] = elem.image_caption
-    if elem.href: element_data["href"] = elem.href
-    if elem.src: element_data["src"] = elem.src
-    if elem.selector: element_data["selector"] = elem.selector
-    if elem.visibility: element_data["visibility"] = elem.visibility
-    if elem.dom_text: element_data["dom_text"] = elem.dom_text
-    if elem.ocr_text: element_data["ocr_text"] = elem.ocr_text
-    if link_regions_data: element_data["link_regions"] = link_regions_data
-    
+            }
+            for region in elem.link_regions
+        ]
+
     return element_data
 
 
@@ -286,61 +368,31 @@ def serialize_webpage_description(description: WebpageDescription) -> dict[str,
     """
     if not description:
         raise ValueError("Expected a WebpageDescription object")
-    
-    # Serialize ImageElement objects
-    def serialize_image(image: ImageElement) -> dict[str, str]:
-        return {
-            "location": image.location,
-            "content": image.content,
-            "purpose": image.purpose
-        }
-    
-    # Serialize InteractiveElement objects
-    def serialize_interactive(elem: InteractiveElement) -> dict[str, Any]:
-        element_data = {
-            "type": elem.type,
-            "location": elem.location,
-            "visuals": elem.visuals,
-            "purpose": elem.purpose
-        }
-        # Add optional fields only if they exist
-        if elem.text: element_data["text"] = elem.text
-        if elem.state: element_data["state"] = elem.state
-        return element_data
-    
-    # Serialize LayoutSection
-    layout_data = {
-        "main_content": description.layout.main_content
-    }
-    # Add optional layout fields if they exist
-    if description.layout.header: layout_data["header"] = description.layout.header
-    if description.layout.navigation: layout_data["navigation"] = description.layout.navigation
-    if description.layout.sidebar: layout_data["sidebar"] = description.layout.sidebar
-    
-    # Build the complete serialized structure
-    return {
-        "layout": layout_data,
-        "interactive_elements": [
-            serialize_interactive(elem) 
-            for elem in description.interactive_elements
-        ],
-        "key_content": {
-            "headings": description.key_content.headings,
-            "main_text_blocks": description.key_content.main_text_blocks,
-            "images": [
-                serialize_image(img) 
-                for img in description.key_content.images
-            ]
-        },
-        "visual_hierarchy": {
-            "primary_focus": description.visual_hierarchy.primary_focus,
-            "secondary_elements": description.visual_hierarchy.secondary_elements,
-            "background_elements": description.visual_hierarchy.background_elements
-        }
-    }
+
+    serialized = description.model_dump(mode="json")
+
+    # Optional fields are omitted when empty as well as when unset, since
+    # strict schema responses often fill them with "" rather than null
+    layout = serialized["layout"]
+    for field in _LAYOUT_OPTIONAL_FIELDS:
+        if not layout[field]:
+            del layout[field]
+    for element in serialized["interactive_elements"]:
+        for field in _INTERACTIVE_ELEMENT_OPTIONAL_FIELDS:
+            if not element[field]:
+                del element[field]
+
+    return serialized
 
 
 def main():
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    from web_browser.driver import new_webdriver
+    from web_browser.web_analyzer.element_search import ElementSearchSystem
+    from web_browser.web_analyzer.types import PageRegion
+    from web_browser.web_analyzer.utils import js
+
     driver = new_webdriver(headless=False)
     try:
         driver.get("https://www.amazon.ae/Ricoh-Equipped-with24-2M-Approximately-high-speed/dp/B09FQ7JJ9Y/")
@@ -355,16 +407,8 @@ def main():
         
         js.init(driver)
         
-        # Get unified elements
-        unified_elements = get_unified_elements(driver)
-
-        # Save unified elements to JSON for analysis
-        unified_elements_data = [
-            serialized for elem in unified_elements
-            if (serialized := serialize_unified_element(elem)) is not None
-        ]
-
-        get_page_description(driver)
+        # Get unified elements and the page description together
+        unified_elements, _ = get_unified_elements(driver, describe_page=True)
 
         end_time = time.time()  # End timing (benchmarking)
         execution_time = end_time - start_time
@@ -372,9 +416,15 @@ def main():
         minutes = int(execution_time // 60)
         seconds = int(execution_time % 60)
 
-        # Save with pretty printing and UTF-8 encoding
-        with open("ui/unified_elements.json", "w", encoding="utf-8") as f:
-            json.dump(unified_elements_data, f, indent=2, ensure_ascii=False)
+        # Save unified elements to JSON for analysis
+        write_json_list(
+            "ui/unified_elements.json",
+            (
+                serialized for elem in unified_elements
+                if (serialized := serialize_unified_element(elem)) is not None
+            ),
+            option=orjson.OPT_NON_STR_KEYS
+        )
         
         if execution_time < 60:
             # Less than a minute, print seconds only
@@ -392,16 +442,24 @@ def main():
         search_system = ElementSearchSystem()
         search_system.index_elements(unified_elements)
         
-        # Search for interactive elements
-        search_results = search_system.search(query)
-        
-        # Example of using results
+        # Run the semantic and region queries side by side
+        region = PageRegion.TOP_RIGHT
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            search_future = executor.submit(search_system.search, query)
+            region_future = executor.submit(search_system.search_by_region, region)
+            search_results = search_future.result()
+            top_right_elements = region_future.result()
+
+        # Example of using results: crop every match from one viewport capture
+        viewport_img, dpr = capture_viewport(driver)
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(
+                lambda element: save_element_screenshot(viewport_img, dpr, element),
+                [element for element, _ in search_results]
+            ))
         for element, score in search_results:
-            save_element_screenshot(driver, element)
             print(f"Found {element.tag} element of interest: {element.content} (confidence: {score:.2f})")
 
-        region = PageRegion.TOP_RIGHT
-        top_right_elements = search_system.search_by_region(region)
         for element in top_right_elements:
             print(f"Found {element.tag} element of interest in the {region} region: {element.content}")
     finally:
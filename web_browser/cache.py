@@ -0,0 +1,92 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Overrides the default cache location when set
+CACHE_DIR_ENV_VAR = "PAGE_PARSE_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the directory cached responses are kept in by default.
+
+    This is $PAGE_PARSE_CACHE_DIR if set, otherwise page-parse under
+    $XDG_CACHE_HOME or ~/.cache. It is kept apart from the screenshot
+    directory, which is cleared at the start of every analysis.
+    """
+    if cache_dir := os.environ.get(CACHE_DIR_ENV_VAR):
+        return Path(cache_dir).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "page-parse"
+
+
+def content_digest(data: bytes) -> str:
+    """Return a short hex digest identifying the given bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _cache_path(namespace: str, digest: str, cache_dir: Path) -> Path:
+    # Model IDs may contain characters that are not valid in filenames
+    safe_namespace = "".join(c if c.isalnum() or c in "-_." else "_" for c in namespace)
+    return cache_dir / f"{safe_namespace}-{digest}.json"
+
+
+def load_response(
+    namespace: str,
+    digest: str,
+    cache_dir: Optional[Path] = None
+) -> Optional[Any]:
+    """
+    Load a cached response.
+
+    Args:
+        namespace: Kind of response, e.g. the model that produced it
+        digest: Content digest of the input, from content_digest
+        cache_dir: Directory holding cached responses; defaults to
+            default_cache_dir()
+
+    Returns:
+        Decoded JSON response, or None on a cache miss
+    """
+    path = _cache_path(namespace, digest, cache_dir or default_cache_dir())
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.error(f"Ignoring unreadable cache entry {path}: {e}")
+        return None
+
+
+def store_response(
+    namespace: str,
+    digest: str,
+    response: Any,
+    cache_dir: Optional[Path] = None
+) -> None:
+    """
+    Store a JSON-serializable response in the cache.
+
+    Args:
+        namespace: Kind of response, e.g. the model that produced it
+        digest: Content digest of the input, from content_digest
+        response: JSON-serializable response
+        cache_dir: Directory holding cached responses; defaults to
+            default_cache_dir()
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    path = _cache_path(namespace, digest, cache_dir)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial entry
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(response))
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.error(f"Failed to write cache entry {path}: {e}")
@@ -1,19 +1,234 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
 from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.ai.documentintelligence import models as _models
+from azure.ai.documentintelligence.aio import \
+    DocumentIntelligenceClient as AsyncDocumentIntelligenceClient
+from azure.ai.documentintelligence.models import (AnalyzeResult,
+                                                  DocumentAnalysisFeature)
 from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline import PipelineResponse
+from azure.core.pipeline.transport import HttpTransport
+from azure.core.polling import LROPoller
 
+from web_browser.cache import content_digest, load_response, store_response
 from web_browser.document_intelligence.config import AzureConfig
+from web_browser.transport import (RETRY_SETTINGS,
+                                   new_pooled_async_transport,
+                                   new_pooled_transport)
+
+# Results kept in memory per client, in front of the on-disk cache
+RESULT_MEMO_SIZE = 32
+
+
+def _raw_result(
+    pipeline_response: PipelineResponse,
+    deserialized: AnalyzeResult,
+    response_headers: dict[str, Any]
+) -> dict[str, Any]:
+    """Poller output hook returning the analyzeResult JSON instead of the model object graph."""
+    return pipeline_response.http_response.json()["analyzeResult"]
 
 
 class DocumentClient:
     """Wrapper for Azure Document Intelligence client."""
     
-    def __init__(self, config: AzureConfig):
+    def __init__(
+        self,
+        config: AzureConfig,
+        transport: Optional[HttpTransport] = None,
+        cache_dir: Optional[Path] = None
+    ):
+        """
+        Args:
+            config: Azure endpoint and key
+            transport: HTTP transport to share; a pooled one is created
+                when omitted
+            cache_dir: Directory for cached results; defaults to
+                web_browser.cache.default_cache_dir()
+        """
+        self.cache_dir = cache_dir
+        self.config = config
         self.client = DocumentIntelligenceClient(
             endpoint=config.endpoint,
-            credential=AzureKeyCredential(config.key)
+            credential=AzureKeyCredential(config.key),
+            transport=transport or new_pooled_transport(),
+            **RETRY_SETTINGS
+        )
+        self._results: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._results_lock = threading.Lock()
+
+    def analyze(self, document_bytes: bytes, model: str) -> dict[str, Any]:
+        """
+        Analyze a document, reusing the cached result for identical bytes.
+
+        Args:
+            document_bytes: Raw image or document bytes
+            model: Document Intelligence model ID
+
+        Returns:
+            Analysis result as the service's analyzeResult JSON
+        """
+        digest = content_digest(document_bytes)
+        if (cached := self._load_result(model, digest)) is not None:
+            return cached
+
+        result = self.begin_analyze(document_bytes, model).result()
+        self._store_result(model, digest, result)
+        return result
+
+    def _analyze_arguments(self, document_bytes: bytes, model: str) -> dict[str, Any]:
+        """Build the begin_analyze_document arguments shared by the sync and async clients."""
+        return {
+            "model_id": model,
+            # Create the analyze request object with raw bytes
+            "body": _models.AnalyzeDocumentRequest(bytes_source=document_bytes),
+            "features": [DocumentAnalysisFeature.LANGUAGES],
+            "content_type": "application/json",
+            "cls": _raw_result
+        }
+
+    async def analyze_async(
+        self,
+        document_bytes: bytes,
+        model: str,
+        client: Optional[AsyncDocumentIntelligenceClient] = None
+    ) -> dict[str, Any]:
+        """
+        Analyze a document without blocking the event loop while the result is polled.
+
+        Shares the on-disk result cache with analyze.
+
+        Args:
+            document_bytes: Raw image or document bytes
+            model: Document Intelligence model ID
+            client: Open async client to reuse across concurrent calls; a
+                short-lived one is created when omitted
+
+        Returns:
+            Analysis result as the service's analyzeResult JSON
+        """
+        digest = content_digest(document_bytes)
+        # The disk cache reads, writes and parses files, so it is used off
+        # the event loop
+        if (cached := await asyncio.to_thread(self._load_result, model, digest)) is not None:
+            return cached
+
+        async with AsyncExitStack() as stack:
+            if client is None:
+                client = await stack.enter_async_context(self.async_client())
+            poller = await client.begin_analyze_document(
+                **self._analyze_arguments(document_bytes, model)
+            )
+            result = await poller.result()
+
+        await asyncio.to_thread(self._store_result, model, digest, result)
+        return result
+
+    def analyze_batch(
+        self,
+        filenames: list[str],
+        model: str = "prebuilt-read"
+    ) -> list[dict[str, Any]]:
+        """
+        Analyze several documents with one model, overlapping their requests.
+
+        Every uncached analysis is submitted before any result is awaited,
+        so the service processes the documents concurrently over the shared
+        connection pool instead of one round trip after another.
+
+        Args:
+            filenames: Paths to the image files to analyze
+            model: Document Intelligence model ID
+
+        Returns:
+            analyzeResult JSON objects in the same order as filenames
+        """
+        results: list[Optional[dict[str, Any]]] = []
+        pending: list[tuple[int, str, LROPoller[dict[str, Any]]]] = []
+        for index, filename in enumerate(filenames):
+            with open(filename, "rb") as f:
+                document_bytes = f.read()
+
+            digest = content_digest(document_bytes)
+            if (cached := self._load_result(model, digest)) is not None:
+                results.append(cached)
+            else:
+                results.append(None)
+                pending.append((index, digest, self.begin_analyze(document_bytes, model)))
+
+        for index, digest, poller in pending:
+            results[index] = poller.result()
+            self._store_result(model, digest, results[index])
+
+        return results
+
+    def async_client(self) -> AsyncDocumentIntelligenceClient:
+        """
+        Create an async client for the same resource.
+
+        The client holds a pooled aiohttp session bound to the running event
+        loop, so create one per loop and close it with async with.
+        """
+        return AsyncDocumentIntelligenceClient(
+            endpoint=self.config.endpoint,
+            credential=AzureKeyCredential(self.config.key),
+            transport=new_pooled_async_transport(),
+            **RETRY_SETTINGS
+        )
+
+    def begin_analyze(
+        self,
+        document_bytes: bytes,
+        model: str
+    ) -> LROPoller[dict[str, Any]]:
+        """
+        Start analyzing a document from raw bytes.
+
+        Args:
+            document_bytes: Raw image or document bytes
+            model: Document Intelligence model ID
+
+        Returns:
+            Poller for the analyzeResult JSON
+        """
+        return self.client.begin_analyze_document(
+            **self._analyze_arguments(document_bytes, model)
         )
 
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> "DocumentClient":
-        """Create client using environment variables."""
-        return cls(AzureConfig.from_env())
\ No newline at end of file
+        """Create client using environment variables, shared across callers."""
+        return cls(AzureConfig.from_env())
+
+    def _load_result(self, model: str, digest: str) -> Optional[dict[str, Any]]:
+        """Look up a result by model and content digest, in memory first and then on disk."""
+        key = (model, digest)
+        with self._results_lock:
+            if (result := self._results.get(key)) is not None:
+                self._results.move_to_end(key)
+                return result
+
+        if (result := load_response(model, digest, self.cache_dir)) is not None:
+            self._remember_result(key, result)
+        return result
+
+    def _remember_result(self, key: tuple[str, str], result: dict[str, Any]) -> None:
+        """Keep a result in the in-memory cache, evicting the least recently used."""
+        with self._results_lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > RESULT_MEMO_SIZE:
+                self._results.popitem(last=False)
+
+    def _store_result(self, model: str, digest: str, result: dict[str, Any]) -> None:
+        """Cache a fresh result in memory and on disk."""
+        self._remember_result((model, digest), result)
+        store_response(model, digest, result, self.cache_dir)
\ No newline at end of file
@@ -2,7 +2,7 @@ import os
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AzureConfig:
     """Azure configuration settings."""
     endpoint: str
@@ -19,7 +19,7 @@ class AzureConfig:
             
         return cls(endpoint=endpoint, key=key)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProcessingConfig:
     """Document processing configuration."""
     min_confidence: float = 0.8
@@ -27,7 +27,13 @@ class ProcessingConfig:
     include_figures: bool = True
     clean_text: bool = True
     debug_output: bool = False
+    concurrency: int = 4  # documents analyzed at once by the *_many methods
+    page_workers: int = 4  # threads post-processing the pages of one result
 
     def __post_init__(self):
         if not 0 <= self.min_confidence <= 1:
-            raise ValueError("min_confidence must be between 0 and 1")
\ No newline at end of file
+            raise ValueError("min_confidence must be between 0 and 1")
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if self.page_workers < 1:
+            raise ValueError("page_workers must be at least 1")
\ No newline at end of file
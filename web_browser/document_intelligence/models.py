@@ -1,34 +1,126 @@
 from dataclasses import dataclass
 from typing import Any, Optional
 
+import numpy as np
+
+
+def _as_polygon(points: Any) -> np.ndarray:
+    """Coerce flat [x0, y0, x1, y1, ...] coordinates to a float32 (N, 2) point array."""
+    if points is None:
+        points = ()
+    return np.asarray(points, dtype=np.float32).reshape(-1, 2)
+
 
 @dataclass
 class FigureInfo:
     """Represents information about a figure in the document."""
     page_number: int
-    polygon: list[float]
+    polygon: np.ndarray
     spans: list[Any]
 
+    def __post_init__(self):
+        self.polygon = _as_polygon(self.polygon)
+
 
 @dataclass
 class OCRElement:
     """Represents a single word or text element from OCR analysis."""
     confidence: float
     content: str
-    polygon: list[float]
+    polygon: np.ndarray
     page_number: Optional[int] = None
     span: Optional[Any] = None
 
+    def __post_init__(self):
+        self.polygon = _as_polygon(self.polygon)
+
+
+@dataclass
+class OCRElementBatch:
+    """
+    Column-oriented view of OCR lines for vectorised geometry.
+
+    Attributes:
+        boxes: Array of shape (N, 4) with left, top, right, bottom in image pixels
+        confidences: Array of N line confidences
+        contents: Line texts, in row order
+        lines: Source OCRLine objects, in row order
+    """
+    boxes: np.ndarray
+    confidences: np.ndarray
+    contents: list[str]
+    lines: list["OCRLine"]
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @classmethod
+    def from_lines(cls, lines: list["OCRLine"]) -> "OCRElementBatch":
+        """
+        Pack OCR lines into arrays, reducing each polygon to its axis-aligned box.
+
+        Args:
+            lines: OCR lines to pack
+
+        Returns:
+            OCRElementBatch with one row per line
+
+        Raises:
+            ValueError: If a polygon has fewer than 4 points
+        """
+        polygons = [line.polygon for line in lines]
+        if any(len(polygon) < 4 for polygon in polygons):
+            raise ValueError("Polygon must have at least 4 points (8 coordinates)")
+
+        if not polygons:
+            boxes = np.empty((0, 4), dtype=np.float64)
+        elif all(len(polygon) == len(polygons[0]) for polygon in polygons):
+            # Common case: every line is a quadrilateral, reduce them in one pass
+            points = np.stack(polygons)
+            boxes = np.concatenate(
+                (points.min(axis=1), points.max(axis=1)), axis=1
+            ).astype(np.float64)
+        else:
+            boxes = np.array(
+                [(*polygon.min(axis=0), *polygon.max(axis=0)) for polygon in polygons],
+                dtype=np.float64
+            )
+
+        return cls(
+            boxes=boxes,
+            confidences=np.fromiter(
+                (line.confidence for line in lines), dtype=np.float64, count=len(lines)
+            ),
+            contents=[line.content for line in lines],
+            lines=list(lines)
+        )
+
+    def scaled_boxes(self, scale_x: float, scale_y: float) -> np.ndarray:
+        """
+        Convert the boxes from screenshot pixels to viewport coordinates.
+
+        Args:
+            scale_x: Screenshot to viewport ratio along x
+            scale_y: Screenshot to viewport ratio along y
+
+        Returns:
+            Array of shape (N, 4) with left, top, right, bottom in viewport pixels
+        """
+        return self.boxes / np.array([scale_x, scale_y, scale_x, scale_y])
+
 
 @dataclass
 class OCRLine:
     """Represents a line of text from OCR, which may contain multiple words."""
     confidence: float
     content: str
-    polygon: list[float]
+    polygon: np.ndarray
     words: list[tuple[str, float]]
     page_number: Optional[int] = None
 
+    def __post_init__(self):
+        self.polygon = _as_polygon(self.polygon)
+
 
 @dataclass
 class TableInfo:
@@ -36,5 +128,8 @@ class TableInfo:
     cells: list[dict[str, Any]]
     column_count: int
     page_number: int
-    polygon: list[float]
-    row_count: int
\ No newline at end of file
+    polygon: np.ndarray
+    row_count: int
+
+    def __post_init__(self):
+        self.polygon = _as_polygon(self.polygon)
\ No newline at end of file
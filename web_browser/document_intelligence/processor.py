@@ -1,20 +1,24 @@
+import asyncio
 import os
-from collections import defaultdict
-from typing import Optional
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, TypeVar
 
-from azure.ai.documentintelligence import models as _models
-from azure.ai.documentintelligence.models import (AnalyzeResult,
-                                                  DocumentAnalysisFeature,
-                                                  DocumentFigure, DocumentLine,
-                                                  DocumentPage, DocumentTable,
-                                                  DocumentWord)
+import numpy as np
+from azure.ai.documentintelligence.aio import \
+    DocumentIntelligenceClient as AsyncDocumentIntelligenceClient
 
 from web_browser.document_intelligence.client import DocumentClient
 from web_browser.document_intelligence.config import ProcessingConfig
 from web_browser.document_intelligence.models import (FigureInfo, OCRElement,
                                                       OCRLine, TableInfo)
 from web_browser.document_intelligence.text_processing import normalize_text
-from web_browser.document_intelligence.utils import get_words, print_page_info
+from web_browser.document_intelligence.utils import (PageWordIndex,
+                                                     print_page_info)
+
+T = TypeVar("T")
 
 
 class DocumentProcessor:
@@ -24,6 +28,28 @@ class DocumentProcessor:
         self.client = client
         self.config = config
         
+    def analyze_batch(
+        self,
+        filenames: list[str]
+    ) -> list[tuple[list[OCRElement], list[TableInfo], list[FigureInfo]]]:
+        """
+        Analyze the layout of several documents, submitting them all up front.
+
+        The synchronous counterpart of analyze_layout_many, sharing
+        _analyze_many with analyze_read_many.
+
+        Args:
+            filenames: Paths to the image files to analyze
+
+        Returns:
+            Tuples of OCR elements, tables and figures, in the same order as filenames
+
+        Raises:
+            FileNotFoundError: If any image file doesn't exist
+            Exception: For Azure API or processing errors
+        """
+        return self._analyze_many(filenames, "prebuilt-layout", self._process_layout_result)
+
     def analyze_layout(
         self, 
         filename: str
@@ -44,34 +70,46 @@ class DocumentProcessor:
         if not os.path.exists(filename):
             raise FileNotFoundError(f"Image file not found: {filename}")
 
-        try:
-            result = self._analyze_document(filename, "prebuilt-layout")
-            
-            ocr_elements, tables, figures = [], [], []
-            stats = defaultdict(int)
+        result = self._analyze_document(filename, "prebuilt-layout")
+        return self._process_layout_result(result)
 
-            for page in result.pages:
-                print_page_info(page)
-                
-                # Process text
-                page_elements = self._process_page_text(page)
-                ocr_elements.extend(page_elements)
-                stats["total_words"] += len(page_elements)
+    async def analyze_layout_many(
+        self,
+        filenames: list[str]
+    ) -> list[tuple[list[OCRElement], list[TableInfo], list[FigureInfo]]]:
+        """
+        Analyze the layout of several documents concurrently.
 
-                # Process tables
-                if self.config.include_tables and result.tables:
-                    self._process_page_tables(page, result.tables, tables, stats)
+        At most config.concurrency analyses are in flight at once, sharing one
+        async client; each result is post-processed as soon as it arrives.
 
-                # Process figures
-                if self.config.include_figures and result.figures:
-                    self._process_page_figures(page, result.figures, figures, stats)
+        Args:
+            filenames: Paths to the image files to analyze
 
-            self._print_analysis_summary(stats)
-            return ocr_elements, tables, figures
+        Returns:
+            Tuples of OCR elements, tables and figures, in the same order as filenames
 
-        except Exception as e:
-            print(f"ERROR: Document analysis failed: {str(e)}")
-            raise
+        Raises:
+            FileNotFoundError: If any image file doesn't exist
+            Exception: For Azure API or processing errors
+        """
+        self._check_files_exist(filenames)
+        semaphore = asyncio.Semaphore(self.config.concurrency)
+
+        async def analyze_one(
+            filename: str,
+            client: AsyncDocumentIntelligenceClient
+        ) -> tuple[list[OCRElement], list[TableInfo], list[FigureInfo]]:
+            async with semaphore:
+                result = await self._analyze_document_async(
+                    filename, "prebuilt-layout", client
+                )
+            return self._process_layout_result(result)
+
+        async with self.client.async_client() as client:
+            return await asyncio.gather(
+                *(analyze_one(filename, client) for filename in filenames)
+            )
 
     def analyze_read(self, filename: str) -> list[OCRLine]:
         """
@@ -90,46 +128,128 @@ class DocumentProcessor:
         if not os.path.exists(filename):
             raise FileNotFoundError(f"Image file not found: {filename}")
 
-        try:
-            result = self._analyze_document(filename, "prebuilt-read")
+        result = self._analyze_document(filename, "prebuilt-read")
+        return self._process_read_result(result)
+
+    async def analyze_read_async(self, filename: str) -> list[OCRLine]:
+        """
+        Analyze document and return OCR lines, awaiting the result asynchronously.
+        
+        Args:
+            filename: Path to the image file to analyze
             
-            ocr_lines: list[OCRLine] = []
-            total_stats = {"total_words": 0, "filtered_words": 0}
+        Returns:
+            List of processed OCR lines meeting confidence threshold
+        
+        Raises:
+            FileNotFoundError: If image file doesn't exist
+            Exception: For Azure API or processing errors
+        """
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"Image file not found: {filename}")
 
-            for page in result.pages:
-                print_page_info(page)
-                page_lines, page_stats = self._process_page_lines(page)
-                ocr_lines.extend(page_lines)
-                
-                total_stats["total_words"] += page_stats["total_words"]
-                total_stats["filtered_words"] += page_stats["filtered_words"]
+        result = await self._analyze_document_async(filename, "prebuilt-read")
+        return self._process_read_result(result)
 
-            if self.config.debug_output:
-                self._print_ocr_summary(total_stats, len(ocr_lines))
-            
-            return ocr_lines
-            
-        except Exception as e:
-            print(f"ERROR: OCR processing failed: {str(e)}")
-            raise
+    def analyze_read_many(self, filenames: list[str]) -> list[list[OCRLine]]:
+        """
+        Analyze several documents and return OCR lines for each.
+
+        All documents are submitted before any result is awaited, so their
+        OCR requests overlap.
+
+        Args:
+            filenames: Paths to the image files to analyze
+
+        Returns:
+            List of OCR line lists, in the same order as filenames
+
+        Raises:
+            FileNotFoundError: If any image file doesn't exist
+            Exception: For Azure API or processing errors
+        """
+        return self._analyze_many(filenames, "prebuilt-read", self._process_read_result)
 
-    def _analyze_document(self, filename: str, model: str) -> AnalyzeResult:
+    def _analyze_document(self, filename: str, model: str) -> dict[str, Any]:
         """Perform document analysis using Azure client."""
         with open(filename, "rb") as f:
             document_bytes = f.read()
 
-            # Create the analyze request object with raw bytes
-            request = _models.AnalyzeDocumentRequest(
-                bytes_source=document_bytes
-            )
+        return self.client.analyze(document_bytes, model)
 
-            poller = self.client.client.begin_analyze_document(
-                model_id=model,
-                body=request,
-                features=[DocumentAnalysisFeature.LANGUAGES],
-                content_type="application/json"
-            )
-        return poller.result()
+    async def _analyze_document_async(
+        self,
+        filename: str,
+        model: str,
+        client: Optional[AsyncDocumentIntelligenceClient] = None
+    ) -> dict[str, Any]:
+        """Perform document analysis using the async Azure client, reading the file off the event loop."""
+        document_bytes = await asyncio.to_thread(Path(filename).read_bytes)
+        return await self.client.analyze_async(document_bytes, model, client)
+
+    def _analyze_many(
+        self,
+        filenames: list[str],
+        model: str,
+        process_result: Callable[[dict[str, Any]], T]
+    ) -> list[T]:
+        """
+        Analyze several documents with one model and post-process each result.
+
+        Every uncached document is submitted before any result is awaited, so
+        the service works on them together over the shared connection pool.
+        """
+        self._check_files_exist(filenames)
+        results = self.client.analyze_batch(filenames, model)
+        return [process_result(result) for result in results]
+
+    @staticmethod
+    def _check_files_exist(filenames: list[str]) -> None:
+        """Raise FileNotFoundError for the first file that doesn't exist, before any is submitted."""
+        for filename in filenames:
+            if not os.path.exists(filename):
+                raise FileNotFoundError(f"Image file not found: {filename}")
+
+    @staticmethod
+    def _group_by_page(
+        items: list[dict[str, Any]]
+    ) -> dict[int, list[dict[str, Any]]]:
+        """Index tables or figures by each page they appear on, keeping document order."""
+        by_page = defaultdict(list)
+        for item in items:
+            for page_number in dict.fromkeys(
+                region["pageNumber"] for region in item.get("boundingRegions") or []
+            ):
+                by_page[page_number].append(item)
+        return by_page
+
+    def _map_pages(
+        self,
+        func: Callable[[dict[str, Any]], T],
+        pages: Iterable[dict[str, Any]]
+    ) -> Iterator[T]:
+        """
+        Print each page's header and apply func to it, on up to config.page_workers threads.
+
+        Results are yielded in page order. Pages are processed serially when
+        debug output is on, with each header printed before its page is
+        processed, so per-line logs follow their page's header and don't
+        interleave. Otherwise the header is printed as the page's result is
+        yielded.
+        """
+        pages = list(pages)
+        if self.config.page_workers == 1 or len(pages) < 2 or self.config.debug_output:
+            for page in pages:
+                print_page_info(page)
+                yield func(page)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.config.page_workers, len(pages))
+        ) as executor:
+            for page, page_result in zip(pages, executor.map(func, pages)):
+                print_page_info(page)
+                yield page_result
 
     def _print_analysis_summary(self, stats: dict[str, int]) -> None:
         """Print summary of document analysis results."""
@@ -156,60 +276,105 @@ class DocumentProcessor:
 
     def _process_figure(
         self, 
-        figure: DocumentFigure
+        figure: dict[str, Any]
     ) -> Optional[FigureInfo]:
         """Process a single figure's information."""
-        if not figure.bounding_regions:
+        if not figure.get("boundingRegions"):
             return None
             
-        region = figure.bounding_regions[0]
+        region = figure["boundingRegions"][0]
         return FigureInfo(
-            page_number=region.page_number,
-            polygon=region.polygon,
-            spans=figure.spans
+            page_number=region["pageNumber"],
+            polygon=region["polygon"],
+            spans=figure["spans"]
         )
     
+    def _process_layout_result(
+        self,
+        result: dict[str, Any]
+    ) -> tuple[list[OCRElement], list[TableInfo], list[FigureInfo]]:
+        """Convert a raw layout analysis result into OCR elements, tables and figures."""
+        ocr_elements, tables, figures = [], [], []
+        stats = Counter()
+        tables_by_page = self._group_by_page(result.get("tables") or [])
+        figures_by_page = self._group_by_page(result.get("figures") or [])
+
+        def process_page(
+            page: dict[str, Any]
+        ) -> tuple[list[OCRElement], list[TableInfo], list[FigureInfo], dict[str, int]]:
+            page_tables, page_figures = [], []
+
+            # Process text
+            page_elements = self._process_page_text(page)
+            page_stats = Counter(total_words=len(page_elements))
+
+            # Process tables
+            if self.config.include_tables:
+                self._process_page_tables(
+                    page, tables_by_page.get(page["pageNumber"], []), page_tables, page_stats
+                )
+
+            # Process figures
+            if self.config.include_figures:
+                self._process_page_figures(
+                    figures_by_page.get(page["pageNumber"], []), page_figures, page_stats
+                )
+
+            return page_elements, page_tables, page_figures, page_stats
+
+        for page_elements, page_tables, page_figures, page_stats in self._map_pages(
+            process_page, result["pages"]
+        ):
+            ocr_elements.extend(page_elements)
+            tables.extend(page_tables)
+            figures.extend(page_figures)
+            stats.update(page_stats)
+
+        self._print_analysis_summary(stats)
+        return ocr_elements, tables, figures
+
     def _process_line(
         self,
-        line: DocumentLine,
-        words: list[DocumentWord],
+        line: dict[str, Any],
+        words: list[dict[str, Any]],
+        confidences: np.ndarray,
         line_idx: int,
         page_number: int
-    ) -> tuple[Optional[OCRLine], dict[str, int]]:
-        """Process a line of text and return OCRLine object and statistics."""
-        stats = {"processed": 0, "filtered": 0}
+    ) -> tuple[Optional[OCRLine], int]:
+        """Process a line of text, given its words and their confidences, and return OCRLine object and the number of words filtered out."""
+        confident = confidences >= self.config.min_confidence
+        kept = np.zeros_like(confident)
         processed_words: list[tuple[str, float]] = []
-        word_confidences: list[float] = []
-        
-        for word in words:
-            stats["processed"] += 1
-            content, confidence = self._process_word(word)
-            
-            if content:
-                processed_words.append((content, confidence))
-                word_confidences.append(confidence)
-            else:
-                stats["filtered"] += 1
-                if self.config.debug_output and confidence < self.config.min_confidence:
-                    print(f"......Filtered low confidence word: '{word.content}' ({confidence:.2f})")
-        
+
+        if self.config.debug_output:
+            for idx in np.flatnonzero(~confident):
+                word = words[idx]
+                print(f"......Filtered low confidence word: '{word['content']}' ({word['confidence']:.2f})")
+
+        for idx in np.flatnonzero(confident):
+            word = words[idx]
+            if content := self._process_word(word):
+                processed_words.append((content, word["confidence"]))
+                kept[idx] = True
+
+        filtered = len(words) - len(processed_words)
         if not processed_words:
-            return None, stats
+            return None, filtered
             
-        avg_confidence = sum(word_confidences) / len(word_confidences)
+        avg_confidence = float(confidences[kept].mean())
         if avg_confidence < self.config.min_confidence:
             if self.config.debug_output:
                 print(f"...Filtered low confidence line {line_idx}")
-            return None, stats
+            return None, filtered
             
-        line_content = line.content
+        line_content = line["content"]
         if self.config.clean_text:
             line_content = normalize_text(line_content)
             
         ocr_line = OCRLine(
             content=line_content,
             confidence=avg_confidence,
-            polygon=line.polygon,
+            polygon=line.get("polygon"),
             words=processed_words,
             page_number=page_number
         )
@@ -221,137 +386,148 @@ class DocumentProcessor:
                 f"text: {repr(line_content)}"
             )
             
-        return ocr_line, stats
+        return ocr_line, filtered
     
-    def _process_page_text(self, page: DocumentPage) -> list[OCRElement]:
+    def _process_page_text(self, page: dict[str, Any]) -> list[OCRElement]:
         """Process text elements from a single page."""
         elements = []
         
-        if not page.lines:
+        if not (lines := page.get("lines")):
             return elements
             
-        for line in page.lines:
-            words = get_words(page, line)
-            for word in words:
-                if word.confidence >= self.config.min_confidence:
-                    cleaned_content = normalize_text(
-                        word.content, 
-                        preserve_newlines=False
-                    ) if self.config.clean_text else word.content
-                    
-                    if cleaned_content.strip():
-                        elements.append(OCRElement(
-                            content=cleaned_content,
-                            confidence=word.confidence,
-                            polygon=word.polygon,
-                            span=word.span,
-                            page_number=page.page_number
-                        ))
+        word_index = PageWordIndex(page)
+        indices = np.concatenate(
+            [word_index.line_indices(line) for line in lines]
+        )
+        confident = word_index.confidences[indices] >= self.config.min_confidence
+
+        for idx in indices[confident]:
+            word = word_index.words[idx]
+            cleaned_content = normalize_text(
+                word["content"], 
+                preserve_newlines=False
+            ) if self.config.clean_text else word["content"]
+            
+            if cleaned_content.strip():
+                elements.append(OCRElement(
+                    content=cleaned_content,
+                    confidence=word["confidence"],
+                    polygon=word.get("polygon"),
+                    span=word["span"],
+                    page_number=page["pageNumber"]
+                ))
                     
         return elements
 
     def _process_page_figures(
         self,
-        page: DocumentPage,
-        all_figures: list[DocumentFigure],
+        page_figures: list[dict[str, Any]],
         figures: list[FigureInfo],
         stats: dict[str, int]
     ) -> None:
-        """Process figures from a single page."""
-        page_figures = [
-            figure for figure in all_figures
-            if any(region.page_number == page.page_number 
-                  for region in figure.bounding_regions)
-        ]
-        
+        """Process the figures found on a single page."""
+        count = len(figures)
         for figure in page_figures:
             if figure_info := self._process_figure(figure):
                 figures.append(figure_info)
-                stats["figures"] += 1
+        stats["figures"] += len(figures) - count
 
     def _process_page_lines(
         self, 
-        page: DocumentPage
+        page: dict[str, Any]
     ) -> tuple[list[OCRLine], dict[str, int]]:
         """Process a single page and return OCR lines and statistics."""
         page_lines: list[OCRLine] = []
-        stats = {"total_words": 0, "filtered_words": 0}
+        total_words = filtered_words = 0
         
-        if not page.lines:
-            return page_lines, stats
+        if not (lines := page.get("lines")):
+            return page_lines, {"total_words": 0, "filtered_words": 0}
             
-        for line_idx, line in enumerate(page.lines):
-            words = get_words(page, line)
-            ocr_line, line_stats = self._process_line(
-                line, words, line_idx, page.page_number
+        word_index = PageWordIndex(page)
+        for line_idx, line in enumerate(lines):
+            indices = word_index.line_indices(line)
+            ocr_line, filtered = self._process_line(
+                line,
+                [word_index.words[i] for i in indices],
+                word_index.confidences[indices],
+                line_idx,
+                page["pageNumber"]
             )
             
-            stats["total_words"] += line_stats["processed"]
-            stats["filtered_words"] += line_stats["filtered"]
+            total_words += len(indices)
+            filtered_words += filtered
             
             if ocr_line:
                 page_lines.append(ocr_line)
                 
-        return page_lines, stats
+        return page_lines, {"total_words": total_words, "filtered_words": filtered_words}
 
     def _process_page_tables(
         self, 
-        page: DocumentPage,
-        all_tables: list[DocumentTable],
+        page: dict[str, Any],
+        page_tables: list[dict[str, Any]],
         tables: list[TableInfo],
         stats: dict[str, int]
     ) -> None:
-        """Process tables from a single page."""
-        page_tables = [
-            table for table in all_tables
-            if any(region.page_number == page.page_number 
-                  for region in table.bounding_regions)
-        ]
-        
+        """Process the tables found on a single page."""
+        cell_count = 0
         for table in page_tables:
-            table_info = self._process_table(table, page.page_number)
+            table_info = self._process_table(table, page["pageNumber"])
             tables.append(table_info)
-            stats["tables"] += 1
-            stats["table_cells"] += len(table_info.cells)
+            cell_count += len(table_info.cells)
+        stats["tables"] += len(page_tables)
+        stats["table_cells"] += cell_count
+
+    def _process_read_result(self, result: dict[str, Any]) -> list[OCRLine]:
+        """Convert a raw read analysis result into OCR lines meeting the confidence threshold."""
+        ocr_lines: list[OCRLine] = []
+        total_stats = Counter(total_words=0, filtered_words=0)
+
+        for page_lines, page_stats in self._map_pages(
+            self._process_page_lines, result["pages"]
+        ):
+            ocr_lines.extend(page_lines)
+            
+            total_stats.update(page_stats)
+
+        if self.config.debug_output:
+            self._print_ocr_summary(total_stats, len(ocr_lines))
+        
+        return ocr_lines
 
     def _process_table(
         self, 
-        table: DocumentTable, 
+        table: dict[str, Any], 
         page_number: int
     ) -> TableInfo:
         """Process a single table's information."""
         cells_info = []
         
-        for cell in table.cells:
+        for cell in table["cells"]:
+            regions = cell.get("boundingRegions")
             cell_info = {
-                "row": cell.row_index,
-                "col": cell.column_index,
-                "content": normalize_text(cell.content) if self.config.clean_text else cell.content,
-                "polygon": cell.bounding_regions[0].polygon if cell.bounding_regions else None
+                "row": cell["rowIndex"],
+                "col": cell["columnIndex"],
+                "content": normalize_text(cell["content"]) if self.config.clean_text else cell["content"],
+                "polygon": regions[0]["polygon"] if regions else None
             }
             cells_info.append(cell_info)
             
-        table_polygon = (table.bounding_regions[0].polygon 
-                        if table.bounding_regions else [])
+        table_polygon = (table["boundingRegions"][0]["polygon"] 
+                        if table.get("boundingRegions") else [])
         
         return TableInfo(
-            row_count=table.row_count,
-            column_count=table.column_count,
+            row_count=table["rowCount"],
+            column_count=table["columnCount"],
             page_number=page_number,
             polygon=table_polygon,
             cells=cells_info
         )
     
-    def _process_word(
-        self, 
-        word: DocumentWord
-    ) -> tuple[Optional[str], float]:
-        """Process a single word and return cleaned content and confidence."""
-        if word.confidence < self.config.min_confidence:
-            return None, word.confidence
-            
-        content = word.content
+    def _process_word(self, word: dict[str, Any]) -> Optional[str]:
+        """Return a confident word's cleaned content, or None if nothing is left."""
+        content = word["content"]
         if self.config.clean_text:
             content = normalize_text(content, preserve_newlines=False)
             
-        return (content.strip(), word.confidence) if content.strip() else (None, word.confidence)
\ No newline at end of file
+        return content.strip() or None
@@ -1,6 +1,28 @@
 import unicodedata
+from functools import lru_cache
+from typing import Optional
 
 
+class _ControlCharTable(dict):
+    """str.translate table that drops control characters except newlines and tabs, memoizing each code point."""
+
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        char = chr(codepoint)
+        value = None if unicodedata.category(char)[0] == "C" and char not in "\n\t" else char
+        self[codepoint] = value
+        return value
+
+
+# Latin-1 is filled in up front, so typical text never falls through to
+# the category lookup
+_CONTROL_CHARS = _ControlCharTable()
+for _codepoint in range(0x100):
+    _CONTROL_CHARS[_codepoint]
+del _codepoint
+
+
+# OCR output repeats the same short tokens and headers across words and cells
+@lru_cache(maxsize=65536)
 def normalize_text(text: str, preserve_newlines: bool = True) -> str:
     """
     Clean and normalize text while preserving valid characters.
@@ -18,15 +40,15 @@ def normalize_text(text: str, preserve_newlines: bool = True) -> str:
     # Normalize Unicode (NFC form for composed characters)
     text = unicodedata.normalize("NFC", text)
     
-    # Remove control chars but keep newlines and tabs
-    text = "".join(char for char in text 
-                  if unicodedata.category(char)[0] != "C" 
-                  or char in "\n\t")
-    
-    # Normalize whitespace
-    lines = text.splitlines()
-    cleaned_lines = [" ".join(line.split()) for line in lines]
+    # Remove control chars but keep newlines and tabs; printable ASCII
+    # has none to remove
+    if not (text.isascii() and text.isprintable()):
+        text = text.translate(_CONTROL_CHARS)
     
-    if preserve_newlines:
-        return "\n".join(line for line in cleaned_lines if line)
-    return " ".join(line for line in cleaned_lines if line)
\ No newline at end of file
+    # Normalize whitespace; line breaks are whitespace too, so without
+    # newlines a single split collapses everything
+    if not preserve_newlines:
+        return " ".join(text.split())
+
+    cleaned_lines = [" ".join(line.split()) for line in text.splitlines()]
+    return "\n".join(line for line in cleaned_lines if line)
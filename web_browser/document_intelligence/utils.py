@@ -1,28 +1,77 @@
 from typing import Any
 
-from azure.ai.documentintelligence.models import (DocumentLine, DocumentPage,
-                                                  DocumentWord)
-
-
-def get_words(page: DocumentPage, line: DocumentLine) -> list[DocumentWord]:
-    """Get words that fall within a line's span."""
-    return [
-        word for word in page.words
-        if any(spans_overlap(word.span, span) for span in line.spans)
-    ]
-
-def spans_overlap(word_span: Any, line_span: Any) -> bool:
-    """Check if a word's span overlaps with a line's span."""
-    word_start = word_span.offset
-    word_end = word_span.offset + word_span.length
-    line_start = line_span.offset
-    line_end = line_span.offset + line_span.length
-    
-    return (word_start >= line_start and word_start < line_end) or \
-           (word_end > line_start and word_end <= line_end) or \
-           (word_start <= line_start and word_end >= line_end)
-
-def print_page_info(page: DocumentPage) -> None:
+import numpy as np
+
+
+class PageWordIndex:
+    """
+    Column-oriented view of a page's words, ordered by span offset, so the
+    words of each line are found by binary search instead of scanning the
+    whole page. Pages, lines and words are raw analyzeResult JSON objects.
+
+    Attributes:
+        confidences: Word confidences, in page order
+        words: The page's words, in page order
+    """
+
+    def __init__(self, page: dict[str, Any]):
+        self.words: list[dict[str, Any]] = page.get("words") or []
+        count = len(self.words)
+        starts = np.fromiter(
+            (word["span"]["offset"] for word in self.words), dtype=np.int64, count=count
+        )
+        lengths = np.fromiter(
+            (word["span"]["length"] for word in self.words), dtype=np.int64, count=count
+        )
+        self.confidences: np.ndarray = np.fromiter(
+            (word["confidence"] for word in self.words), dtype=np.float64, count=count
+        )
+        self._order: np.ndarray = np.argsort(starts, kind="stable")
+        self._starts: np.ndarray = starts[self._order]
+        self._ends: np.ndarray = self._starts + lengths[self._order]
+
+    def get_words(self, line: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Get words that fall within a line's span, in page order.
+
+        Matches a scan of every word for words with non-overlapping spans.
+
+        Args:
+            line: Line whose words to find
+
+        Returns:
+            Words overlapping any of the line's spans
+        """
+        return [self.words[i] for i in self.line_indices(line)]
+
+    def line_indices(self, line: dict[str, Any]) -> np.ndarray:
+        """
+        Get the indices into words of the words overlapping a line.
+
+        Args:
+            line: Line whose words to find
+
+        Returns:
+            Sorted array of word indices
+        """
+        ranges = []
+        for span in line.get("spans") or []:
+            offset = span["offset"]
+            lo = int(np.searchsorted(self._starts, offset))
+            hi = int(np.searchsorted(self._starts, offset + span["length"]))
+            # A word starting before the span may still run into it
+            if lo > 0 and self._ends[lo - 1] > offset:
+                lo -= 1
+            ranges.append(self._order[lo:hi])
+
+        if not ranges:
+            return np.empty(0, dtype=np.intp)
+        if len(ranges) == 1:
+            return np.sort(ranges[0])
+        return np.unique(np.concatenate(ranges))
+
+
+def print_page_info(page: dict[str, Any]) -> None:
     """Print standardized page information."""
-    print(f"----Analyzing document from page #{page.page_number}----")
-    print(f"Page dimensions: {page.width}x{page.height} {page.unit}")
\ No newline at end of file
+    print(f"----Analyzing document from page #{page['pageNumber']}----")
+    print(f"Page dimensions: {page.get('width')}x{page.get('height')} {page.get('unit')}")
\ No newline at end of file
@@ -1,11 +1,16 @@
+import threading
 from typing import Optional
 
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
 
-from web_browser.dom.js_scripts import GET_ELEMENT_PROPERTIES_SCRIPT
-from web_browser.dom.models import DOMNode, DOMTree, ElementProperties
+from web_browser.dom.js_scripts import (BUILD_DOM_TREE_SCRIPT,
+                                       GET_DOM_STATE_SCRIPT)
+from web_browser.dom.models import DOMNode, DOMTree
+
+# Most recent tree per WebDriver session, with the page state it was built from
+_tree_cache: dict[str, tuple[tuple, DOMTree]] = {}
+_tree_cache_lock = threading.Lock()
 
 
 class DOMTreeBuilder:
@@ -13,26 +18,18 @@ class DOMTreeBuilder:
     
     def __init__(self, driver: WebDriver) -> None:
         self.driver = driver
-        self._viewport_width: Optional[int] = None
-        self._viewport_height: Optional[int] = None
-
-    @property
-    def viewport_width(self) -> int:
-        """Lazy loading of viewport width."""
-        if self._viewport_width is None:
-            self._viewport_width = self.driver.execute_script("return window.innerWidth;")
-        return self._viewport_width
-
-    @property
-    def viewport_height(self) -> int:
-        """Lazy loading of viewport height."""
-        if self._viewport_height is None:
-            self._viewport_height = self.driver.execute_script("return window.innerHeight;")
-        return self._viewport_height
 
     def build_tree(self) -> DOMTree:
         """
         Build complete DOM tree.
+
+        The visible elements under document.body are walked in the browser
+        with a single script call.
+
+        The tree is reused while the document, its mutation counter, the
+        scroll position and the viewport size are unchanged. Mutations are
+        only tracked after web_analyzer.utils.js.init has run on the page;
+        before that every call walks the DOM.
         
         Returns:
             DOMTree representing the page structure
@@ -41,122 +38,29 @@ class DOMTreeBuilder:
             WebDriverException: If browser automation fails
         """
         try:
-            body = self.driver.find_element("tag name", "body")
-            tree = self._process_element(body)
+            state = tuple(self.driver.execute_script(GET_DOM_STATE_SCRIPT))
+
+            # Without a mutation counter there is no way to tell a stale tree
+            cacheable = state[1] is not None
+            if cacheable:
+                with _tree_cache_lock:
+                    cached = _tree_cache.get(self.driver.session_id)
+                if cached and cached[0] == state:
+                    return cached[1]
+
+            # Visibility filtering happens in the browser, so hidden
+            # subtrees are never sent back
+            tree: Optional[DOMNode] = self.driver.execute_script(BUILD_DOM_TREE_SCRIPT)
             
-            return {
+            dom_tree: DOMTree = {
                 "type": "root",
                 "children": [tree] if tree else []
             }
-        except WebDriverException as e:
-            raise WebDriverException(f"Failed to build DOM tree: {str(e)}")
 
-    def _get_element_properties(self, element: WebElement) -> Optional[ElementProperties]:
-        """
-        Extract properties from a DOM element.
-        
-        Args:
-            element: WebElement to analyze
-            
-        Returns:
-            ElementProperties if successful, None if failed
-        """
-        try:
-            props = self.driver.execute_script(GET_ELEMENT_PROPERTIES_SCRIPT, element)
-            
-            if not props:
-                return None
-                
-            # Ensure all required properties have default values and proper types
-            return {
-                "tagName": str(props.get("tagName", "")),
-                "text": str(props.get("text", "")),
-                "href": props.get("href"),
-                "src": props.get("src"),
-                "position": {
-                    "x": int(props.get("position", {}).get("x", 0)),
-                    "y": int(props.get("position", {}).get("y", 0)),
-                    "width": int(props.get("position", {}).get("width", 0)),
-                    "height": int(props.get("position", {}).get("height", 0))
-                },
-                "visibility": {
-                    "display": str(props.get("visibility", {}).get("display", "none")),
-                    "visibility": str(props.get("visibility", {}).get("visibility", "hidden")),
-                    "opacity": str(props.get("visibility", {}).get("opacity", "0"))
-                },
-                "selector": str(props.get("selector", ""))
-            }
-        except Exception as e:
-            print(f"Error getting properties: {e}")
-            return None
+            if cacheable:
+                with _tree_cache_lock:
+                    _tree_cache[self.driver.session_id] = (state, dom_tree)
 
-    def _is_element_visible(self, properties: Optional[ElementProperties]) -> bool:
-        """
-        Check if an element is visible in the viewport.
-        
-        Args:
-            properties: Element properties to check
-            
-        Returns:
-            bool indicating if element is visible
-        """
-        if not properties:
-            return False
-            
-        vis = properties.get("visibility", {})
-        pos = properties.get("position", {})
-        
-        # Basic display/visibility checks
-        if (vis.get("display") == "none" or 
-            vis.get("visibility") == "hidden" or
-            vis.get("opacity") == "0"):
-            return False
-            
-        # Position checks
-        if not all(isinstance(pos.get(k), (int, float)) 
-                  for k in ["width", "height", "x", "y"]):
-            return False
-            
-        # Size checks
-        if pos.get("width", 0) <= 0 or pos.get("height", 0) <= 0:
-            return False
-            
-        # Viewport checks
-        x = pos.get("x", 0)
-        y = pos.get("y", 0)
-        width = pos.get("width", 0)
-        height = pos.get("height", 0)
-        
-        # Allow slight overflow but catch completely out-of-view elements
-        margin = 50  # pixels
-        if (x + width < -margin or 
-            y + height < -margin or
-            x > self.viewport_width + margin or
-            y > self.viewport_height + margin):
-            return False
-            
-        return True
-    
-    def _process_element(self, element: WebElement) -> Optional[DOMNode]:
-        """Process a single DOM element and its children."""
-        properties = self._get_element_properties(element)
-        
-        # Skip invalid or invisible elements
-        if not properties or not self._is_element_visible(properties):
-            return None
-            
-        # Process children
-        children: list[DOMNode] = []
-        for child in element.find_elements("xpath", "./child::*"):
-            if child_node := self._process_element(child):
-                children.append(child_node)
-        
-        # Clean text content
-        text = properties.get("text", "").strip()
-        if not text and not children:
-            return None
-            
-        return {
-            "properties": properties,
-            "children": children
-        }
\ No newline at end of file
+            return dom_tree
+        except WebDriverException as e:
+            raise WebDriverException(f"Failed to build DOM tree: {str(e)}")
@@ -1,6 +1,20 @@
 """JavaScript functions used for DOM manipulation."""
 
-GET_ELEMENT_PROPERTIES_SCRIPT = """
+# Page state a built DOM tree depends on; __domVersion is maintained by a
+# MutationObserver installed in web_analyzer.utils.js.init
+GET_DOM_STATE_SCRIPT = """
+return [
+    performance.timeOrigin,
+    window.__domVersion === undefined ? null : window.__domVersion,
+    window.scrollX,
+    window.scrollY,
+    window.innerWidth,
+    window.innerHeight,
+    window.devicePixelRatio || 1
+];
+"""
+
+_ELEMENT_PROPERTIES_FUNCTIONS = """
 function getElementProperties(elem) {
     if (!elem || typeof elem !== 'object') {
         return null;
@@ -115,6 +129,95 @@ function getUniqueSelector(elem) {
     
     return path.join(' > ');
 }
+"""
 
+GET_ELEMENT_PROPERTIES_SCRIPT = _ELEMENT_PROPERTIES_FUNCTIONS + """
 return getElementProperties(arguments[0]);
+"""
+
+# Walks the visible DOM from document.body in the browser and returns the
+# nested {properties, children} tree, so building it takes one round trip
+BUILD_DOM_TREE_SCRIPT = _ELEMENT_PROPERTIES_FUNCTIONS + """
+// Allow slight overflow but catch completely out-of-view elements
+const VIEWPORT_MARGIN = 50;  // pixels
+const viewportWidth = window.innerWidth;
+const viewportHeight = window.innerHeight;
+
+function isElementVisible(props) {
+    const vis = props.visibility;
+    const pos = props.position;
+
+    // Basic display/visibility checks
+    if (vis.display === 'none' || vis.visibility === 'hidden' || vis.opacity === '0') {
+        return false;
+    }
+
+    // Position checks
+    if (![pos.width, pos.height, pos.x, pos.y].every(Number.isFinite)) {
+        return false;
+    }
+
+    // Size checks
+    if (pos.width <= 0 || pos.height <= 0) {
+        return false;
+    }
+
+    // Viewport checks
+    return !(pos.x + pos.width < -VIEWPORT_MARGIN ||
+             pos.y + pos.height < -VIEWPORT_MARGIN ||
+             pos.x > viewportWidth + VIEWPORT_MARGIN ||
+             pos.y > viewportHeight + VIEWPORT_MARGIN);
+}
+
+// Cheap test run before an element's properties are gathered, so hidden and
+// off-screen subtrees skip the computed style, text walk and selector work.
+// It only rejects elements isElementVisible would also reject.
+function mayBeVisible(elem) {
+    // Native check covering display, visibility and opacity (Chrome 121+)
+    if (typeof elem.checkVisibility === 'function' &&
+        !elem.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})) {
+        return false;
+    }
+
+    // One pixel of slack for the rounding applied to positions
+    const rect = elem.getBoundingClientRect();
+    return !(rect.width <= 0 || rect.height <= 0 ||
+             rect.right < -VIEWPORT_MARGIN - 1 ||
+             rect.bottom < -VIEWPORT_MARGIN - 1 ||
+             rect.left > viewportWidth + VIEWPORT_MARGIN + 1 ||
+             rect.top > viewportHeight + VIEWPORT_MARGIN + 1);
+}
+
+function processElement(elem) {
+    let props;
+    try {
+        if (!mayBeVisible(elem)) {
+            return null;
+        }
+        props = getElementProperties(elem);
+    } catch (e) {
+        return null;
+    }
+
+    // Skip invalid or invisible elements
+    if (!props || !isElementVisible(props)) {
+        return null;
+    }
+
+    const children = [];
+    for (const child of elem.children) {
+        const childNode = processElement(child);
+        if (childNode) {
+            children.push(childNode);
+        }
+    }
+
+    if (!props.text.trim() && !children.length) {
+        return null;
+    }
+
+    return {properties: props, children: children};
+}
+
+return document.body ? processElement(document.body) : null;
 """
\ No newline at end of file
@@ -1,4 +1,8 @@
+import base64
+import logging
 import random
+import threading
+from typing import Optional
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -6,6 +10,8 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.webdriver import WebDriver
 from webdriver_manager.chrome import ChromeDriverManager
 
+logger = logging.getLogger(__name__)
+
 
 def get_random_user_agent() -> str:
     user_agents = [
@@ -43,4 +49,119 @@ def new_webdriver(headless: bool = True) -> WebDriver:
         options.add_argument("--headless")
         options.add_argument("--window-size=1900,1080")
 
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
\ No newline at end of file
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+
+def capture_jpeg_screenshot(
+    driver: WebDriver,
+    quality: int = 85,
+    clip: Optional[dict[str, float]] = None
+) -> bytes:
+    """
+    Capture the viewport, or a clipped region of it, as JPEG bytes via CDP.
+
+    Args:
+        driver: WebDriver instance
+        quality: JPEG quality (0-100)
+        clip: Optional region with x, y, width, height and scale keys, in CSS
+              pixels relative to the document rather than the viewport
+
+    Returns:
+        JPEG-encoded screenshot bytes
+    """
+    params = {
+        "format": "jpeg",
+        "quality": quality,
+        "captureBeyondViewport": False
+    }
+    if clip:
+        params["clip"] = clip
+
+    result = driver.execute_cdp_cmd("Page.captureScreenshot", params)
+    return base64.b64decode(result["data"])
+
+
+class WebDriverPool:
+    """
+    Keeps warm WebDriver instances so browsers can be reused instead of relaunched.
+
+    Drivers are started on demand, one for each acquire that finds none
+    idle. Released drivers are reset to a blank page with cookies cleared and
+    kept for the next caller; drivers beyond the pool size are quit.
+    """
+
+    def __init__(self, size: int = 2, headless: bool = True) -> None:
+        """
+        Initialize the WebDriverPool.
+
+        Args:
+            size: Number of idle drivers to keep warm
+            headless: Whether pooled drivers run headless
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.headless: bool = headless
+        self.size: int = size
+        self._idle: list[WebDriver] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        """Support for context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Quit pooled drivers when exiting context."""
+        self.close()
+
+    def acquire(self) -> WebDriver:
+        """
+        Take an idle driver from the pool, starting a new one if none is idle.
+
+        Returns:
+            WebDriver instance owned by the caller until released
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+
+        # Started outside the lock, so concurrent callers do not queue
+        # behind each other's browser start-up
+        return new_webdriver(self.headless)
+
+    def close(self) -> None:
+        """Quit all idle drivers held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for driver in idle:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.error(f"Failed to quit pooled driver: {e}")
+
+    def release(self, driver: WebDriver) -> None:
+        """
+        Return a driver to the pool after resetting its browsing state.
+
+        Args:
+            driver: WebDriver previously returned by acquire
+        """
+        try:
+            driver.get("about:blank")
+            # delete_all_cookies only covers the current domain
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception as e:
+            logger.error(f"Failed to reset pooled driver, discarding it: {e}")
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return
+
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(driver)
+                return
+
+        driver.quit()
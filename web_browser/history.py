@@ -1,3 +1,4 @@
+from collections import deque
 from typing import Optional
 
 from web_browser.types import HistoryEntry
@@ -6,52 +7,74 @@ from web_browser.types import HistoryEntry
 class BrowserHistory:
     """Manages browser history with support for navigation"""
 
-    def __init__(self):
-        self._history: list[HistoryEntry] = []
-        self._current_index: int = -1
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_entries: Maximum number of entries kept behind the current
+                         one; the oldest are dropped first. Unbounded if None.
+        """
+        # Entries before the current one, oldest first
+        self._back: deque[HistoryEntry] = deque(maxlen=max_entries)
+        self._current: Optional[HistoryEntry] = None
+        # Entries after the current one, next entry last
+        self._forward: deque[HistoryEntry] = deque()
+        # All entries in order, rebuilt on first read after a change.
+        # Moving back and forward keeps the order, so only adding, replacing
+        # or evicting an entry invalidates it.
+        self._snapshot: Optional[tuple[HistoryEntry, ...]] = None
 
     def add_entry(self, entry: HistoryEntry) -> None:
-        """Add a new history entry and update the current index"""
-        # If we're not at the end of history, remove all future entries
-        if self._current_index < len(self._history) - 1:
-            self._history = self._history[: self._current_index + 1]
-
-        self._history.append(entry)
-        self._current_index = len(self._history) - 1
+        """Add a new history entry and make it the current one"""
+        if self._current is not None:
+            self._push_back(self._current)
+        self._current = entry
+        # Navigating somewhere new discards the forward entries
+        self._forward.clear()
+        self._snapshot = None
 
     def can_go_back(self) -> bool:
         """Check if we can navigate backwards"""
-        return self._current_index > 0
+        return bool(self._back)
 
     def can_go_forward(self) -> bool:
         """Check if we can navigate forwards"""
-        return self._current_index < len(self._history) - 1
+        return bool(self._forward)
 
     def get_current(self) -> Optional[HistoryEntry]:
         """Get current history entry"""
-        if 0 <= self._current_index < len(self._history):
-            return self._history[self._current_index]
-        return None
+        return self._current
 
-    def get_history(self) -> list[HistoryEntry]:
-        """Get all history entries"""
-        return self._history.copy()
+    def get_history(self) -> tuple[HistoryEntry, ...]:
+        """Get all history entries, oldest first, as a read-only snapshot"""
+        if self._snapshot is None:
+            current = (self._current,) if self._current is not None else ()
+            self._snapshot = (*self._back, *current, *reversed(self._forward))
+        return self._snapshot
 
     def go_back(self) -> Optional[HistoryEntry]:
         """Navigate to previous entry"""
         if self.can_go_back():
-            self._current_index -= 1
-            return self._history[self._current_index]
+            self._forward.append(self._current)
+            self._current = self._back.pop()
+            return self._current
         return None
 
     def go_forward(self) -> Optional[HistoryEntry]:
         """Navigate to next entry"""
         if self.can_go_forward():
-            self._current_index += 1
-            return self._history[self._current_index]
+            self._push_back(self._current)
+            self._current = self._forward.pop()
+            return self._current
         return None
 
+    def _push_back(self, entry: HistoryEntry) -> None:
+        """Push an entry onto the back stack, invalidating the snapshot if that evicts the oldest"""
+        if len(self._back) == self._back.maxlen:
+            self._snapshot = None
+        self._back.append(entry)
+
     def update_current(self, entry: HistoryEntry) -> None:
         """Update the current history entry with new data"""
-        if 0 <= self._current_index < len(self._history):
-            self._history[self._current_index] = entry
+        if self._current is not None:
+            self._current = entry
+            self._snapshot = None
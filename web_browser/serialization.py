@@ -0,0 +1,32 @@
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Union
+
+import orjson
+
+
+def write_json_list(
+    path: Union[str, Path],
+    items: Iterable[Any],
+    option: int = 0
+) -> None:
+    """
+    Write items to a file as an indented JSON list, encoding one item at a time.
+
+    The file is identical to orjson.dumps(list(items), option=OPT_INDENT_2 | option),
+    without the whole list being encoded in memory at once.
+
+    Args:
+        path: File to write
+        items: JSON-serializable items
+        option: Extra orjson options, e.g. orjson.OPT_NON_STR_KEYS
+    """
+    option |= orjson.OPT_INDENT_2
+    with open(path, "wb") as f:
+        separator = b"[\n  "
+        for item in items:
+            f.write(separator)
+            # Indent each item one level further, as an element of the list
+            f.write(orjson.dumps(item, option=option).replace(b"\n", b"\n  "))
+            separator = b",\n  "
+        f.write(b"[]" if separator == b"[\n  " else b"\n]")
@@ -0,0 +1,80 @@
+from typing import TYPE_CHECKING
+
+import requests
+from azure.core.pipeline.transport import RequestsTransport
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# aiohttp is imported by new_pooled_async_transport, so sync-only users do
+# not need it installed
+if TYPE_CHECKING:
+    from azure.core.pipeline.transport import AioHttpTransport
+
+# Kept at or above the number of OCR requests issued concurrently
+DEFAULT_POOL_SIZE = 16
+# Keyword arguments for Azure SDK clients' RetryPolicy. Transient failures
+# (408, 429 and most 5xx responses, dropped connections) are retried with
+# exponential backoff, and Retry-After headers are honoured.
+RETRY_SETTINGS = {
+    "retry_total": 5,
+    "retry_backoff_factor": 0.8,
+    "retry_backoff_max": 30,
+}
+# Seconds an idle connection is kept open for reuse, long enough to span
+# the polling interval of a long-running analysis
+KEEPALIVE_TIMEOUT = 120
+
+
+def new_pooled_async_transport(pool_size: int = DEFAULT_POOL_SIZE) -> "AioHttpTransport":
+    """
+    Create an async Azure SDK transport whose connections are pooled and kept alive.
+
+    Must be called with an event loop running, as the aiohttp session is
+    bound to it.
+
+    Args:
+        pool_size: Maximum number of connections open at once
+
+    Returns:
+        AioHttpTransport that owns the pooled session
+    """
+    import aiohttp
+    from azure.core.pipeline.transport import AioHttpTransport
+
+    connector = aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=KEEPALIVE_TIMEOUT)
+    # Same session settings as the transport's default session
+    session = aiohttp.ClientSession(
+        connector=connector,
+        trust_env=True,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        auto_decompress=False
+    )
+
+    return AioHttpTransport(session=session, session_owner=True)
+
+
+def new_pooled_transport(pool_size: int = DEFAULT_POOL_SIZE) -> RequestsTransport:
+    """
+    Create an Azure SDK transport whose session keeps a larger connection pool.
+
+    Connections, and their TLS sessions, are reused across requests to the
+    same endpoint instead of being set up again once the default pool of 10
+    is exhausted.
+
+    Args:
+        pool_size: Maximum number of connections kept open per host
+
+    Returns:
+        RequestsTransport that owns the pooled session
+    """
+    session = requests.Session()
+    # Retries are handled by the SDK pipeline, as in the default transport
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return RequestsTransport(session=session, session_owner=True)
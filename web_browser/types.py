@@ -1,9 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoryEntry:
     """Represents a single browsing history entry"""
 
@@ -11,3 +11,14 @@ class HistoryEntry:
     url: str
     screenshot_path: Optional[str] = None
     title: Optional[str] = None
+    capture_screenshot: Optional[Callable[[], Optional[str]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def get_screenshot_path(self) -> Optional[str]:
+        """Get the screenshot path, capturing the screenshot on first access if deferred"""
+        if self.screenshot_path is None and self.capture_screenshot:
+            self.screenshot_path = self.capture_screenshot()
+            if self.screenshot_path is not None:
+                self.capture_screenshot = None
+        return self.screenshot_path
@@ -1,35 +1,88 @@
 import logging
 import time
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO
+from pathlib import Path
 from threading import Lock
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from azure.ai.vision.imageanalysis import ImageAnalysisClient
-from azure.ai.vision.imageanalysis.models import VisualFeatures
 from azure.core.credentials import AzureKeyCredential
-from filelock import FileLock
-from openai import AzureOpenAI
 from PIL import Image
+from pydantic import BaseModel
 
+from web_browser.cache import content_digest, load_response, store_response
+from web_browser.transport import new_pooled_transport
 from web_browser.vision.config import OpenAIConfig, VisionConfig
 from web_browser.vision.models import ImageAnalysisResult
-from web_browser.vision.types import WebpageDescription
-from web_browser.vision.utils import encode_image
+from web_browser.vision.types import (WebpageDescription,
+                                     WebpageDescriptionBatch)
+from web_browser.vision.utils import encode_image_as_data_url, read_image_size
+
+# The OpenAI and Vision SDKs are imported when a client is created, so
+# importing this module (and web_browser) does not pay for them up front
+if TYPE_CHECKING:
+    from openai import AzureOpenAI
 
 logger = logging.getLogger(__name__)
 
+SCREENSHOT_SYSTEM_PROMPT = "You are an expert at analyzing webpage screenshots and describing them in a way that helps AI systems locate and interact with elements. Focus on precision in describing locations and interactive elements. Use clear, consistent terms for positions (top, bottom, left, right, center) and measurements."
+
+
+@lru_cache(maxsize=None)
+def response_format(response_type: type[BaseModel]) -> dict[str, Any]:
+    """
+    Build the strict JSON schema response format for a model once per type.
+
+    Strict mode needs every property required, which the response models'
+    fields all are, and unknown properties forbidden on every object.
+
+    Args:
+        response_type: Pydantic model the response is validated against
+
+    Returns:
+        response_format argument for chat.completions.create
+    """
+    schema = response_type.model_json_schema()
+    for definition in (schema, *schema.get("$defs", {}).values()):
+        if definition.get("type") == "object":
+            definition["additionalProperties"] = False
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "schema": schema,
+            "name": response_type.__name__,
+            "strict": True,
+        },
+    }
+
+
 class VisionAnalysisClient:
     """Client for handling both Azure Vision and OpenAI vision analysis."""
     
     def __init__(
         self, 
         vision_config: VisionConfig,
-        openai_config: Optional[OpenAIConfig] = None
+        openai_config: Optional[OpenAIConfig] = None,
+        cache_dir: Optional[Path] = None
     ):
-        self.openai_client = None
+        """
+        Args:
+            vision_config: Azure Vision endpoint and key
+            openai_config: Azure OpenAI settings; the OpenAI methods are
+                unavailable without them
+            cache_dir: Directory for cached descriptions; defaults to
+                web_browser.cache.default_cache_dir()
+        """
+        from azure.ai.vision.imageanalysis import ImageAnalysisClient
+
+        self.cache_dir = cache_dir
+        self.openai_client: Optional["AzureOpenAI"] = None
         self.openai_config = openai_config
         if openai_config:
+            from openai import AzureOpenAI
+
             self.openai_client = AzureOpenAI(
                 api_key=openai_config.api_key,
                 api_version=openai_config.api_version,
@@ -38,52 +91,109 @@ class VisionAnalysisClient:
         
         self.vision_client = ImageAnalysisClient(
             endpoint=vision_config.endpoint,
-            credential=AzureKeyCredential(vision_config.key)
+            credential=AzureKeyCredential(vision_config.key),
+            transport=new_pooled_transport()
         )
 
         # Add rate limiting
         self._openai_lock = Lock()
         self._vision_lock = Lock()
-        self._last_openai_call = 0
-        self._last_vision_call = 0
+        # time.monotonic() stamps of the latest reserved call slots
+        self._last_openai_call = float("-inf")
+        self._last_vision_call = float("-inf")
         self.openai_rate_limit = 0.5  # seconds between calls
         self.vision_rate_limit = 1.0  # seconds between calls
 
+    def __enter__(self):
+        """Support for context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Ensure connection pools are closed when exiting context."""
+        self.close()
+
+    def analyze_all(
+        self,
+        image_data: BytesIO,
+        filename: str
+    ) -> tuple[Optional[ImageAnalysisResult], Optional[WebpageDescription]]:
+        """
+        Run the Vision analysis and both OpenAI descriptions of one image at once.
+
+        Vision and OpenAI are rate limited separately, so the Vision call
+        overlaps with the two OpenAI calls instead of waiting for them.
+
+        Args:
+            image_data: Image bytes for the Vision analysis
+            filename: Path to the same image for the OpenAI descriptions
+
+        Returns:
+            Tuple of the Vision result, with its accessibility description
+            filled in, and the structured screenshot description
+
+        Raises:
+            ValueError: If OpenAI client is not configured or for API errors
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            analysis_future = executor.submit(self.analyze_image, image_data)
+            accessibility_future = executor.submit(
+                self.describe_image_for_accessibility, filename
+            )
+            description_future = executor.submit(self.describe_screenshot, filename)
+
+            analysis = analysis_future.result()
+            accessibility_description = accessibility_future.result()
+            description = description_future.result()
+
+        if analysis:
+            analysis.accessibility_description = accessibility_description
+        return analysis, description
+
     def analyze_image(self, image_data: BytesIO) -> Optional[ImageAnalysisResult]:
         try:
+            from azure.ai.vision.imageanalysis.models import VisualFeatures
+
             self._wait_for_vision_rate_limit()
             
-            with Image.open(image_data) as img:
-                width, height = img.size
-                if width < 50 or height < 50 or width > 16000 or height > 16000:
-                    raise ValueError(f"Invalid image dimensions: {width}x{height}")
-                
-                result = self.vision_client.analyze(
-                    image_data=image_data.getvalue(),
-                    visual_features=[VisualFeatures.CAPTION, VisualFeatures.READ],
-                )
-    
-                return ImageAnalysisResult(
-                    caption=result.caption.text if result.caption else None,
-                    detected_text="\n".join(
-                        line.text 
-                        for block in result.read.blocks 
-                        for line in block.lines
-                    ) if result.read and result.read.blocks else None
-                )
+            # PNG and JPEG sizes are read straight from the header; PIL
+            # handles any other format
+            with image_data.getbuffer() as buffer:
+                size = read_image_size(buffer)
+            if size is None:
+                image_data.seek(0)
+                with Image.open(image_data) as img:
+                    size = img.size
+            width, height = size
+            if width < 50 or height < 50 or width > 16000 or height > 16000:
+                raise ValueError(f"Invalid image dimensions: {width}x{height}")
+            
+            # Stream the buffer as the request body instead of copying it
+            # out with getvalue(); the SDK rewinds it itself on retries
+            image_data.seek(0)
+            result = self.vision_client.analyze(
+                image_data=image_data,
+                visual_features=[VisualFeatures.CAPTION, VisualFeatures.READ],
+            )
+
+            blocks = result.read.blocks if result.read else None
+            return ImageAnalysisResult(
+                caption=result.caption.text if result.caption else None,
+                # A list lets join size the result in one pass
+                detected_text="\n".join([
+                    line.text
+                    for block in blocks
+                    for line in block.lines
+                ]) if blocks else None
+            )
     
         except Exception as e:
             raise ValueError(f"Failed to analyze image: {str(e)}")
     
-    @contextmanager
-    def _file_access(self, filename: str):
-        lock = FileLock(f"{filename}.lock")
-        with lock:
-            try:
-                yield
-            finally:
-                if lock.is_locked:
-                    lock.release()
+    def close(self) -> None:
+        """Close the HTTP connection pools held by the Vision and OpenAI clients."""
+        self.vision_client.close()
+        if self.openai_client:
+            self.openai_client.close()
 
     @classmethod
     def from_env(cls) -> "VisionAnalysisClient":
@@ -115,8 +225,9 @@ class VisionAnalysisClient:
             raise ValueError("OpenAI client not configured")
 
         try:
-            base64_image = encode_image(filename)
+            image_url = encode_image_as_data_url(filename)
 
+            self._wait_for_openai_rate_limit()
             response = self.openai_client.chat.completions.create(
                 messages=[
                     {
@@ -128,9 +239,7 @@ class VisionAnalysisClient:
                             },
                             {
                                 "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
-                                },
+                                "image_url": {"url": image_url},
                             },
                         ],
                     }
@@ -146,6 +255,9 @@ class VisionAnalysisClient:
         """
         Generate a structured description of a webpage screenshot that can be used
         for automated interaction.
+
+        Descriptions are cached on the image content, so an unchanged
+        screenshot is only sent to the model once.
         
         Args:
             filename: Path to the image file
@@ -163,12 +275,19 @@ class VisionAnalysisClient:
             raise ValueError("OpenAI client not configured")
     
         try:
-            base64_image = encode_image(filename)
-            completion = self.openai_client.beta.chat.completions.parse(
+            with open(filename, "rb") as image_file:
+                digest = content_digest(image_file.read())
+            cache_namespace = f"describe_screenshot-{self.openai_config.model}"
+            if (cached := load_response(cache_namespace, digest, self.cache_dir)) is not None:
+                return WebpageDescription.model_validate(cached)
+
+            image_url = encode_image_as_data_url(filename)
+            self._wait_for_openai_rate_limit()
+            completion = self.openai_client.chat.completions.create(
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert at analyzing webpage screenshots and describing them in a way that helps AI systems locate and interact with elements. Focus on precision in describing locations and interactive elements. Use clear, consistent terms for positions (top, bottom, left, right, center) and measurements.",
+                        "content": SCREENSHOT_SYSTEM_PROMPT,
                     },
                     {
                         "role": "user",
@@ -179,29 +298,133 @@ class VisionAnalysisClient:
                             },
                             {
                                 "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
-                                },
+                                "image_url": {"url": image_url},
                             },
                         ],
                     }
                 ],
                 model=self.openai_config.model,
-                response_format=WebpageDescription,
+                response_format=response_format(WebpageDescription),
             )
-            description = completion.choices[0].message
+            message = completion.choices[0].message
 
-            if (description.refusal):
-                logger.warning(description.refusal)
+            if (message.refusal):
+                logger.warning(message.refusal)
             else:
-                return description.parsed
+                description = WebpageDescription.model_validate_json(message.content)
+                store_response(
+                    cache_namespace,
+                    digest,
+                    description.model_dump(mode="json"),
+                    self.cache_dir
+                )
+                return description
         
         except Exception as e:
             raise ValueError(f"Failed to generate screenshot description: {str(e)}")
     
+    def describe_screenshots_batch(
+        self,
+        filenames: list[str]
+    ) -> list[Optional[WebpageDescription]]:
+        """
+        Generate structured descriptions of several webpage screenshots in one request.
+
+        Screenshots with a cached description are not sent; the rest are
+        packed into a single multi-image message, so the per-request
+        overhead is paid once for the whole batch.
+
+        Args:
+            filenames: Paths to the image files
+
+        Returns:
+            Descriptions in the order of filenames; all uncached entries are
+            None if the model refused the request
+
+        Raises:
+            ValueError: If OpenAI client is not configured or for API errors
+        """
+        if not all(filenames):
+            raise ValueError("Filenames cannot be None or empty")
+
+        if not self.openai_client:
+            raise ValueError("OpenAI client not configured")
+
+        try:
+            cache_namespace = f"describe_screenshot-{self.openai_config.model}"
+            descriptions: list[Optional[WebpageDescription]] = [None] * len(filenames)
+            digests: list[str] = []
+            pending: list[int] = []
+            for i, filename in enumerate(filenames):
+                with open(filename, "rb") as image_file:
+                    digests.append(content_digest(image_file.read()))
+                if (cached := load_response(cache_namespace, digests[i], self.cache_dir)) is not None:
+                    descriptions[i] = WebpageDescription.model_validate(cached)
+                else:
+                    pending.append(i)
+
+            if not pending:
+                return descriptions
+
+            content = [
+                {
+                    "type": "text",
+                    "text": f"Analyze each of these {len(pending)} webpage screenshots and provide a structured description of each that can help locate and interact with elements. Return exactly one description per screenshot, in the order given.",
+                },
+            ]
+            for position, i in enumerate(pending, start=1):
+                content.append({"type": "text", "text": f"Screenshot {position}:"})
+                content.append({
+                    "type": "image_url",
+                    "image_url": {"url": encode_image_as_data_url(filenames[i])},
+                })
+
+            self._wait_for_openai_rate_limit()
+            completion = self.openai_client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": SCREENSHOT_SYSTEM_PROMPT},
+                    {"role": "user", "content": content},
+                ],
+                model=self.openai_config.model,
+                response_format=response_format(WebpageDescriptionBatch),
+            )
+            message = completion.choices[0].message
+
+            if (message.refusal):
+                logger.warning(message.refusal)
+                return descriptions
+
+            batch = WebpageDescriptionBatch.model_validate_json(message.content)
+            if len(batch.descriptions) != len(pending):
+                raise ValueError(
+                    f"Expected {len(pending)} descriptions, got {len(batch.descriptions)}"
+                )
+
+            for i, description in zip(pending, batch.descriptions):
+                store_response(
+                    cache_namespace,
+                    digests[i],
+                    description.model_dump(mode="json"),
+                    self.cache_dir
+                )
+                descriptions[i] = description
+            return descriptions
+
+        except Exception as e:
+            raise ValueError(f"Failed to generate screenshot descriptions: {str(e)}")
+
+    def _wait_for_openai_rate_limit(self):
+        self._wait_for_rate_limit(self._openai_lock, "_last_openai_call", self.openai_rate_limit)
+
+    def _wait_for_rate_limit(self, lock: Lock, last_call_attr: str, rate_limit: float):
+        # Reserve the next free slot under the lock and sleep after releasing
+        # it, so callers queue for distinct slots without blocking each other
+        with lock:
+            now = time.monotonic()
+            wait = max(0.0, rate_limit - (now - getattr(self, last_call_attr)))
+            setattr(self, last_call_attr, now + wait)
+        if wait:
+            time.sleep(wait)
+
     def _wait_for_vision_rate_limit(self):
-        with self._vision_lock:
-            now = time.time()
-            if now - self._last_vision_call < self.vision_rate_limit:
-                time.sleep(self.vision_rate_limit - (now - self._last_vision_call))
-            self._last_vision_call = time.time()
\ No newline at end of file
+        self._wait_for_rate_limit(self._vision_lock, "_last_vision_call", self.vision_rate_limit)
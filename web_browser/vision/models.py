@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageAnalysisResult:
     """Results from image analysis."""
     caption: Optional[str]
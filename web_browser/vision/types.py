@@ -1,9 +1,14 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+# Parsed responses are read-only, and fields the schema does not know are dropped
+RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore")
 
 
 class InteractiveElement(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     type: str  # button, link, input, dropdown, etc
     location: str  # precise location description
     visuals: str  # color, size, icons, etc
@@ -13,12 +18,16 @@ class InteractiveElement(BaseModel):
 
 
 class ImageElement(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     location: str
     content: str
     purpose: str
 
 
 class LayoutSection(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     header: Optional[str]
     main_content: str
     navigation: Optional[str]
@@ -26,19 +35,31 @@ class LayoutSection(BaseModel):
 
 
 class VisualHierarchy(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     primary_focus: str
     secondary_elements: list[str]
     background_elements: list[str]
 
 
 class KeyContent(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     headings: list[str]
     main_text_blocks: list[str]
     images: list[ImageElement]
 
 
 class WebpageDescription(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     layout: LayoutSection
     interactive_elements: list[InteractiveElement]
     key_content: KeyContent
-    visual_hierarchy: VisualHierarchy
\ No newline at end of file
+    visual_hierarchy: VisualHierarchy
+
+
+class WebpageDescriptionBatch(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
+    descriptions: list[WebpageDescription]  # one per screenshot, in order
@@ -1,10 +1,198 @@
-import base64
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
+from typing import Iterable, Iterator, Optional, Union
+
+from PIL import Image
+
+from web_browser.types import HistoryEntry
+
+try:
+    from pybase64 import b64encode_as_string
+except ImportError:
+    # The standard library encoder is C as well, just without SIMD
+    from base64 import b64encode
+
+    def b64encode_as_string(s) -> str:
+        """Encode a bytes-like object as a base64 str."""
+        return b64encode(s).decode("ascii")
+
+# Uploads are always JPEG, as _prepare_upload re-encodes any other format,
+# so one prefix fits every data URL
+DATA_URL_PREFIX = "data:image/jpeg;base64,"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Start-of-frame markers, which carry the image size; C4, C8 and CC are
+# other segments sharing the range
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# The model downscales larger images to fit this box anyway
+MAX_UPLOAD_DIMENSION = 2048
+UPLOAD_JPEG_QUALITY = 85
+# Files at least this large are memory-mapped rather than read into memory;
+# below it the mapping costs more than the copy it saves
+MMAP_THRESHOLD = 256 * 1024
 
 
 def encode_image(filename: str) -> str:
     """Encode an image file as base64."""
     try:
-        with open(filename, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
+        with _read_file(filename) as data:
+            return b64encode_as_string(data)
+    except Exception as e:
+        raise ValueError(f"Failed to encode image: {str(e)}")
+
+
+def encode_history(
+    entries: Iterable[HistoryEntry],
+    max_workers: Optional[int] = None
+) -> list[str]:
+    """
+    Encode the screenshots of history entries as base64 in parallel.
+
+    Deferred screenshots are captured first, one at a time, since that
+    drives the browser. The files are then read and encoded on a thread
+    pool, which overlaps the reads and avoids pickling every encoding
+    back from a worker process.
+
+    Args:
+        entries: History entries, e.g. from WebBrowser.get_history_entries
+        max_workers: Threads to encode with; defaults to the CPU count
+
+    Returns:
+        Base64 encodings of the entries that have a screenshot, in order
+
+    Raises:
+        ValueError: If a screenshot cannot be read
+    """
+    paths = [
+        path for entry in entries
+        if (path := entry.get_screenshot_path()) is not None
+    ]
+    if len(paths) < 2:
+        return [encode_image(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(encode_image, paths))
+
+
+def encode_image_as_data_url(filename: str) -> str:
+    """
+    Encode an image file as a base64 JPEG data URL for upload.
+
+    Images larger than MAX_UPLOAD_DIMENSION, or not in JPEG format, are
+    downscaled and re-encoded as JPEG first; other JPEGs are sent as-is.
+
+    Results are cached by path, modification time and size, so describing
+    the same screenshot several times reads and encodes it once.
+
+    Args:
+        filename: Path to the image
+
+    Returns:
+        data:image/jpeg;base64 URL for the image
+
+    Raises:
+        ValueError: If the file cannot be read or decoded
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError as e:
+        raise ValueError(f"Failed to encode image: {str(e)}")
+
+    return _encoded_data_url(filename, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _encoded_data_url(filename: str, mtime_ns: int, size: int) -> str:
+    """Read, prepare and encode a file as a data URL; mtime_ns and size only key the cache."""
+    try:
+        with _read_file(filename) as data:
+            encoded = b64encode_as_string(_prepare_upload(data))
     except Exception as e:
-        raise ValueError(f"Failed to encode image: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Failed to encode image: {str(e)}")
+
+    return DATA_URL_PREFIX + encoded
+
+
+def read_image_size(data: Union[bytes, memoryview]) -> Optional[tuple[int, int]]:
+    """
+    Read an image's width and height from its PNG or JPEG header.
+
+    Only the header is looked at, without decoding or involving PIL.
+
+    Args:
+        data: Image file contents
+
+    Returns:
+        (width, height), or None if the data is not a PNG or JPEG or the
+        header is truncated
+    """
+    if data[:8] == PNG_SIGNATURE:
+        # IHDR is always the first chunk
+        if len(data) < 24:
+            return None
+        return int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big")
+
+    if data[:2] == b"\xff\xd8":
+        return _read_jpeg_size(data)
+
+    return None
+
+
+def _prepare_upload(data: Union[bytes, mmap.mmap]) -> Union[bytes, mmap.mmap]:
+    """Downscale and re-encode an image as JPEG unless it is a small enough JPEG already."""
+    # A mapping is file-like itself, so PIL reads it without a copy
+    source = data if isinstance(data, mmap.mmap) else BytesIO(data)
+    with Image.open(source) as image:
+        if image.format == "JPEG" and max(image.size) <= MAX_UPLOAD_DIMENSION:
+            return data
+
+        image.thumbnail((MAX_UPLOAD_DIMENSION, MAX_UPLOAD_DIMENSION), Image.Resampling.LANCZOS)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        output = BytesIO()
+        image.save(output, "JPEG", quality=UPLOAD_JPEG_QUALITY, optimize=True)
+        return output.getvalue()
+
+
+def _read_jpeg_size(data: Union[bytes, memoryview]) -> Optional[tuple[int, int]]:
+    """Walk the JPEG segments after SOI to the first start-of-frame and read its size."""
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            # Markers without a length or payload
+            offset += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height = int.from_bytes(data[offset + 5:offset + 7], "big")
+            width = int.from_bytes(data[offset + 7:offset + 9], "big")
+            return width, height
+        if marker in (0xD9, 0xDA):
+            # End of image or start of scan before any frame header
+            return None
+        offset += 2 + int.from_bytes(data[offset + 2:offset + 4], "big")
+    return None
+
+
+@contextmanager
+def _read_file(filename: str) -> Iterator[Union[bytes, mmap.mmap]]:
+    """Yield a file's contents, memory-mapped if it is at least MMAP_THRESHOLD bytes."""
+    with open(filename, "rb") as file:
+        if os.fstat(file.fileno()).st_size < MMAP_THRESHOLD:
+            yield file.read()
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
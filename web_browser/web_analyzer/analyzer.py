@@ -2,7 +2,9 @@ import hashlib
 import logging
 import os
 import shutil
+import threading
 import time
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
 from pathlib import Path
@@ -10,12 +12,13 @@ from typing import Any, Optional
 
 import cv2
 import numpy as np
-from PIL import Image
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
 
+from web_browser.driver import capture_jpeg_screenshot
 from web_browser.vision.client import VisionAnalysisClient
+from web_browser.vision.utils import read_image_size
 from web_browser.web_analyzer.config import Config
 from web_browser.web_analyzer.managers.image import ImageProcessor
 from web_browser.web_analyzer.managers.scroll import ScrollManager
@@ -23,9 +26,17 @@ from web_browser.web_analyzer.managers.style import StyleManager
 from web_browser.web_analyzer.types import ClickableElement, HoverChange
 from web_browser.web_analyzer.utils import js
 from web_browser.web_analyzer.utils.decorators import error_handler
+from web_browser.web_analyzer.utils.text import sanitize_filename
 
 logger = logging.getLogger(__name__)
 
+# Deletes old screenshot directories off the analysis thread; it is joined
+# at interpreter exit, so started deletions finish
+_cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-cleanup")
+
+# Hover screenshot pairs whose change regions are kept per analyzer
+HOVER_RESULT_MEMO_SIZE = 256
+
 
 class ElementAnalyzer:
     """Main class for analyzing web elements."""
@@ -34,6 +45,13 @@ class ElementAnalyzer:
         self.config: Config = config
         self.debug: bool = debug
         self._element_cache: dict[str, Any] = {}
+        # Change regions by digests of the before and after hover screenshots,
+        # since elements sharing an appearance produce identical pairs;
+        # least recently used pairs are evicted past HOVER_RESULT_MEMO_SIZE
+        self._hover_result_cache: OrderedDict[
+            tuple[bytes, bytes], tuple[tuple[int, int, int, int], ...]
+        ] = OrderedDict()
+        self._hover_result_lock = threading.Lock()
         self.image_processor: ImageProcessor = ImageProcessor()
         self.max_workers: int = max_workers
         self.scroll_manager: ScrollManager = ScrollManager()
@@ -45,26 +63,38 @@ class ElementAnalyzer:
         change_regions: list[tuple[int, int, int, int]],
         after_img: np.ndarray
     ) -> list[str]:
-        """Analyze text in changed regions."""
-        changed_region_texts = []
-        
-        for (x1, y1, x2, y2) in change_regions:
-            region_crop = after_img[y1:y2, x1:x2]
-            
-            if not self._is_valid_region_size(region_crop.shape[1], region_crop.shape[0]):
-                continue
-                
-            text = self._analyze_region(region_crop, x1, y1, x2, y2)
-            if text:
-                changed_region_texts.append(text)
+        """Analyze text in changed regions, with the Vision calls made concurrently."""
+        if not change_regions:
+            return []
+
+        # Filter on the sizes the crops will have, clipped to the image,
+        # for all regions at once
+        regions = np.asarray(change_regions, dtype=np.int64)
+        img_height, img_width = after_img.shape[:2]
+        widths = np.minimum(regions[:, 2], img_width) - regions[:, 0]
+        heights = np.minimum(regions[:, 3], img_height) - regions[:, 1]
+        valid = (widths >= 50) & (widths <= 16000) & (heights >= 50) & (heights <= 16000)
+
+        region_crops = [
+            after_img[y1:y2, x1:x2]
+            for x1, y1, x2, y2 in regions[valid].tolist()
+        ]
+        if not region_crops:
+            return []
+
+        # Each call is a network round trip, so overlap them; the results
+        # keep the order of the regions
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            texts = list(executor.map(self._analyze_region, region_crops))
                 
-        return changed_region_texts
+        return [text for text in texts if text]
     
     @error_handler
     def analyze_elements(
         self, 
         driver: WebDriver,
-        hover_criteria: Optional[list[dict]] = None
+        hover_criteria: Optional[list[dict]] = None,
+        viewport_ready: bool = False
     ) -> list[dict]:
         """
         Analyze clickable elements with selective hover detection.
@@ -73,9 +103,11 @@ class ElementAnalyzer:
             driver: WebDriver instance
             hover_criteria: Optional list of criteria dicts for hover detection.
                           Each dict can contain 'tag', 'class', 'id', and/or 'text' keys.
+            viewport_ready: Whether prepare_viewport has already been called for
+                          this page, so the directory and viewport.jpg are kept
         """
-        self.setup_screenshot_dir()
-        self._save_viewport_screenshot(driver)
+        if not viewport_ready:
+            self.prepare_viewport(driver)
         elements = self.get_clickable_elements(driver)
         return self._process_elements(driver, elements, hover_criteria)
     
@@ -84,6 +116,8 @@ class ElementAnalyzer:
         """Analyze captured element data without viewport operations."""
         try:
             element = data["element"]
+            # Keyed on the element as captured, before analysis fills in text
+            element_hash = self._get_element_hash(element)
 
             # Analyze screenshot if available
             if data["screenshot"] and not element["text"]:
@@ -96,7 +130,6 @@ class ElementAnalyzer:
                     element["hover_state"] = hover_result
 
             # Cache the processed element
-            element_hash = self._get_element_hash(element)
             self._element_cache[element_hash] = {
                 k: v for k, v in element.items() 
                 if k not in {"element"}  # Don't cache WebElement
@@ -112,15 +145,16 @@ class ElementAnalyzer:
     @error_handler
     def _analyze_element_image(self, element: dict, image_data: BytesIO) -> None:
         try:
-            with Image.open(image_data) as img:
-                width, height = img.size
-                if width < 50 or height < 50 or width > 16000 or height > 16000:
-                    return
-
-                analysis_result = self.vision_client.analyze_image(image_data)
-                if analysis_result:
-                    element["text"] = analysis_result.detected_text
-                    element["image_caption"] = analysis_result.caption
+            # The crops are JPEGs we encoded, so the size is in the header
+            with image_data.getbuffer() as buffer:
+                size = read_image_size(buffer)
+            if size is None or not self._is_valid_region_size(*size):
+                return
+
+            analysis_result = self.vision_client.analyze_image(image_data)
+            if analysis_result:
+                element["text"] = analysis_result.detected_text
+                element["image_caption"] = analysis_result.caption
         except Exception as e:
             logger.error(f"Error analyzing element image: {e}")
 
@@ -204,28 +238,32 @@ class ElementAnalyzer:
     @error_handler
     def _analyze_hover_data(self, hover_data: dict) -> Optional[dict]:
         try:
-            before_img = cv2.imdecode(
-                np.frombuffer(hover_data['before_img'].getvalue(), np.uint8),
-                cv2.IMREAD_COLOR
-            )
-            after_img = cv2.imdecode(
-                np.frombuffer(hover_data['after_img'].getvalue(), np.uint8),
-                cv2.IMREAD_COLOR
+            before_data = hover_data['before_img'].getbuffer()
+            after_data = hover_data['after_img'].getbuffer()
+            cache_key = (
+                hashlib.blake2b(before_data, digest_size=16).digest(),
+                hashlib.blake2b(after_data, digest_size=16).digest()
             )
 
-            if before_img is None or after_img is None:
-                return None
+            change_regions = self._load_hover_result(cache_key)
+            if change_regions is None:
+                # Change detection only compares luminance, which the JPEG decoder
+                # can produce directly without converting or upsampling colour
+                before_img = cv2.imdecode(np.frombuffer(before_data, np.uint8), cv2.IMREAD_GRAYSCALE)
+                after_img = cv2.imdecode(np.frombuffer(after_data, np.uint8), cv2.IMREAD_GRAYSCALE)
 
-            before_img = cv2.cvtColor(before_img, cv2.COLOR_BGR2RGB)
-            after_img = cv2.cvtColor(after_img, cv2.COLOR_BGR2RGB)
+                if before_img is None or after_img is None:
+                    return None
+
+                change_regions = tuple(self.image_processor.detect_hover_changes(before_img, after_img))
+                self._remember_hover_result(cache_key, change_regions)
 
-            change_regions = self.image_processor.detect_hover_changes(before_img, after_img)
             if not change_regions:
                 return None
 
             # Just analyze style changes and regions without element-specific data
             return HoverChange(
-                change_regions=change_regions,
+                change_regions=list(change_regions),
                 color_before=None,  # Skip color analysis
                 color_after=None,   # Skip color analysis
                 size_before=None,   # Skip size analysis
@@ -241,27 +279,19 @@ class ElementAnalyzer:
             logger.error(f"Error analyzing hover data: {e}")
             return None
     
-    def _analyze_region(
-        self,
-        region_crop: np.ndarray,
-        x1: int,
-        y1: int,
-        x2: int,
-        y2: int
-    ) -> Optional[str]:
-        """Analyze a single region for text content."""
-        region_pil = Image.fromarray(region_crop)
-        temp_path = Path(self.config.screenshot_dir) / f"temp_region_{x1}_{y1}_{x2}_{y2}.png"
-        
+    def _analyze_region(self, region_crop: np.ndarray) -> Optional[str]:
+        """Analyze a single RGB region crop for text content."""
         try:
-            region_pil.save(temp_path)
-            region_analysis = self.vision_client.analyze_image(str(temp_path))
+            # Encoded in memory; OpenCV expects BGR channel order
+            encoded, png = cv2.imencode(".png", cv2.cvtColor(region_crop, cv2.COLOR_RGB2BGR))
+            if not encoded:
+                return None
+
+            region_analysis = self.vision_client.analyze_image(BytesIO(png))
             return region_analysis.detected_text if region_analysis else None
         except ValueError as e:
             logger.warning(f"Failed to analyze region: {e}")
             return None
-        finally:
-            temp_path.unlink(missing_ok=True)
 
     def _apply_cached_data(self, element: dict) -> dict:
         """Apply cached data to an element if available."""
@@ -282,7 +312,9 @@ class ElementAnalyzer:
 
             # Get initial state
             styles_and_screenshot = js.get_element_hover_state(driver, web_element)
-            before_png = driver.get_screenshot_as_png()
+            # The browser encodes the JPEGs, so no PNG is decoded and
+            # re-encoded here
+            before_jpeg = capture_jpeg_screenshot(driver, quality=75)
 
             # Simulate hover
             js.hover(driver, web_element)
@@ -290,25 +322,17 @@ class ElementAnalyzer:
 
             # Get post-hover state
             after_styles = js.get_computed_styles(driver, web_element)
-            after_png = driver.get_screenshot_as_png()
-
-            # Process images
-            before_img = BytesIO()
-            after_img = BytesIO()
-            Image.open(BytesIO(before_png)).save(before_img, "JPEG", quality=75)
-            Image.open(BytesIO(after_png)).save(after_img, "JPEG", quality=75)
-            before_img.seek(0)
-            after_img.seek(0)
+            after_jpeg = capture_jpeg_screenshot(driver, quality=75)
 
             if self.debug:
                 hover_path = Path(self.config.screenshot_dir) / f"hover_{idx}"
                 hover_path.mkdir(exist_ok=True)
-                Image.open(before_img).save(hover_path / "before.jpg", "JPEG", quality=75)
-                Image.open(after_img).save(hover_path / "after.jpg", "JPEG", quality=75)
+                (hover_path / "before.jpg").write_bytes(before_jpeg)
+                (hover_path / "after.jpg").write_bytes(after_jpeg)
 
             return {
-                "before_img": before_img,
-                "after_img": after_img,
+                "before_img": BytesIO(before_jpeg),
+                "after_img": BytesIO(after_jpeg),
                 "before_styles": styles_and_screenshot["styles"],
                 "after_styles": after_styles,
                 "scroll_positions": [
@@ -322,6 +346,13 @@ class ElementAnalyzer:
             logger.error(f"Error capturing hover state for element {idx}: {e}")
             return None
     
+    def _capture_page_screenshot(self, driver: WebDriver) -> np.ndarray:
+        """Take a viewport screenshot and decode it to a BGR or BGRA array to crop elements from."""
+        return cv2.imdecode(
+            np.frombuffer(driver.get_screenshot_as_png(), np.uint8),
+            cv2.IMREAD_UNCHANGED
+        )
+
     @error_handler
     def capture_viewport_data(
         self,
@@ -329,8 +360,22 @@ class ElementAnalyzer:
         element: dict,
         idx: int,
         detect_hover: bool = False,
+        page_screenshot: Optional[np.ndarray] = None,
+        capture_info: Optional[dict] = None,
     ) -> Optional[dict]:
-        """Capture all viewport-dependent data for an element."""
+        """
+        Capture all viewport-dependent data for an element.
+
+        Args:
+            driver: WebDriver instance
+            element: Element to capture
+            idx: Index of the element, used in logs and debug filenames
+            detect_hover: Whether to capture the element's hover state
+            page_screenshot: Decoded viewport screenshot to crop from, shared
+                             between elements; taken here if not given
+            capture_info: The element's entry from js.get_elements_capture_info;
+                          fetched on its own if not given
+        """
         try:
             logger.info(f"\nCapturing data for element {idx}:")
             logger.info(f"Tag: {element['tag']}")
@@ -348,21 +393,11 @@ class ElementAnalyzer:
                 "hover_data": None,
             }
 
-            # Only skip screenshot for elements with clear text content
-            should_capture_screenshot = (
-                not element["text"]  # No text
-                or element["tag"].lower()
-                in {"img", "svg", "canvas"}  # Visual elements
-                or "background-image"
-                in element.get("style", "")  # Has background image
-                or len(element["text"])
-                < 3  # Very short text (might be truncated)
-            )
-
-            if should_capture_screenshot:
-                page_screenshot = driver.get_screenshot_as_png()
+            if self._should_capture_screenshot(element):
+                if page_screenshot is None:
+                    page_screenshot = self._capture_page_screenshot(driver)
                 screenshot = self.save_element_screenshot(
-                    driver, element, idx, page_screenshot
+                    driver, element, idx, page_screenshot, capture_info
                 )
                 if screenshot:
                     data["screenshot"] = screenshot
@@ -385,6 +420,40 @@ class ElementAnalyzer:
             )
             return None
     
+    def clear_caches(self) -> None:
+        """Drop results cached for the current page, before analyzing a different one."""
+        self._element_cache.clear()
+        with self._hover_result_lock:
+            self._hover_result_cache.clear()
+
+    def close(self) -> None:
+        """Close the vision client's connection pools."""
+        self.vision_client.close()
+
+    @staticmethod
+    def _compile_hover_criteria(
+        hover_criteria: list[dict]
+    ) -> list[tuple[Optional[str], Optional[str], Optional[str], Optional[str]]]:
+        """
+        Reduce hover criteria dicts to tuples for _matches_hover_criteria.
+
+        Args:
+            hover_criteria: Dicts with optional 'tag', 'class', 'id' and 'text' keys
+
+        Returns:
+            (tag, class, id, text) per criterion, with the tag lowercased and
+            None for keys the criterion does not specify
+        """
+        return [
+            (
+                criteria["tag"].lower() if "tag" in criteria else None,
+                criteria.get("class"),
+                criteria.get("id"),
+                criteria.get("text")
+            )
+            for criteria in hover_criteria
+        ]
+
     def _create_hover_change(
         self,
         change_regions: list[tuple[int, int, int, int]],
@@ -444,47 +513,101 @@ class ElementAnalyzer:
             self.config.min_height
         )
 
+    def _get_capture_info(
+        self,
+        driver: WebDriver,
+        targets: list[tuple[int, dict]]
+    ) -> dict[int, Optional[dict]]:
+        """
+        Fetch the screenshot capture info of every target that needs a screenshot in one call.
+
+        Args:
+            driver: WebDriver instance
+            targets: (index, element) pairs still to be captured
+
+        Returns:
+            Capture info by element index; None for every index if the batch
+            call failed, so those elements fetch their own
+        """
+        pending = [(idx, element) for idx, element in targets if self._should_capture_screenshot(element)]
+        try:
+            infos = js.get_elements_capture_info(driver, [element["element"] for _, element in pending])
+        except WebDriverException as e:
+            logger.warning(f"Falling back to per-element capture info: {e}")
+            return {idx: None for idx, _ in pending}
+        return {idx: info for (idx, _), info in zip(pending, infos)}
+
     @error_handler
     def _get_element_hash(self, element: dict) -> str:
-        """Generate a unique hash for an element based on its properties."""
-        properties = {
-            "tag": element["tag"],
-            "text": element["text"],
-            "rect": element["rect"],
-            "href": element.get("href", ""),
-            "src": element.get("src", ""),
-            "class": element.get("class", ""),
-            "id": element.get("id", "")
-        }
-        return hashlib.sha256(str(properties).encode()).hexdigest()
+        """
+        Generate a unique hash for an element based on its properties.
+
+        The hash is stored on the element under "_hash" when first computed
+        and reused from there afterwards.
+        """
+        if (element_hash := element.get("_hash")) is not None:
+            return element_hash
+
+        # Fields in a fixed order, separated by a character that does not
+        # occur in page text
+        key = "\0".join((
+            element["tag"],
+            element["text"] or "",
+            str(element["rect"]),
+            str(element.get("href", "")),
+            str(element.get("src", "")),
+            str(element.get("class", "")),
+            str(element.get("id", ""))
+        ))
+        element_hash = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        element["_hash"] = element_hash
+        return element_hash
     
     def _is_valid_region_size(self, width: int, height: int) -> bool:
         """Check if region dimensions are valid for analysis."""
         return 50 <= width <= 16000 and 50 <= height <= 16000
     
+    def _load_hover_result(
+        self,
+        key: tuple[bytes, bytes]
+    ) -> Optional[tuple[tuple[int, int, int, int], ...]]:
+        """Look up the change regions memoized for a pair of hover screenshot digests."""
+        with self._hover_result_lock:
+            if (change_regions := self._hover_result_cache.get(key)) is not None:
+                self._hover_result_cache.move_to_end(key)
+            return change_regions
+
     def _matches_hover_criteria(
         self, 
         element: dict,
-        hover_criteria: list[dict]
+        hover_matchers: list[tuple[Optional[str], Optional[str], Optional[str], Optional[str]]]
     ) -> bool:
-        """Check if an element matches any of the hover detection criteria."""
-        return any(
-            all(
-                (
-                    criteria.get("tag", "").lower() == element["tag"].lower() if "tag" in criteria else True,
-                    criteria.get("class", "") in element.get("class", "") if "class" in criteria else True,
-                    criteria.get("id", "") == element.get("id", "") if "id" in criteria else True,
-                    criteria.get("text", "") in element.get("text", "") if "text" in criteria else True
-                )
-            )
-            for criteria in hover_criteria
-        )
+        """Check if an element matches any of the compiled hover detection criteria."""
+        tag = element["tag"].lower()
+        class_name = element.get("class") or ""
+        element_id = element.get("id", "")
+        text = element.get("text") or ""
+
+        for wanted_tag, wanted_class, wanted_id, wanted_text in hover_matchers:
+            if wanted_tag is not None and wanted_tag != tag:
+                continue
+            if wanted_class is not None and wanted_class not in class_name:
+                continue
+            if wanted_id is not None and wanted_id != element_id:
+                continue
+            if wanted_text is not None and wanted_text not in text:
+                continue
+            return True
+        return False
     
     @error_handler
     def parallel_analyze_elements(self, element_data: list[dict]) -> list[dict]:
         """Analyze captured element data in parallel."""
         analyzed_elements = []
         
+        # Threads cover both phases: the Vision calls wait on the network,
+        # and the decoding and change detection run in OpenCV, which
+        # releases the GIL
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             future_to_data = {
                 executor.submit(self.analyze_element_data, data): data
@@ -504,6 +627,20 @@ class ElementAnalyzer:
                     
         return analyzed_elements
     
+    def prepare_viewport(self, driver: WebDriver) -> Path:
+        """
+        Reset the screenshot directory and save the viewport screenshot.
+
+        Args:
+            driver: WebDriver instance
+
+        Returns:
+            Path: Path to the saved viewport.jpg
+        """
+        self.setup_screenshot_dir()
+        self._save_viewport_screenshot(driver)
+        return Path(self.config.screenshot_dir) / "viewport.jpg"
+
     def _process_elements(
         self,
         driver: WebDriver,
@@ -513,26 +650,48 @@ class ElementAnalyzer:
         """Process all elements with hover detection where specified."""
         processed_elements = []
         element_data = []
+        # One screenshot and one batch of capture info serve every element
+        # until the rendering changes
+        page_screenshot: Optional[np.ndarray] = None
+        capture_info: dict[int, Optional[dict]] = {}
+        hover_matchers = self._compile_hover_criteria(hover_criteria or [])
 
+        targets = []
         for idx, element in enumerate(elements):
-            if not self.should_analyze_element(element):
+            if self.should_analyze_element(element):
+                targets.append((idx, element))
+            else:
                 processed_elements.append(self._apply_cached_data(element))
-                continue
 
+        for position, (idx, element) in enumerate(targets):
             try:
-                should_detect_hover = hover_criteria and self._matches_hover_criteria(
+                should_detect_hover = bool(hover_matchers) and self._matches_hover_criteria(
                     element, 
-                    hover_criteria
+                    hover_matchers
                 )
                 
+                if self._should_capture_screenshot(element):
+                    if page_screenshot is None:
+                        page_screenshot = self._capture_page_screenshot(driver)
+                    if idx not in capture_info:
+                        capture_info = self._get_capture_info(driver, targets[position:])
+
                 data = self.capture_viewport_data(
                     driver, 
                     element, 
                     idx,
-                    detect_hover=should_detect_hover
+                    detect_hover=should_detect_hover,
+                    page_screenshot=page_screenshot,
+                    capture_info=capture_info.get(idx)
                 )
                 if data:
                     element_data.append(data)
+
+                # The element stays hovered afterwards, so later elements
+                # need a fresh screenshot and capture info
+                if should_detect_hover:
+                    page_screenshot = None
+                    capture_info = {}
             except Exception as e:
                 logger.error(f"Error capturing viewport data for element {idx}: {e}")
 
@@ -541,20 +700,37 @@ class ElementAnalyzer:
 
         return processed_elements
     
+    def _remember_hover_result(
+        self,
+        key: tuple[bytes, bytes],
+        change_regions: tuple[tuple[int, int, int, int], ...]
+    ) -> None:
+        """Memoize change regions for a pair of hover screenshot digests, evicting the least recently used."""
+        with self._hover_result_lock:
+            self._hover_result_cache[key] = change_regions
+            self._hover_result_cache.move_to_end(key)
+            while len(self._hover_result_cache) > HOVER_RESULT_MEMO_SIZE:
+                self._hover_result_cache.popitem(last=False)
+
     @error_handler
     def save_element_screenshot(
         self,
         driver: WebDriver,
         element: ClickableElement,
         index: int,
-        page_screenshot: Optional[bytes] = None
+        page_screenshot: Optional[np.ndarray] = None,
+        capture_info: Optional[dict] = None
     ) -> Optional[BytesIO]:
         """Get screenshot of element as BytesIO."""
         web_element = element["element"]
 
         try:
-            rect_info = js.get_element_rect_info(driver, web_element)
-            element_rect = rect_info["rect"]
+            if capture_info is None:
+                capture_info = {
+                    "rect": js.get_element_rect_info(driver, web_element)["rect"],
+                    "scroll_needs": None
+                }
+            element_rect = capture_info["rect"]
 
             if (element_rect["width"] <= 0 or 
                 element_rect["height"] <= 0 or 
@@ -562,45 +738,50 @@ class ElementAnalyzer:
                 element_rect["top"] < 0):
                 return None
 
-            js.scroll_element_into_view(driver, web_element, js.get_scroll_needs(driver, web_element))
+            scroll_needs = capture_info["scroll_needs"] or js.get_scroll_needs(driver, web_element)
+            js.scroll_element_into_view(driver, web_element, scroll_needs)
             time.sleep(0.2)
 
-            screenshot_data = page_screenshot or driver.get_screenshot_as_png()
-            screenshot = Image.open(BytesIO(screenshot_data))
+            screenshot = (
+                page_screenshot if page_screenshot is not None
+                else self._capture_page_screenshot(driver)
+            )
 
             # Process screenshot
-            pixel_ratio = rect_info["devicePixelRatio"]
+            pixel_ratio = js.get_device_pixel_ratio(driver)
             left = max(0, int(element_rect["left"] * pixel_ratio))
             top = max(0, int(element_rect["top"] * pixel_ratio))
             width = int(element_rect["width"] * pixel_ratio)
             height = int(element_rect["height"] * pixel_ratio)
 
-            img_width, img_height = screenshot.size
+            img_height, img_width = screenshot.shape[:2]
             right = min(img_width, left + width)
             bottom = min(img_height, top + height)
 
             if right <= left or bottom <= top:
                 return None
 
-            cropped = screenshot.crop((left, top, right, bottom))
+            # A view into the screenshot, so nothing is copied until encoding
+            cropped = screenshot[top:bottom, left:right]
 
-            # Convert to RGB
-            if cropped.mode in ('RGBA', 'LA'):
-                background = Image.new('RGB', cropped.size, (255, 255, 255))
-                background.paste(cropped, mask=cropped.split()[-1])
-                cropped = background
+            # Composite any transparency onto white
+            if cropped.ndim == 3 and cropped.shape[2] == 4:
+                alpha = cropped[..., 3:4].astype(np.uint16)
+                cropped = (
+                    (cropped[..., :3] * alpha + 255 * (255 - alpha)) // 255
+                ).astype(np.uint8)
 
-            # Save to BytesIO
-            img_io = BytesIO()
-            cropped.save(img_io, 'JPEG', quality=85)
-            img_io.seek(0)
+            encoded, jpeg = cv2.imencode(".jpg", cropped, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            if not encoded:
+                return None
+            img_io = BytesIO(jpeg)
 
             # Optionally save to file in debug mode
             if self.debug:
                 filename = f"{index:03d}_{element['tag'].lower()}_{(element['text'] or '')[:30]}.jpg"
-                filename = "".join(c for c in filename if c.isalnum() or c in ('_', '-', '.')).rstrip('.')
+                filename = sanitize_filename(filename)
                 filepath = Path(self.config.screenshot_dir) / filename
-                cropped.save(filepath, 'JPEG', quality=85)
+                filepath.write_bytes(jpeg)
 
             return img_io
 
@@ -611,21 +792,27 @@ class ElementAnalyzer:
     def _save_viewport_screenshot(self, driver: WebDriver) -> None:
         """Save the initial viewport screenshot as JPEG for better performance."""
         viewport_path = Path(self.config.screenshot_dir) / "viewport.jpg"
-        screenshot = Image.open(BytesIO(driver.get_screenshot_as_png()))
-        
-        # Convert to RGB if needed (JPEG doesn't support RGBA)
-        if screenshot.mode in ("RGBA", "LA"):
-            background = Image.new("RGB", screenshot.size, (255, 255, 255))
-            background.paste(screenshot, mask=screenshot.split()[-1])
-            screenshot = background
-            
-        screenshot.save(viewport_path, "JPEG", quality=85)
+        # The browser encodes the JPEG, so there is no PNG to decode and
+        # re-encode here; JPEG output is always opaque
+        viewport_path.write_bytes(capture_jpeg_screenshot(driver, quality=85))
 
     def setup_screenshot_dir(self) -> None:
-        """Setup screenshot directory."""
-        if os.path.exists(self.config.screenshot_dir):
-            shutil.rmtree(self.config.screenshot_dir)
-        os.makedirs(self.config.screenshot_dir, exist_ok=True)
+        """
+        Setup screenshot directory.
+
+        An existing directory is renamed aside and deleted in the background,
+        so analysis does not wait for its screenshots to be removed.
+        """
+        screenshot_dir = self.config.screenshot_dir
+        if os.path.exists(screenshot_dir):
+            stale_dir = f"{screenshot_dir}.old-{os.getpid()}-{time.time_ns()}"
+            try:
+                os.rename(screenshot_dir, stale_dir)
+            except OSError:
+                shutil.rmtree(screenshot_dir)
+            else:
+                _cleanup_executor.submit(shutil.rmtree, stale_dir, ignore_errors=True)
+        os.makedirs(screenshot_dir, exist_ok=True)
     
     @error_handler
     def should_analyze_element(self, element: dict) -> bool:
@@ -650,4 +837,16 @@ class ElementAnalyzer:
             element.update(self._element_cache[element_hash])
             return False
             
-        return True
\ No newline at end of file
+        return True
+
+    def _should_capture_screenshot(self, element: dict) -> bool:
+        """Check if an element needs a screenshot; only elements with clear text content skip it."""
+        return (
+            not element["text"]  # No text
+            or element["tag"].lower()
+            in {"img", "svg", "canvas"}  # Visual elements
+            or "background-image"
+            in element.get("style", "")  # Has background image
+            or len(element["text"])
+            < 3  # Very short text (might be truncated)
+        )
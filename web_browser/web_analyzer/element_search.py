@@ -1,10 +1,12 @@
 import logging
 from typing import Optional, Union
 
+import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 
+from web_browser.web_analyzer.elements.bounding_box import BoundingBox
 from web_browser.web_analyzer.elements.unified_element import UnifiedElement
 from web_browser.web_analyzer.types import PageRegion, RegionBounds
 
@@ -12,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 class ElementSearchSystem:
     def __init__(self):
+        # Bounding boxes of the indexed elements, in _ids order
+        self._boxes: Optional[np.ndarray] = None
         self._element_lookup: dict[str, UnifiedElement] = {}
         self._embeddings: Optional[torch.Tensor] = None
         self._ids: list[str] = []
@@ -98,6 +102,10 @@ class ElementSearchSystem:
             id_: elem for id_, elem in zip(self._ids, elements)
         }
 
+        self._boxes = BoundingBox.stack(
+            [elem.bounding_box for elem in elements]
+        )
+
         contents = [self._create_embedding_text(elem) for elem in elements]
 
         # Ensure L2 normalization for more stable similarity scores
@@ -112,6 +120,7 @@ class ElementSearchSystem:
         """
         Explicitly invalidate the current index, forcing a reindex on next use.
         """
+        self._boxes = None
         self._embeddings = None
         self._element_lookup.clear()
         self._ids.clear()
@@ -211,67 +220,48 @@ class ElementSearchSystem:
         Returns:
             List of UnifiedElements that fall within the specified region
         """
-        if not self._element_lookup:
+        if not self._element_lookup or self._boxes is None:
             return []
 
         # Get page dimensions from first element's bounding box
         # Assuming the first element has valid bounds
-        first_elem = next(iter(self._element_lookup.values()))
-        if not first_elem.bounding_box:
+        left, top, right, bottom, width, height = self._boxes.T
+        if np.isnan(left[0]):
             return []
 
         # Find maximum bounds from all elements to determine page size
-        page_width = max(
-            elem.bounding_box.right
-            for elem in self._element_lookup.values()
-            if elem.bounding_box
-        )
-        page_height = max(
-            elem.bounding_box.bottom
-            for elem in self._element_lookup.values()
-            if elem.bounding_box
-        )
+        page_width = float(np.nanmax(right))
+        page_height = float(np.nanmax(bottom))
 
         bounds = RegionBounds.from_page_dimensions(
             page_width, page_height, region
         )
 
-        matching_elements = []
-        for element in self._element_lookup.values():
-            if not element.bounding_box:
-                continue
-
-            bb = element.bounding_box
-
-            # Check if element is fully contained within the region
-            is_within_region = (
-                bb.left >= bounds.left
-                and bb.top >= bounds.top
-                and bb.right <= bounds.right
-                and bb.bottom <= bounds.bottom
-            )
-
-            # Or check if element significantly overlaps with the region
-            if not is_within_region:
-                overlap_left = max(bounds.left, bb.left)
-                overlap_top = max(bounds.top, bb.top)
-                overlap_right = min(bounds.right, bb.right)
-                overlap_bottom = min(bounds.bottom, bb.bottom)
-
-                if (
-                    overlap_left < overlap_right
-                    and overlap_top < overlap_bottom
-                ):
-                    overlap_area = (overlap_right - overlap_left) * (
-                        overlap_bottom - overlap_top
-                    )
-                    element_area = bb.width * bb.height
+        # Check if elements are fully contained within the region
+        is_within_region = (
+            (left >= bounds.left)
+            & (top >= bounds.top)
+            & (right <= bounds.right)
+            & (bottom <= bounds.bottom)
+        )
 
-                    # Consider elements with >50% overlap
-                    is_within_region = overlap_area > (element_area * 0.5)
+        # Or check if elements significantly overlap with the region
+        overlap_width = np.minimum(bounds.right, right) - np.maximum(
+            bounds.left, left
+        )
+        overlap_height = np.minimum(bounds.bottom, bottom) - np.maximum(
+            bounds.top, top
+        )
+        # Consider elements with >50% overlap
+        is_overlapping = (
+            (overlap_width > 0)
+            & (overlap_height > 0)
+            & (overlap_width * overlap_height > width * height * 0.5)
+        )
 
-            if is_within_region:
-                matching_elements.append(element)
+        # NaN rows (elements without a bounding box) fail every comparison
+        matches = np.flatnonzero(is_within_region | is_overlapping)
 
         # Sort elements by their vertical position (top to bottom)
-        return sorted(matching_elements, key=lambda e: e.bounding_box.top)
+        order = matches[np.argsort(top[matches], kind="stable")]
+        return [self._element_lookup[self._ids[i]] for i in order]
@@ -4,12 +4,14 @@ Module for handling element bounding boxes and geometric operations.
 
 from dataclasses import dataclass
 from io import BytesIO
+from typing import Optional
 
+import numpy as np
 from PIL import Image
 from selenium.webdriver.remote.webdriver import WebDriver
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BoundingBox:
     """
     Represents a geometric bounding box for web elements with conversion
@@ -54,6 +56,31 @@ class BoundingBox:
         smaller_area = min(self_area, other_area)
         
         return intersection_area / smaller_area if smaller_area > 0 else 0.0
+
+    def calculate_overlaps(self, others: np.ndarray) -> np.ndarray:
+        """
+        Calculate overlap ratios against many bounding boxes at once.
+
+        Matches calculate_overlap for each row, without a Python-level loop.
+
+        Args:
+            others: Array of shape (N, 6) as produced by BoundingBox.stack
+
+        Returns:
+            Array of N overlap ratios between 0 and 1 (NaN for missing boxes)
+        """
+        left, top, right, bottom, width, height = others.T
+
+        intersection_width = np.minimum(self.right, right) - np.maximum(self.left, left)
+        intersection_height = np.minimum(self.bottom, bottom) - np.maximum(self.top, top)
+        smaller_area = np.minimum(self.width * self.height, width * height)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            overlaps = (intersection_width * intersection_height) / smaller_area
+        overlaps[
+            (intersection_width <= 0) | (intersection_height <= 0) | (smaller_area <= 0)
+        ] = 0.0
+        return overlaps
     
     @classmethod
     def from_dom_position(cls, position: dict) -> "BoundingBox":
@@ -66,10 +93,10 @@ class BoundingBox:
         Returns:
             BoundingBox instance
         """
-        x = float(position.get("x", 0))
-        y = float(position.get("y", 0))
-        width = float(position.get("width", 0))
-        height = float(position.get("height", 0))
+        x = float(position["x"])
+        y = float(position["y"])
+        width = float(position["width"])
+        height = float(position["height"])
         
         return cls(
             left=x,
@@ -81,12 +108,24 @@ class BoundingBox:
         )
     
     @classmethod
-    def from_polygon(cls, polygon: list[float], driver: WebDriver) -> "BoundingBox":
+    def from_edges(cls, left: float, top: float, right: float, bottom: float) -> "BoundingBox":
+        """Create a BoundingBox from its edge coordinates."""
+        return cls(
+            left=left,
+            top=top,
+            right=right,
+            bottom=bottom,
+            width=right - left,
+            height=bottom - top
+        )
+
+    @classmethod
+    def from_polygon(cls, polygon: np.ndarray, driver: WebDriver) -> "BoundingBox":
         """
         Create a BoundingBox from OCR polygon points.
         
         Args:
-            polygon: List of x,y coordinates forming polygon vertices
+            polygon: Polygon vertices, as an (N, 2) array or flat x,y coordinates
             driver: WebDriver instance for scaling calculations
             
         Returns:
@@ -95,26 +134,20 @@ class BoundingBox:
         Raises:
             ValueError: If polygon has fewer than 4 points
         """
-        if len(polygon) < 8:
+        points = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 4:
             raise ValueError("Polygon must have at least 4 points (8 coordinates)")
         
-        scale_x, scale_y = cls._get_scale_factors(driver)
-        
-        x_coords = [x / scale_x for x in polygon[::2]]
-        y_coords = [y / scale_y for y in polygon[1::2]]
+        scale_x, scale_y = cls.get_scale_factors(driver)
         
-        left = min(x_coords)
-        top = min(y_coords)
-        right = max(x_coords)
-        bottom = max(y_coords)
+        left, top = points.min(axis=0)
+        right, bottom = points.max(axis=0)
         
-        return cls(
-            left=left,
-            top=top,
-            right=right,
-            bottom=bottom,
-            width=right - left,
-            height=bottom - top
+        return cls.from_edges(
+            float(left / scale_x),
+            float(top / scale_y),
+            float(right / scale_x),
+            float(bottom / scale_y)
         )
     
     @classmethod
@@ -143,7 +176,7 @@ class BoundingBox:
         )
     
     @staticmethod
-    def _get_scale_factors(driver: WebDriver) -> tuple[float, float]:
+    def get_scale_factors(driver: WebDriver) -> tuple[float, float]:
         """
         Calculate scale factors between screenshot and viewport dimensions.
         
@@ -204,4 +237,49 @@ class BoundingBox:
             bottom=bottom,
             width=right - left,
             height=bottom - top
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def overlap_matrix(boxes: np.ndarray, others: np.ndarray) -> np.ndarray:
+        """
+        Calculate overlap ratios between every pair of two sets of bounding boxes.
+
+        Broadcasting counterpart of calculate_overlaps, with the same metric.
+
+        Args:
+            boxes: Array of shape (N, 6) as produced by BoundingBox.stack
+            others: Array of shape (M, 6) as produced by BoundingBox.stack
+
+        Returns:
+            Array of shape (N, M) of overlap ratios (NaN where either box is missing)
+        """
+        a = boxes[:, None, :]
+        b = others[None, :, :]
+
+        intersection_width = np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0])
+        intersection_height = np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1])
+        smaller_area = np.minimum(a[..., 4] * a[..., 5], b[..., 4] * b[..., 5])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            overlaps = (intersection_width * intersection_height) / smaller_area
+        overlaps[
+            (intersection_width <= 0) | (intersection_height <= 0) | (smaller_area <= 0)
+        ] = 0.0
+        return overlaps
+
+    @staticmethod
+    def stack(boxes: list[Optional["BoundingBox"]]) -> np.ndarray:
+        """
+        Pack bounding boxes into a float64 array for vectorised comparisons.
+
+        Args:
+            boxes: Bounding boxes to pack; None entries become rows of NaN
+
+        Returns:
+            Array of shape (N, 6) with left, top, right, bottom, width, height
+        """
+        packed = np.full((len(boxes), 6), np.nan, dtype=np.float64)
+        for i, box in enumerate(boxes):
+            if box:
+                packed[i] = (box.left, box.top, box.right, box.bottom, box.width, box.height)
+        return packed
@@ -8,7 +8,7 @@ from typing import Optional
 from web_browser.web_analyzer.elements.bounding_box import BoundingBox
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LinkRegion:
     """
     Represents a clickable link region within text content.
@@ -5,8 +5,12 @@ Element merging functionality for combining OCR and DOM elements.
 from collections import defaultdict
 from typing import Any, Optional
 
+import numpy as np
 from selenium.webdriver.chrome.webdriver import WebDriver
 
+from web_browser.document_intelligence.models import OCRElementBatch
+from web_browser.dom.models import DOMNode, DOMTree
+from web_browser.web_analyzer.elements.bounding_box import BoundingBox
 from web_browser.web_analyzer.elements.link_region import LinkRegion
 from web_browser.web_analyzer.elements.unified_element import UnifiedElement
 from web_browser.web_analyzer.utils.text import should_merge_text_fragments
@@ -48,37 +52,30 @@ class ElementMerger:
         return paragraph_links
     
     def _extract_dom_elements(
-        self, dom_tree: dict[str, Any], paragraph_links: dict[str, list[UnifiedElement]]
+        self, dom_tree: DOMTree, paragraph_links: dict[str, list[UnifiedElement]]
     ) -> list[UnifiedElement]:
         """Extract DOM elements with their properties."""
         dom_elements: list[UnifiedElement] = []
         
-        def collect_dom_elements(node: dict[str, Any]) -> None:
-            if not node or not isinstance(node, dict):
-                return
-                
-            props = node.get("properties")
-            if props and props.get("position"):
-                element = UnifiedElement.from_dom_node(node)
-                if element and element.bounding_box:
-                    if (element.tag.lower() == "p" and 
-                        element.selector in paragraph_links):
-                        element.link_regions = [
-                            LinkRegion(
-                                text=link.dom_text or link.content or "",
-                                href=link.href or "",
-                                selector=link.selector,
-                                bounding_box=link.bounding_box
-                            ) for link in paragraph_links[element.selector]
-                            if link.bounding_box
-                        ]
-                    dom_elements.append(element)
+        def collect_dom_elements(node: DOMNode) -> None:
+            element = UnifiedElement.from_dom_node(node)
+            if element.tag == "p" and element.selector in paragraph_links:
+                element.link_regions = [
+                    LinkRegion(
+                        text=link.dom_text or link.content or "",
+                        href=link.href or "",
+                        selector=link.selector,
+                        bounding_box=link.bounding_box
+                    ) for link in paragraph_links[element.selector]
+                    if link.bounding_box
+                ]
+            dom_elements.append(element)
                     
-            for child in node.get("children", []):
+            for child in node["children"]:
                 collect_dom_elements(child)
         
         try:
-            for child in dom_tree.get("children", []):
+            for child in dom_tree["children"]:
                 collect_dom_elements(child)
         except Exception as e:
             print(f"Error collecting DOM elements: {e}")
@@ -86,36 +83,64 @@ class ElementMerger:
         return dom_elements
     
     def _find_matching_dom_element(
-        self, element: UnifiedElement, dom_elements: list[UnifiedElement]
+        self,
+        element: UnifiedElement,
+        dom_elements: list[UnifiedElement],
+        dom_boxes: Optional[np.ndarray] = None,
+        overlaps: Optional[np.ndarray] = None
     ) -> Optional[UnifiedElement]:
         """Find best matching DOM element."""
         if not element or not element.bounding_box:
             return None
-            
-        best_match = None
-        best_overlap = self.overlap_threshold
-        
-        for dom_elem in dom_elements:
-            if not dom_elem or not dom_elem.bounding_box:
-                continue
-                
-            overlap = element.bounding_box.calculate_overlap(dom_elem.bounding_box)
-            if overlap <= best_overlap:
-                continue
 
-            if element.element_type == "ocr":
+        if overlaps is None:
+            if dom_boxes is None:
+                dom_boxes = self._stack_dom_boxes(dom_elements)
+            overlaps = element.bounding_box.calculate_overlaps(dom_boxes)
+        candidates = np.flatnonzero(overlaps > self.overlap_threshold)
+        if not candidates.size:
+            return None
+
+        # Highest overlap first, earliest element first on ties
+        order = candidates[np.argsort(-overlaps[candidates], kind="stable")]
+
+        if element.element_type == "ocr":
+            ocr_text = (element.content or "").strip().lower()
+            for index in order:
+                dom_elem = dom_elements[index]
                 dom_text = (dom_elem.content or dom_elem.dom_text or "").strip().lower()
-                ocr_text = (element.content or "").strip().lower()
-                
                 if dom_text and (dom_text in ocr_text or ocr_text in dom_text):
-                    best_overlap = overlap
-                    best_match = dom_elem
-            elif element.tag.lower() == dom_elem.tag.lower():
-                best_overlap = overlap
-                best_match = dom_elem
-                    
-        return best_match
+                    return dom_elem
+        else:
+            tag = element.tag.lower()
+            for index in order:
+                dom_elem = dom_elements[index]
+                if tag == dom_elem.tag.lower():
+                    return dom_elem
+
+        return None
     
+    def _match_dom_elements(
+        self,
+        elements: list[UnifiedElement],
+        dom_elements: list[UnifiedElement],
+        dom_boxes: np.ndarray
+    ) -> None:
+        """Add link regions to elements and copy properties from their DOM matches."""
+        overlaps = BoundingBox.overlap_matrix(
+            BoundingBox.stack([element.bounding_box for element in elements]),
+            dom_boxes
+        )
+
+        for element, element_overlaps in zip(elements, overlaps):
+            element.process_link_regions(element.content, dom_elements)
+
+            dom_match = self._find_matching_dom_element(
+                element, dom_elements, overlaps=element_overlaps
+            )
+            if dom_match:
+                element.copy_dom_properties(dom_match)
+
     def merge_elements(
         self,
         ocr_elements: list[Any],
@@ -146,15 +171,16 @@ class ElementMerger:
         
         # Extract DOM elements
         dom_elements = self._extract_dom_elements(dom_tree, paragraph_links)
+        dom_boxes = self._stack_dom_boxes(dom_elements)
         
         # Process clickable elements
         unified_elements.extend(
-            self._process_clickable_elements(clickable_elements, dom_elements)
+            self._process_clickable_elements(clickable_elements, dom_elements, dom_boxes)
         )
         
         # Process OCR elements
         unified_elements.extend(
-            self._process_ocr_elements(ocr_elements, dom_elements, driver)
+            self._process_ocr_elements(ocr_elements, dom_elements, driver, dom_boxes)
         )
         
         # Final merging of text fragments
@@ -208,7 +234,10 @@ class ElementMerger:
         return final_elements
     
     def _process_clickable_elements(
-        self, clickable_elements: list[Any], dom_elements: list[UnifiedElement]
+        self,
+        clickable_elements: list[Any],
+        dom_elements: list[UnifiedElement],
+        dom_boxes: Optional[np.ndarray] = None
     ) -> list[UnifiedElement]:
         """Process and merge clickable elements."""
         unified_elements = []
@@ -220,30 +249,42 @@ class ElementMerger:
             element = UnifiedElement.from_clickable_element(clickable)
             if not element:
                 continue
-
-            element.process_link_regions(element.content, dom_elements)
-            
-            dom_match = self._find_matching_dom_element(element, dom_elements)
-            if dom_match:
-                element.copy_dom_properties(dom_match)
             
             unified_elements.append(element)
+
+        if dom_boxes is None:
+            dom_boxes = self._stack_dom_boxes(dom_elements)
+        self._match_dom_elements(unified_elements, dom_elements, dom_boxes)
             
         return unified_elements
     
     def _process_ocr_elements(
-        self, ocr_elements: list[Any], dom_elements: list[UnifiedElement], driver: WebDriver
+        self,
+        ocr_elements: list[Any],
+        dom_elements: list[UnifiedElement],
+        driver: WebDriver,
+        dom_boxes: Optional[np.ndarray] = None
     ) -> list[UnifiedElement]:
         """Process and merge OCR elements."""
+        lines = [ocr for ocr in ocr_elements if ocr]
+        if not lines:
+            return []
+
+        # Scale every polygon at once instead of querying the viewport per line
+        batch = OCRElementBatch.from_lines(lines)
+        boxes = batch.scaled_boxes(*BoundingBox.get_scale_factors(driver))
+        candidates = [
+            UnifiedElement.from_ocr_element(
+                line, driver, BoundingBox.from_edges(*map(float, box))
+            )
+            for line, box in zip(batch.lines, boxes)
+        ]
+
         unified_elements = []
         processed_indices = set()
         
-        for i, ocr in enumerate(ocr_elements):
-            if i in processed_indices or not ocr:
-                continue
-                
-            element = UnifiedElement.from_ocr_element(ocr, driver)
-            if not element:
+        for i, element in enumerate(candidates):
+            if i in processed_indices:
                 continue
 
             # Look for vertically adjacent elements to merge
@@ -251,14 +292,10 @@ class ElementMerger:
             merged_words = element.words.copy() if element.words else []
             
             # Check subsequent elements for vertical merging
-            for j, next_ocr in enumerate(ocr_elements[i + 1:], start=i + 1):
+            for j, next_element in enumerate(candidates[i + 1:], start=i + 1):
                 if j in processed_indices:
                     continue
                     
-                next_element = UnifiedElement.from_ocr_element(next_ocr, driver)
-                if not next_element:
-                    continue
-                    
                 if should_merge_text_fragments(element, next_element):
                     if next_element.content:
                         merged_content.append(next_element.content)
@@ -277,13 +314,18 @@ class ElementMerger:
                 element.content = " ".join(merged_content)
                 element.words = merged_words
             
-            element.process_link_regions(element.content, dom_elements)
-            
-            dom_match = self._find_matching_dom_element(element, dom_elements)
-            if dom_match:
-                element.copy_dom_properties(dom_match)
-            
             unified_elements.append(element)
             processed_indices.add(i)
+
+        if dom_boxes is None:
+            dom_boxes = self._stack_dom_boxes(dom_elements)
+        self._match_dom_elements(unified_elements, dom_elements, dom_boxes)
             
-        return unified_elements
\ No newline at end of file
+        return unified_elements
+
+    @staticmethod
+    def _stack_dom_boxes(dom_elements: list[UnifiedElement]) -> np.ndarray:
+        """Pack the bounding boxes of DOM elements for vectorised matching."""
+        return BoundingBox.stack(
+            [dom_elem.bounding_box if dom_elem else None for dom_elem in dom_elements]
+        )
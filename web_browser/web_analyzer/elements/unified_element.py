@@ -11,14 +11,16 @@ from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
 from web_browser.document_intelligence.models import OCRLine
+from web_browser.dom.models import DOMNode
 from web_browser.web_analyzer.elements.bounding_box import BoundingBox
 from web_browser.web_analyzer.elements.link_region import (
     LinkRegion, deduplicate_link_regions, extract_link_regions)
 from web_browser.web_analyzer.types import HoverChange
-from web_browser.web_analyzer.utils.text import normalize_text
+from web_browser.web_analyzer.utils.text import (normalize_text,
+                                                 sanitize_filename)
 
 
-@dataclass
+@dataclass(slots=True)
 class UnifiedElement:
     """
     Unified representation of both OCR and clickable elements.
@@ -205,7 +207,7 @@ class UnifiedElement:
     def from_clickable_element(cls, clickable: dict) -> "UnifiedElement":
         """Create UnifiedElement from ClickableElement."""
         base_filename = f"{clickable.get('index', 0):03d}_{clickable['tag'].lower()}_{(clickable['text'] or '')[:30]}"
-        base_filename = "".join(c for c in base_filename if c.isalnum() or c in ("_", "-", ".")).rstrip(".")
+        base_filename = sanitize_filename(base_filename)
         
         screenshots = []
         for suffix in ["", "_hover_changes"]:
@@ -227,26 +229,27 @@ class UnifiedElement:
         )
     
     @classmethod
-    def from_dom_node(cls, node: dict) -> "UnifiedElement":
+    def from_dom_node(cls, node: DOMNode) -> "UnifiedElement":
         """Create UnifiedElement from DOM node."""
-        properties: dict[str, Any] = node.get("properties", {})
-        bounding_box = BoundingBox.from_dom_position(properties.get("position", {}))
+        # Nodes come from DOMTreeBuilder, which always fills every property
+        properties = node["properties"]
+        text = properties["text"]
         
         element = cls(
-            bounding_box=bounding_box,
-            content=properties.get("text", ""),
-            dom_text=properties.get("text", ""),
+            bounding_box=BoundingBox.from_dom_position(properties["position"]),
+            content=text,
+            dom_text=text,
             element_type="dom",
-            tag=properties.get("tagName", "").lower(),
-            href=properties.get("href"),
-            src=properties.get("src"),
-            selector=properties.get("selector"),
-            visibility=properties.get("visibility", {}),
+            tag=properties["tagName"].lower(),
+            href=properties["href"],
+            src=properties["src"],
+            selector=properties["selector"],
+            visibility=properties["visibility"],
             confidence=1.0,
             children=[]
         )
         
-        for child in node.get("children", []):
+        for child in node["children"]:
             child_element = cls.from_dom_node(child)
             if child_element:
                 element.children.append(child_element)
@@ -254,20 +257,27 @@ class UnifiedElement:
         return element
     
     @classmethod
-    def from_ocr_element(cls, ocr: OCRLine, driver: WebDriver) -> "UnifiedElement":
+    def from_ocr_element(
+        cls,
+        ocr: OCRLine,
+        driver: WebDriver,
+        bounding_box: Optional[BoundingBox] = None
+    ) -> "UnifiedElement":
         """
         Create UnifiedElement from OCRLine.
         
         Args:
             ocr: OCRLine instance
             driver: WebDriver instance for scaling calculations
+            bounding_box: Precomputed viewport bounds; derived from the
+                polygon via the driver when omitted
             
         Returns:
             UnifiedElement instance
         """
         return cls(
             content=ocr.content,
-            bounding_box=BoundingBox.from_polygon(ocr.polygon, driver),
+            bounding_box=bounding_box or BoundingBox.from_polygon(ocr.polygon, driver),
             confidence=ocr.confidence,
             element_type="ocr",
             ocr_text=ocr.content,
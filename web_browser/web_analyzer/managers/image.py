@@ -13,9 +13,15 @@ class ImageProcessor:
         min_area: int = 500,
         min_dimension: int = 20
     ) -> list[tuple[int, int, int, int]]:
-        """Detect regions of change between two images."""
-        before_gray = cv2.cvtColor(before_img, cv2.COLOR_RGB2GRAY)
-        after_gray = cv2.cvtColor(after_img, cv2.COLOR_RGB2GRAY)
+        """Detect regions of change between two RGB or grayscale images."""
+        before_gray = (
+            before_img if before_img.ndim == 2
+            else cv2.cvtColor(before_img, cv2.COLOR_RGB2GRAY)
+        )
+        after_gray = (
+            after_img if after_img.ndim == 2
+            else cv2.cvtColor(after_img, cv2.COLOR_RGB2GRAY)
+        )
         diff = cv2.absdiff(before_gray, after_gray)
         _, thresh = cv2.threshold(diff, 40, 255, cv2.THRESH_BINARY)
         kernel = np.ones((5,5), np.uint8)
@@ -2,11 +2,59 @@
 JavaScript utility functions for web element analysis.
 """
 
-from typing import Any
+from typing import Any, Optional
 
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
+# Device pixel ratio per WebDriver session, refreshed by init on every page load
+_device_pixel_ratios: dict[str, float] = {}
+
+# Shared by get_scroll_needs and get_elements_capture_info
+_SCROLL_NEEDS_FUNCTION = """
+        function getScrollNeeds(element) {
+            const rect = element.getBoundingClientRect();
+            const viewWidth = Math.max(document.documentElement.clientWidth, window.innerWidth);
+            const viewHeight = Math.max(document.documentElement.clientHeight, window.innerHeight);
+            
+            const needsHorizontal = rect.left < 0 || rect.right > viewWidth;
+            const needsVertical = rect.top < 0 || rect.bottom > viewHeight;
+            
+            let horizontalParent = null;
+            let verticalParent = null;
+            let parent = element.parentElement;
+            
+            while (parent) {
+                const style = window.getComputedStyle(parent);
+                const hasHorizontalScroll = parent.scrollWidth > parent.clientWidth;
+                const hasVerticalScroll = parent.scrollHeight > parent.clientHeight;
+                const canScrollHorizontal = ['auto', 'scroll'].includes(style.overflowX);
+                const canScrollVertical = ['auto', 'scroll'].includes(style.overflowY);
+                
+                if (!horizontalParent && hasHorizontalScroll && canScrollHorizontal) {
+                    horizontalParent = parent;
+                }
+                if (!verticalParent && hasVerticalScroll && canScrollVertical) {
+                    verticalParent = parent;
+                }
+                if (horizontalParent && verticalParent) break;
+                parent = parent.parentElement;
+            }
+            
+            return {
+                needs: {
+                    horizontal: needsHorizontal,
+                    vertical: needsVertical
+                },
+                parents: {
+                    horizontal: horizontalParent,
+                    vertical: verticalParent
+                },
+                elementRect: rect
+            };
+        }
+"""
+
 
 def disable_smooth_scrolling(driver: WebDriver) -> None:
     """Disable smooth scrolling behavior."""
@@ -164,8 +212,20 @@ def get_element_positions(driver: WebDriver, elements: list[dict]) -> list[dict]
     )
 
 
+def get_device_pixel_ratio(driver: WebDriver) -> float:
+    """Get the device pixel ratio recorded by init, querying the page only if init has not run."""
+    if not driver:
+        raise ValueError("Driver is not initialized")
+
+    ratio = _device_pixel_ratios.get(driver.session_id)
+    if ratio is None:
+        ratio = float(driver.execute_script("return window.devicePixelRatio || 1"))
+        _device_pixel_ratios[driver.session_id] = ratio
+    return ratio
+
+
 def get_element_rect_info(driver: WebDriver, element: WebElement) -> dict[str, Any]:
-    """Get element's rectangle info with device pixel ratio."""
+    """Get element's rectangle info in page coordinates."""
     if not driver:
         raise ValueError("Driver is not initialized")
     
@@ -177,12 +237,85 @@ def get_element_rect_info(driver: WebDriver, element: WebElement) -> dict[str, A
                 left: rect.left + window.scrollX,
                 width: rect.width,
                 height: rect.height
-            },
-            devicePixelRatio: window.devicePixelRatio || 1
+            }
         };
     """, element)
 
 
+def get_elements_by_selectors(
+    driver: WebDriver,
+    selectors: list[str],
+    points: Optional[list[Optional[tuple[float, float]]]] = None
+) -> list[dict]:
+    """
+    Resolve CSS selectors to elements and their viewport rectangles in one call.
+
+    When a selector matches nothing, the element under the matching viewport
+    point (if given) is used instead.
+    """
+    if not driver:
+        raise ValueError("Driver is not initialized")
+
+    return driver.execute_script("""
+        const points = arguments[1] || [];
+        return arguments[0].map((selector, i) => {
+            let element = null;
+            try {
+                element = document.querySelector(selector);
+            } catch (e) {
+                element = null;
+            }
+            if (!element && points[i]) {
+                element = document.elementFromPoint(points[i][0], points[i][1]);
+            }
+            if (!element) {
+                return null;
+            }
+            const rect = element.getBoundingClientRect();
+            return {
+                element: element,
+                rect: {
+                    left: rect.left,
+                    top: rect.top,
+                    width: rect.width,
+                    height: rect.height
+                }
+            };
+        });
+    """, selectors, points)
+
+
+def get_elements_capture_info(driver: WebDriver, elements: list[WebElement]) -> list[dict[str, Any]]:
+    """
+    Get what save_element_screenshot needs for several elements in one call.
+
+    Args:
+        driver: WebDriver instance
+        elements: Elements to inspect
+
+    Returns:
+        Per element, in order, a dict with the 'rect' from get_element_rect_info
+        and the 'scroll_needs' from get_scroll_needs
+    """
+    if not driver:
+        raise ValueError("Driver is not initialized")
+
+    return driver.execute_script(_SCROLL_NEEDS_FUNCTION + """
+        return arguments[0].map(element => {
+            const rect = element.getBoundingClientRect();
+            return {
+                rect: {
+                    top: rect.top + window.scrollY,
+                    left: rect.left + window.scrollX,
+                    width: rect.width,
+                    height: rect.height
+                },
+                scroll_needs: getScrollNeeds(element)
+            };
+        });
+    """, elements)
+
+
 def get_mouse_position(driver: WebDriver) -> tuple[int, int]:
     """Get the current mouse position relative to the viewport."""
     if not driver:
@@ -235,48 +368,7 @@ def get_scroll_needs(driver: WebDriver, element: WebElement) -> dict[str, Any]:
     if not driver:
         raise ValueError("Driver is not initialized")
     
-    return driver.execute_script("""
-        function getScrollNeeds(element) {
-            const rect = element.getBoundingClientRect();
-            const viewWidth = Math.max(document.documentElement.clientWidth, window.innerWidth);
-            const viewHeight = Math.max(document.documentElement.clientHeight, window.innerHeight);
-            
-            const needsHorizontal = rect.left < 0 || rect.right > viewWidth;
-            const needsVertical = rect.top < 0 || rect.bottom > viewHeight;
-            
-            let horizontalParent = null;
-            let verticalParent = null;
-            let parent = element.parentElement;
-            
-            while (parent) {
-                const style = window.getComputedStyle(parent);
-                const hasHorizontalScroll = parent.scrollWidth > parent.clientWidth;
-                const hasVerticalScroll = parent.scrollHeight > parent.clientHeight;
-                const canScrollHorizontal = ['auto', 'scroll'].includes(style.overflowX);
-                const canScrollVertical = ['auto', 'scroll'].includes(style.overflowY);
-                
-                if (!horizontalParent && hasHorizontalScroll && canScrollHorizontal) {
-                    horizontalParent = parent;
-                }
-                if (!verticalParent && hasVerticalScroll && canScrollVertical) {
-                    verticalParent = parent;
-                }
-                if (horizontalParent && verticalParent) break;
-                parent = parent.parentElement;
-            }
-            
-            return {
-                needs: {
-                    horizontal: needsHorizontal,
-                    vertical: needsVertical
-                },
-                parents: {
-                    horizontal: horizontalParent,
-                    vertical: verticalParent
-                },
-                elementRect: rect
-            };
-        }
+    return driver.execute_script(_SCROLL_NEEDS_FUNCTION + """
         return getScrollNeeds(arguments[0]);
     """, element)
 
@@ -348,8 +440,8 @@ def init(driver: WebDriver) -> None:
     if not driver:
         raise ValueError("Driver is not initialized")
     
-    # Set up a tracker for the mouse position
-    driver.execute_script("""
+    # Set up a tracker for the mouse position, reading the pixel ratio in the same call
+    device_pixel_ratio = driver.execute_script("""
         window.mousePosition = {x: 0, y: 0};
         document.addEventListener('mousemove', (e) => {
             window.mousePosition = {
@@ -357,6 +449,23 @@ def init(driver: WebDriver) -> None:
                 y: e.clientY
             };
         });
+        return window.devicePixelRatio || 1;
+    """)
+    _device_pixel_ratios[driver.session_id] = float(device_pixel_ratio)
+
+    # Count DOM mutations so cached DOM trees can tell when they are stale
+    driver.execute_script("""
+        if (window.__domVersion === undefined) {
+            window.__domVersion = 0;
+            new MutationObserver(() => {
+                window.__domVersion++;
+            }).observe(document.documentElement, {
+                attributes: true,
+                characterData: true,
+                childList: true,
+                subtree: true
+            });
+        }
     """)
 
 def restore_scroll_positions(driver: WebDriver, positions: list[dict]) -> None:
@@ -475,4 +584,30 @@ def scroll_to(driver: WebDriver, x: int, y: int) -> None:
         """,
         x,
         y
-    )
\ No newline at end of file
+    )
+
+
+def wait_for_load(driver: WebDriver, timeout: float = 10) -> bool:
+    """
+    Block until the page's load event has fired, in a single WebDriver call.
+
+    Returns False if the page has not loaded within timeout seconds.
+    """
+    if not driver:
+        raise ValueError("Driver is not initialized")
+
+    return driver.execute_async_script(
+        """
+        const done = arguments[arguments.length - 1];
+        if (document.readyState === 'complete') {
+            done(true);
+            return;
+        }
+        const timer = setTimeout(() => done(false), arguments[0]);
+        window.addEventListener('load', () => {
+            clearTimeout(timer);
+            done(true);
+        }, { once: true });
+        """,
+        int(timeout * 1000)
+    )
@@ -3,13 +3,26 @@ Text processing utilities for web analyzer.
 """
 
 from difflib import SequenceMatcher
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from web_browser.web_analyzer.elements.unified_element import \
         UnifiedElement
 
 
+class _FilenameCharTable(dict):
+    """str.translate table that keeps alphanumerics, '_', '-' and '.', memoizing each code point."""
+
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        char = chr(codepoint)
+        value = char if char.isalnum() or char in "_-." else None
+        self[codepoint] = value
+        return value
+
+
+_FILENAME_CHARS = _FilenameCharTable()
+
+
 def are_texts_equivalent(text1: str, text2: str, similarity_threshold: float = 0.8) -> bool:
     """
     Check if two texts are effectively equivalent.
@@ -53,6 +66,22 @@ def normalize_text(text: str) -> str:
     return " ".join(lines)
 
 
+def sanitize_filename(text: str) -> str:
+    """
+    Strip characters that are unsafe in filenames.
+
+    Keeps alphanumerics (including non-ASCII letters), underscores, hyphens
+    and dots, then removes trailing dots.
+
+    Args:
+        text: Text to turn into a filename fragment
+
+    Returns:
+        Sanitized text
+    """
+    return text.translate(_FILENAME_CHARS).rstrip(".")
+
+
 def should_merge_text_fragments(elem1: "UnifiedElement", elem2: "UnifiedElement", 
                               max_vertical_gap: float = 25.0) -> bool:
     """